@@ -3,8 +3,38 @@
 // Automatically detect the correct API base URL (works for localhost and network access)
 const API_BASE = `${window.location.protocol}//${window.location.hostname}:5001/api`;
 let currentJobId = null;
+let jobsCache = []; // Jobs of the last dashboard load (with their stat counts)
+let dashboardPreview = null; // First rows of the last opened job, sent with the dashboard
 let quoteInterval = null;
 let currentTableData = []; // Store current table data for export
+let filteredIndexes = []; // Indexes of the rows matching the current filters
+let searchWorker = null; // Search index of the current job (assets/js/search_worker.js)
+let searchSeq = 0; // Id of the latest query; older answers are ignored
+let filterTimer = null;
+let jobEdits = new Map(); // Revision id ("<Matecat id>-ai" / "-xlf") -> {text, version} of the current job
+let pendingEdits = new Map(); // Revision id -> edited text not sent to the server yet
+let editSyncTimer = null;
+let editSyncInFlight = false;
+let editSyncBatch = null; // Promise of the batch in flight (true once the server has it)
+let migratedEdits = new Map(); // Revision id -> localStorage key it was imported from, until the server has it
+let rowHeights = new Map(); // Measured height of each materialized row
+let renderedRows = new Map(); // Row index -> <tr> currently in the DOM
+let renderedStart = 0; // Filtered positions [renderedStart, renderedEnd) are in the DOM
+let renderedEnd = 0;
+// Heights of the filtered rows by position, summed in a Fenwick tree: a row's offset
+// and the row at an offset are O(log n), so a scroll frame doesn't walk every row
+let positionHeights = new Float64Array(0);
+let heightTree = new Float64Array(1);
+let virtualRenderPending = false;
+
+// Rows not measured yet are assumed this tall; rows this far outside the viewport stay in the DOM
+const VIRTUAL_ROW_ESTIMATE = 120;
+const VIRTUAL_OVERSCAN = 800;
+// Typing in the search/ID boxes waits this long before querying the index
+const FILTER_DEBOUNCE_MS = 150;
+// Saved edits are sent in one batch once editing pauses; failed batches are retried
+const EDIT_SYNC_DELAY_MS = 1000;
+const EDIT_SYNC_RETRY_MS = 5000;
 
 // --- Confetti Logic ---
 class Confetti {
@@ -290,16 +320,24 @@ async function uploadFile(file) {
             throw new Error(errorMessage);
         }
 
-        showLoading('Processing file...', funnyQuotes[0]);
-
         const result = await response.json();
 
-        // Update loading text with stats if available
-        if (result.stats?.total) {
-            showLoading('Processing file...', `Found ${result.stats.total} translations...`);
+        if (result.deduplicated) {
+            hideLoading();
+            await showAlert(result.message, 'Already Uploaded', 'assets/coolcat.webp');
+            await loadJobs();
+            await openJob(result.job_id, result.name);
+            return;
         }
 
-        await new Promise(resolve => setTimeout(resolve, 1500));
+        // Processing is queued on the server; follow the run until the table is ready
+        showLoading('Processing file...', funnyQuotes[0]);
+        const processed = await waitForRun(result.job_id, result.run_id, progress => {
+            showLoading('Processing file...', formatProgressMessage(progress));
+        });
+        if (processed.stats?.total) {
+            showLoading('Processing file...', `Found ${processed.stats.total} translations...`);
+        }
 
         hideLoading();
         await loadJobs();
@@ -322,13 +360,17 @@ async function uploadFile(file) {
 
 async function loadJobs() {
     try {
-        const response = await fetch(`${API_BASE}/jobs`);
+        // One request: the jobs with their stats, plus the first page of the last opened job
+        const response = await fetch(`${API_BASE}/dashboard`);
 
         if (!response.ok) {
             throw new Error(`Server error: ${response.status}`);
         }
 
-        const jobs = await response.json();
+        const dashboard = await response.json();
+        const jobs = dashboard.jobs;
+        jobsCache = jobs;
+        dashboardPreview = dashboard.last_job;
         const jobsList = document.getElementById('jobsList');
 
         if (jobs.length === 0) {
@@ -346,6 +388,9 @@ async function loadJobs() {
                 <div class="job-info">
                     <div class="job-name">${escapeHtml(job.name)}</div>
                     <div class="job-meta">Created: ${new Date(job.created).toLocaleString()}</div>
+                    ${job.stats ? `<div class="job-meta">${job.stats.total} segments · ${job.stats.ai_revised} AI revisions · ${job.stats.with_revisions} revisions · ${job.stats.major_errors} major errors</div>` : ''}
+                    ${job.quality ? `<div class="job-meta">Quality: ${job.quality.per_1000_words} points / 1000 words (${job.quality.passed ? 'pass' : 'fail'})</div>` : ''}
+                    ${job.usage ? `<div class="job-meta">LLM: ${job.usage.tokens.toLocaleString()} tokens · $${job.usage.cost.toFixed(4)}</div>` : ''}
                 </div>
                 <div class="job-actions" onclick="event.stopPropagation()">
                     <button class="btn btn-accent" onclick="reviseJob('${job.id}')" title="AI-powered revision of all translations">
@@ -381,12 +426,27 @@ async function loadJobs() {
 
 async function openJob(jobId, jobName) {
     try {
-        showLoading('Loading job data...', 'Fetching your translations...');
+        flushEdits();
+
+        // The dashboard already sent the first rows of this job: show them
+        // while the rest loads
+        const preview = dashboardPreview && dashboardPreview.id === jobId ? dashboardPreview : null;
+        dashboardPreview = null;
+        if (preview) {
+            showTableView();
+            currentJobId = jobId;
+            jobEdits = new Map(Object.entries(preview.edits || {}));
+            pendingEdits = new Map();
+            updateJobSelector(jobId);
+            renderTable(rowsFromCompact(preview), 'tableContainer', preview.stats);
+        } else {
+            showLoading('Loading job data...', 'Fetching your translations...');
+        }
 
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), 300000); // 5 minute timeout
 
-        const response = await fetch(`${API_BASE}/jobs/${jobId}/data`, {
+        const response = await fetch(`${API_BASE}/jobs/${jobId}/data?format=compact`, {
             signal: controller.signal
         });
 
@@ -403,17 +463,36 @@ async function openJob(jobId, jobName) {
             throw new Error(errorMessage);
         }
 
-        const result = await response.json();
+        let result = await response.json();
 
-        hideLoading();
+        // Not processed yet: the server queued it, wait for the run and fetch again
+        if (response.status === 202) {
+            await waitForRun(jobId, result.run_id, progress => {
+                showLoading('Processing job...', formatProgressMessage(progress));
+            });
+            result = await fetch(`${API_BASE}/jobs/${jobId}/data?format=compact`).then(r => r.json());
+        }
 
-        document.querySelector('.section:has(#uploadArea)').style.display = 'none';
-        document.getElementById('jobsSection').style.display = 'none';
-        document.getElementById('tableView').style.display = 'block';
+        hideLoading();
+        // Another job was opened while this one loaded
+        if (preview && currentJobId !== jobId) return;
 
+        showTableView();
         currentJobId = jobId;
-        await updateJobSelector(jobId);
-        renderTable(result.data, 'tableContainer');
+        // (with a preview, the edits came with it and may have been saved to since)
+        if (!preview) {
+            jobEdits = new Map(Object.entries(result.edits || {}));
+            pendingEdits = new Map();
+        }
+        const rows = rowsFromCompact(result);
+        if (preview) {
+            // Swap in the full rows, keeping the filters the reviewer may have set
+            replaceTableRows(rows);
+        } else {
+            await updateJobSelector(jobId);
+            renderTable(rows, 'tableContainer');
+        }
+        migrateLocalEdits(jobId, rows);
 
     } catch (error) {
         hideLoading();
@@ -427,6 +506,18 @@ async function openJob(jobId, jobName) {
     }
 }
 
+// Compact payload (column names + one array per row) -> row objects keyed by column
+function rowsFromCompact(payload) {
+    const columns = payload.columns || [];
+    return (payload.rows || []).map(values => {
+        const row = {};
+        columns.forEach((column, i) => {
+            row[column] = values[i] ?? '';
+        });
+        return row;
+    });
+}
+
 async function switchJob(jobId) {
     if (!jobId) return;
     try {
@@ -438,9 +529,18 @@ async function switchJob(jobId) {
     }
 }
 
+function showTableView() {
+    document.querySelector('.section:has(#uploadArea)').style.display = 'none';
+    document.getElementById('jobsSection').style.display = 'none';
+    document.getElementById('tableView').style.display = 'block';
+}
+
 async function updateJobSelector(selectedJobId) {
     const selector = document.getElementById('jobSelector');
-    const jobs = await fetch(`${API_BASE}/jobs`).then(r => r.json());
+    if (!jobsCache.length) {
+        jobsCache = await fetch(`${API_BASE}/jobs`).then(r => r.json());
+    }
+    const jobs = jobsCache;
 
     selector.innerHTML = '<option value="">Select a job...</option>';
     jobs.forEach(job => {
@@ -456,9 +556,74 @@ function showJobsList() {
     document.getElementById('tableView').style.display = 'none';
     document.querySelector('.section:has(#uploadArea)').style.display = 'block';
     document.getElementById('jobsSection').style.display = 'block';
+    flushEdits();
     currentJobId = null;
 }
 
+// Subscribe to a job's progress events (falls back to polling without EventSource)
+function watchProgress(jobId, onProgress, runId = null, onIdle = null) {
+    if (window.EventSource) {
+        const query = runId ? `?run=${encodeURIComponent(runId)}` : '';
+        const source = new EventSource(`${API_BASE}/jobs/${jobId}/progress/stream${query}`);
+        source.addEventListener('progress', event => {
+            try {
+                onProgress(JSON.parse(event.data));
+            } catch (e) {
+                console.error('Error reading progress event:', e);
+            }
+        });
+        // Sent when the job has nothing queued or running; the stream would otherwise reconnect
+        source.addEventListener('idle', () => {
+            source.close();
+            if (onIdle) onIdle();
+        });
+        return { close: () => source.close() };
+    }
+
+    const pollInterval = setInterval(async () => {
+        try {
+            const progressRes = await fetch(`${API_BASE}/jobs/${jobId}/progress`);
+            if (progressRes.ok) {
+                const progress = await progressRes.json();
+                if (!runId || progress.run_id === runId) onProgress(progress);
+            }
+        } catch (e) {
+            console.error('Error polling progress:', e);
+        }
+    }, 1000);
+    return { close: () => clearInterval(pollInterval) };
+}
+
+// Resolve with the final snapshot of a background run (rejects if it failed)
+function waitForRun(jobId, runId, onProgress) {
+    return new Promise((resolve, reject) => {
+        const stream = watchProgress(jobId, progress => {
+            onProgress(progress);
+            if (progress.status === 'completed' || progress.status === 'paused') {
+                stream.close();
+                resolve(progress);
+            } else if (progress.status === 'failed') {
+                stream.close();
+                reject(new Error(progress.message || 'Task failed'));
+            }
+        }, runId, () => reject(new Error('The task is no longer running')));
+    });
+}
+
+function formatProgressMessage(progress) {
+    let message = progress.message || 'Processing...';
+    if (progress.status === 'processing' && progress.total) {
+        message += ` (${progress.current}/${progress.total}`;
+        if (progress.cache_hits) message += `, ${progress.cache_hits} cached`;
+        if (progress.memory_hits) message += `, ${progress.memory_hits} from memory`;
+        if (progress.errors) message += `, ${progress.errors} errors`;
+        if (progress.usage && progress.usage.cost) message += `, $${progress.usage.cost.toFixed(4)} spent`;
+        if (progress.eta_seconds) message += `, ~${Math.ceil(progress.eta_seconds / 60)} min left`;
+        message += ')';
+    }
+    return message;
+}
+
 async function reviseJob(jobId) {
     const confirmed = await showConfirm(
         'Start AI-powered revision? I will review each translation segment individually using my knowledge and your resources. This may take several minutes.',
@@ -481,39 +646,15 @@ async function reviseJob(jobId) {
         progressPercent.textContent = '0%';
     }
 
-    // Start polling for progress
-    const pollInterval = setInterval(async () => {
-        try {
-            const progressRes = await fetch(`${API_BASE}/jobs/${jobId}/progress`);
-            if (progressRes.ok) {
-                const progress = await progressRes.json();
-                if (progress.percentage !== undefined && progressContainer) {
-                    progressBar.style.width = `${progress.percentage}%`;
-                    progressText.textContent = progress.message || 'Processing...';
-                    progressPercent.textContent = `${progress.percentage}%`;
-                }
-            }
-        } catch (e) {
-            console.error('Error polling progress:', e);
-        }
-    }, 1000); // Poll every second
-
     try {
-        const controller = new AbortController();
-        const timeoutId = setTimeout(() => controller.abort(), 1800000); // 30 minute timeout
-
         const response = await fetch(`${API_BASE}/jobs/${jobId}/revise`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({}),
-            signal: controller.signal
+            body: JSON.stringify({})
         });
 
-        clearTimeout(timeoutId);
-        clearInterval(pollInterval); // Stop polling
-
         if (!response.ok) {
             let errorMessage = 'AI revision failed';
             try {
@@ -525,7 +666,23 @@ async function reviseJob(jobId) {
             throw new Error(errorMessage);
         }
 
-        const result = await response.json();
+        // The revision runs in the background; follow its progress until it finishes
+        const { run_id: runId } = await response.json();
+        const result = await waitForRun(jobId, runId, progress => {
+            if (progress.percentage !== undefined && progressContainer) {
+                progressBar.style.width = `${progress.percentage}%`;
+                progressText.textContent = formatProgressMessage(progress);
+                progressPercent.textContent = `${progress.percentage}%`;
+            }
+        });
+
+        if (result.status === 'paused') {
+            if (progressContainer) progressContainer.style.display = 'none';
+            await showAlert(result.message || 'AI revision paused: the job budget is spent.');
+            await loadJobs();
+            await openJob(jobId, null);
+            return;
+        }
 
         // Update progress to 100%
         if (progressContainer) {
@@ -557,12 +714,9 @@ async function reviseJob(jobId) {
         await openJob(jobId, null);
 
     } catch (error) {
-        clearInterval(pollInterval); // Stop polling on error
         if (progressContainer) progressContainer.style.display = 'none';
 
-        if (error.name === 'AbortError') {
-            await showAlert('Error: Request timed out. AI revision might be taking longer than expected.');
-        } else if (error.message.includes('Failed to fetch')) {
+        if (error.message.includes('Failed to fetch')) {
             await showAlert('Error: Cannot connect to server. Make sure the server is running.');
         } else {
             await showAlert('Error during AI revision: ' + error.message);
@@ -601,9 +755,10 @@ async function reprocessJob(jobId) {
             throw new Error(errorMessage);
         }
 
-        const result = await response.json();
-
-        await new Promise(resolve => setTimeout(resolve, 1000));
+        const { run_id: runId } = await response.json();
+        await waitForRun(jobId, runId, progress => {
+            showLoading('Reprocessing job...', formatProgressMessage(progress));
+        });
 
         hideLoading();
         await loadJobs();
@@ -736,146 +891,21 @@ function formatTextWithTagsAndWhitespace(text) {
     return formattedParts.join('');
 }
 
-function highlightDifferences(original, revised, showWhitespace = false) {
-    const formatFunc = showWhitespace ? formatTextWithTagsAndWhitespace : formatTextWithTags;
-    
-    if (!original || !revised) return formatFunc(revised || original);
-    if (original === revised) return formatFunc(revised);
-
-    // Remove tags for comparison but keep track of their positions
-    const tagPattern = /(<[^>]+>|<\/[^>]+>)/g;
-    const originalClean = original.replace(tagPattern, ' ').replace(/\s+/g, ' ').trim();
-    const revisedClean = revised.replace(tagPattern, ' ').replace(/\s+/g, ' ').trim();
-
-    if (originalClean === revisedClean) return formatFunc(revised);
-
-    // Get formatted version first (with tags preserved, and optionally with whitespace visualization)
-    let formatted = formatFunc(revised);
-    
-    // Use a word-level diff algorithm to find what actually changed
-    // Split into words for comparison
-    const originalWords = originalClean.split(/\s+/).filter(w => w.length > 0);
-    const revisedWords = revisedClean.split(/\s+/).filter(w => w.length > 0);
-    
-    // Find the longest common subsequence to identify unchanged parts
-    // Then highlight only the parts that differ
-    const originalWordsLower = originalWords.map(w => w.toLowerCase());
-    const revisedWordsLower = revisedWords.map(w => w.toLowerCase());
-    
-    // Conservative approach: only highlight words that are completely new (don't exist in original)
-    // This avoids false positives from reordering or word position changes
-    const wordsToHighlight = [];
-    const originalWordsSet = new Set(originalWordsLower);
-    
-    for (let i = 0; i < revisedWords.length; i++) {
-        const word = revisedWords[i];
-        const wordLower = revisedWordsLower[i];
-        
-        // Only highlight if:
-        // 1. Word doesn't exist in original at all (completely new)
-        // 2. Word is at least 3 characters (avoid highlighting short words/letters)
-        if (!originalWordsSet.has(wordLower) && word.length >= 3) {
-            wordsToHighlight.push({
-                word: word,
-                wordLower: wordLower,
-                index: i
-            });
-        }
-    }
-    
-    if (wordsToHighlight.length === 0) {
-        // No significant differences found
-        return formatted;
+// Paint the spans of a revision from the edit ops computed on the server
+// (text_diff.py): '=12+5-3' keeps 12 characters, inserts 5, deletes 3.
+// Op boundaries never split a tag, so each run can be formatted on its own.
+function paintDiff(revised, encodedOps, formatFunc = formatTextWithTags) {
+    if (!revised || !encodedOps) return formatFunc(revised);
+    const parts = [];
+    let position = 0;
+    for (const [, op, length] of encodedOps.matchAll(/([=+-])(\d+)/g)) {
+        if (op === '-') continue;
+        const run = revised.slice(position, position + Number(length));
+        position += Number(length);
+        parts.push(op === '+' ? `<span class="diff-added">${formatFunc(run)}</span>` : formatFunc(run));
     }
-    
-    // Group consecutive words to highlight together
-    const sequences = [];
-    let currentSeq = [];
-    
-    for (let i = 0; i < wordsToHighlight.length; i++) {
-        const item = wordsToHighlight[i];
-        if (currentSeq.length === 0 || item.index === currentSeq[currentSeq.length - 1].index + 1) {
-            // Consecutive - add to current sequence
-            currentSeq.push(item);
-        } else {
-            // Gap - save current sequence and start new one
-            if (currentSeq.length > 0) {
-                sequences.push(currentSeq.map(s => s.word).join(' '));
-            }
-            currentSeq = [item];
-        }
-    }
-    if (currentSeq.length > 0) {
-        sequences.push(currentSeq.map(s => s.word).join(' '));
-    }
-    
-    // Highlight words using a simpler, more reliable approach
-    // Process words in reverse order to avoid position shifting
-    for (let wordIdx = wordsToHighlight.length - 1; wordIdx >= 0; wordIdx--) {
-        const wordInfo = wordsToHighlight[wordIdx];
-        const word = wordInfo.word;
-        
-        // Escape special regex characters in the word
-        const escapedWord = word.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-        
-        // Build a regex that matches the word with proper boundaries
-        // Whitespace can be: actual space, nbsp, or whitespace symbols (·, °, →, ↵)
-        // Word boundaries: start/end of string, whitespace, whitespace symbols, or punctuation
-        const boundaryChars = `[\\s·°→↵,;:.!?()\\[\\]{}'"«»<>]`;
-        const wordPattern = new RegExp(
-            `(^|${boundaryChars})(${escapedWord})(${boundaryChars}|$)`,
-            'i' // Case insensitive
-        );
-        
-        // Extract text content only (without HTML tags) for pattern matching
-        let textContent = '';
-        let textToHtmlMap = []; // Maps text content index to HTML index
-        let inTag = false;
-        
-        for (let i = 0; i < formatted.length; i++) {
-            if (formatted[i] === '<') {
-                inTag = true;
-            } else if (formatted[i] === '>') {
-                inTag = false;
-            } else if (!inTag) {
-                textToHtmlMap.push(i);
-                textContent += formatted[i];
-            }
-        }
-        
-        // Find the word in the text content
-        const match = textContent.match(wordPattern);
-        
-        if (match) {
-            // Calculate positions in text content
-            const matchStart = match.index + match[1].length;
-            const matchEnd = matchStart + match[2].length;
-            
-            // Map back to HTML positions
-            if (matchStart < textToHtmlMap.length && matchEnd <= textToHtmlMap.length) {
-                const htmlStart = textToHtmlMap[matchStart];
-                const htmlEnd = textToHtmlMap[matchEnd - 1] + 1;
-                
-                // Check if already highlighted
-                const beforeText = formatted.substring(0, htmlStart);
-                const openSpans = (beforeText.match(/<span[^>]*class=["']diff-added["'][^>]*>/g) || []).length;
-                const closeSpans = (beforeText.match(/<\/span>/g) || []).length;
-                
-                if (openSpans === closeSpans) { // Not inside a highlight
-                    const matchText = formatted.substring(htmlStart, htmlEnd);
-                    
-                    // Verify not already highlighted
-                    if (!matchText.includes('diff-added')) {
-                        formatted = formatted.substring(0, htmlStart) +
-                            `<span class="diff-added">${matchText}</span>` +
-                            formatted.substring(htmlEnd);
-                    }
-                }
-            }
-        }
-    }
-
-    return formatted;
+    if (position < revised.length) parts.push(formatFunc(revised.slice(position)));
+    return parts.join('');
 }
 
 function base64ToUtf8(base64) {
@@ -928,7 +958,7 @@ function editRevision(button) {
     // Always get the raw text from original source (with NBSP), not from textarea.value
     // which might already have ° symbols
     const originalB64 = textarea.getAttribute('data-original-b64');
-    const savedText = localStorage.getItem('revision_' + matecatId);
+    const savedText = savedEditText(matecatId);
     const rawText = savedText || (originalB64 ? base64ToUtf8(originalB64) : '');
     // Show non-breaking spaces as ° in textarea
     textarea.value = showNonBreakingSpaces(rawText);
@@ -958,25 +988,9 @@ function saveRevision(button) {
     // Convert ° back to non-breaking space before saving
     const newText = restoreNonBreakingSpaces(textarea.value);
     
-    // Check if it's an AI revision or XLF revision
+    // Edited text has no server-computed diff; show it like saved edits
     const isAiRevision = matecatId.includes('-ai');
-    const isXlfRevision = matecatId.includes('-xlf');
-    
-    // Get the original target for comparison
-    let originalTarget = '';
-    const baseMatecatId = matecatId.replace(/-ai$/, '').replace(/-xlf$/, '');
-    const row = document.querySelector(`tr[data-matecat-id="${baseMatecatId}"]`);
-    if (row) {
-        const targetCell = row.querySelector('.target-col');
-        if (targetCell && targetCell.dataset.rawTarget) {
-            originalTarget = targetCell.dataset.rawTarget;
-        }
-    }
-    
-    // Re-apply highlighting with differences from target
-    const formattedText = isAiRevision ? 
-        highlightDifferences(originalTarget, newText, true) : 
-        highlightDifferences(originalTarget, newText, false);
+    const formattedText = isAiRevision ? formatTextWithTagsAndWhitespace(newText) : formatTextWithTags(newText);
     
     const badgeHtml = isAiRevision ? '<span class="ai-badge">AI</span>' : '';
     textDiv.innerHTML = formattedText + badgeHtml + '<span class="edited-badge">EDITED</span>';
@@ -984,7 +998,7 @@ function saveRevision(button) {
     textarea.classList.remove('editing');
 
     if (badge) badge.style.display = 'inline-block';
-    localStorage.setItem('revision_' + matecatId, newText);
+    queueEdit(matecatId, newText);
 
     const newTextB64 = btoa(unescape(encodeURIComponent(newText)));
     copyButton.setAttribute('data-text-b64', newTextB64);
@@ -1018,7 +1032,7 @@ function cancelEdit(button) {
     if (!textDiv || !textarea) return;
 
     const originalB64 = textarea.getAttribute('data-original-b64');
-    const savedText = localStorage.getItem('revision_' + matecatId);
+    const savedText = savedEditText(matecatId);
     // Get raw text (with NBSP) - this is what we store and compare
     // Use base64ToUtf8 to properly handle UTF-8 characters like smart quotes
     const rawText = savedText || (originalB64 ? base64ToUtf8(originalB64) : '');
@@ -1027,24 +1041,11 @@ function cancelEdit(button) {
 
     const badge = document.getElementById('badge-' + matecatId);
     const isAiRevision = matecatId.includes('-ai');
-    const isXlfRevision = matecatId.includes('-xlf');
     const badgeHtml = isAiRevision ? '<span class="ai-badge">AI</span>' : '';
-    
-    // Get the original target for comparison (use raw text with NBSP)
-    let originalTarget = '';
-    const baseMatecatId = matecatId.replace(/-ai$/, '').replace(/-xlf$/, '');
-    const row = document.querySelector(`tr[data-matecat-id="${baseMatecatId}"]`);
-    if (row) {
-        const targetCell = row.querySelector('.target-col');
-        if (targetCell && targetCell.dataset.rawTarget) {
-            originalTarget = targetCell.dataset.rawTarget;
-        }
-    }
-    
-    // Re-apply highlighting with differences from target
-    const formattedText = isAiRevision ? 
-        highlightDifferences(originalTarget, rawText, true) : 
-        highlightDifferences(originalTarget, rawText, false);
+
+    // The unedited AI revision gets its diff spans back
+    const formatFunc = isAiRevision ? formatTextWithTagsAndWhitespace : formatTextWithTags;
+    const formattedText = savedText ? formatFunc(rawText) : paintDiff(rawText, button.closest('.has-revision').dataset.diff, formatFunc);
     
     if (savedText && badge) {
         textDiv.innerHTML = formattedText + badgeHtml + '<span class="edited-badge">EDITED</span>';
@@ -1064,147 +1065,166 @@ function cancelEdit(button) {
     copyButton.style.display = 'inline-flex';
 }
 
-// --- CSV Export ---
-function exportToCSV() {
-    const table = document.getElementById('revisionTable');
-    if (!table) {
-        showCustomModal('Error', 'No table data available to export');
-        return;
-    }
+// --- Reviewer Edits ---
+// Edits are stored per job on the server (/api/jobs/<id>/edits) with a version
+// per segment, so several reviewers can work on the same job
 
-    // Get all visible rows (respecting current filters)
-    const rows = Array.from(table.querySelectorAll('tbody tr')).filter(row => {
-        return row.style.display !== 'none';
-    });
+function savedEditText(revisionId) {
+    const edit = jobEdits.get(revisionId);
+    return edit ? edit.text : null;
+}
 
-    if (rows.length === 0) {
-        showCustomModal('No Data', 'No rows to export. Try adjusting your filters.');
-        return;
+function queueEdit(revisionId, text) {
+    const edit = jobEdits.get(revisionId);
+    jobEdits.set(revisionId, { text, version: edit ? edit.version : 0 });
+    pendingEdits.set(revisionId, text);
+    clearTimeout(editSyncTimer);
+    editSyncTimer = setTimeout(flushEdits, EDIT_SYNC_DELAY_MS);
+}
+
+// Send the queued edits of the current job. Resolves once the queue is empty
+// and nothing is in flight (true), or when a batch failed and is retried later (false)
+async function flushEdits(keepalive = false) {
+    clearTimeout(editSyncTimer);
+    const jobId = currentJobId;
+    // One batch at a time, so every batch is based on the versions the previous one returned
+    while (editSyncInFlight && !keepalive) {
+        if (!(await editSyncBatch)) return false;
     }
+    if (jobId !== currentJobId) return false;
+    if (!jobId || pendingEdits.size === 0) return true;
 
-    // Helper function to escape CSV fields
-    function escapeCSV(str) {
-        if (str === null || str === undefined) return '';
-        str = String(str);
-        // Remove HTML tags
-        str = str.replace(/<[^>]*>/g, '');
-        // Decode HTML entities
-        const textarea = document.createElement('textarea');
-        textarea.innerHTML = str;
-        str = textarea.value;
-        // Remove whitespace visualization symbols for cleaner CSV
-        str = str.replace(/·/g, ' ').replace(/°/g, '\u00A0').replace(/→/g, '\t').replace(/↵/g, '\n');
-        // Escape quotes and wrap in quotes if necessary
-        if (str.includes(',') || str.includes('"') || str.includes('\n')) {
-            str = '"' + str.replace(/"/g, '""') + '"';
+    editSyncBatch = sendEditBatch(jobId, keepalive);
+    if (!(await editSyncBatch)) return false;
+    // Edits made while the batch was in flight go in the next one
+    return keepalive || flushEdits();
+}
+
+async function sendEditBatch(jobId, keepalive) {
+    const batch = Array.from(pendingEdits, ([segment, text]) => ({
+        segment, text, version: jobEdits.get(segment)?.version || 0
+    }));
+    pendingEdits = new Map();
+    editSyncInFlight = true;
+    try {
+        const response = await fetch(`${API_BASE}/jobs/${jobId}/edits`, {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ edits: batch }),
+            keepalive
+        });
+        if (!response.ok) {
+            const error = await response.json().catch(() => ({}));
+            throw new Error(error.error || `Server error: ${response.status}`);
         }
-        return str;
-    }
+        const result = await response.json();
 
-    // Build CSV content
-    const headers = ['ID Matecat', 'State', 'Source', 'Target', 'XLF Revision', 'AI Revision', 'Error Code', 'Comment'];
-    let csvContent = headers.map(escapeCSV).join(',') + '\n';
-
-    rows.forEach(row => {
-        const matecatId = row.querySelector('.id-col')?.textContent.replace(/✨ AI|📄 XLF/g, '').trim() || '';
-        const state = row.querySelector('.state-col')?.textContent.trim() || '';
-        
-        // Get source text
-        const sourceCell = row.querySelector('.source-col');
-        const source = sourceCell?.textContent.trim() || '';
-        
-        // Get target text (original)
-        const targetCell = row.querySelector('.target-col');
-        const target = targetCell?.getAttribute('data-raw-target') || targetCell?.textContent.trim() || '';
-        
-        // Get XLF revision (check for edited version first)
-        let xlfRevision = '';
-        const xlfTextDiv = row.querySelector('.xlf-revision-col .revision-text');
-        if (xlfTextDiv) {
-            const xlfMatecatId = matecatId + '-xlf';
-            const savedXlf = localStorage.getItem('revision_' + xlfMatecatId);
-            if (savedXlf) {
-                xlfRevision = savedXlf;
-            } else {
-                const xlfTextarea = row.querySelector('.xlf-revision-col .revision-textarea');
-                if (xlfTextarea) {
-                    const xlfB64 = xlfTextarea.getAttribute('data-original-b64');
-                    xlfRevision = xlfB64 ? base64ToUtf8(xlfB64) : '';
-                }
+        // Edits imported from this browser's storage are on the server now (or
+        // superseded by another reviewer's): only then are their keys removed
+        [...result.applied, ...result.conflicts].forEach(({ segment }) => {
+            const key = migratedEdits.get(segment);
+            if (key) {
+                localStorage.removeItem(key);
+                migratedEdits.delete(segment);
             }
-        }
-        
-        // Get AI revision (check for edited version first)
-        let aiRevision = '';
-        const aiTextDiv = row.querySelector('.ai-revision-col .revision-text');
-        if (aiTextDiv) {
-            const aiMatecatId = matecatId + '-ai';
-            const savedAi = localStorage.getItem('revision_' + aiMatecatId);
-            if (savedAi) {
-                aiRevision = savedAi;
+        });
+        if (jobId !== currentJobId) return true;
+
+        result.applied.forEach(({ segment, version }) => {
+            const edit = jobEdits.get(segment);
+            if (edit) edit.version = version;
+        });
+        // Someone else saved these segments first: show their text instead
+        result.conflicts.forEach(conflict => {
+            pendingEdits.delete(conflict.segment);
+            if (conflict.text === null) {
+                jobEdits.delete(conflict.segment);
             } else {
-                const aiTextarea = row.querySelector('.ai-revision-col .revision-textarea');
-                if (aiTextarea) {
-                    const aiB64 = aiTextarea.getAttribute('data-original-b64');
-                    aiRevision = aiB64 ? base64ToUtf8(aiB64) : '';
-                }
-            }
-        }
-        
-        // Get error code (codes are in spans with classes like code-TE2)
-        const codeCell = row.querySelector('.code-col');
-        let code = '';
-        if (codeCell) {
-            // Get all code spans and extract their text content
-            const codeSpans = codeCell.querySelectorAll('span[class^="code-"]');
-            if (codeSpans.length > 0) {
-                code = Array.from(codeSpans).map(span => span.textContent.trim()).join(', ');
+                jobEdits.set(conflict.segment, { text: conflict.text, version: conflict.version });
             }
+            const baseId = conflict.segment.replace(/-(ai|xlf)$/, '');
+            const tr = document.querySelector(`tr[data-matecat-id="${baseId}"]`);
+            if (tr) applySavedEdits(tr);
+        });
+        if (result.conflicts.length > 0) {
+            showAlert(`${result.conflicts.length} edit${result.conflicts.length !== 1 ? 's were' : ' was'} changed by another reviewer in the meantime. Their version is now shown.`, 'Edit Conflict');
         }
-        
-        // Get comment (comment is in .comment-wrapper > div)
-        const commentCell = row.querySelector('.comment-col');
-        let comment = '';
-        if (commentCell) {
-            const commentWrapper = commentCell.querySelector('.comment-wrapper > div');
-            if (commentWrapper) {
-                comment = commentWrapper.textContent.trim();
-            }
+        return true;
+    } catch (error) {
+        if (jobId !== currentJobId) {
+            showAlert('Some edits could not be saved: ' + error.message);
+            return false;
         }
-        
-        // Build row
-        const csvRow = [
-            matecatId,
-            state,
-            source,
-            target,
-            xlfRevision,
-            aiRevision,
-            code,
-            comment
-        ].map(escapeCSV).join(',');
-        
-        csvContent += csvRow + '\n';
+        // Put the batch back (newer edits of the same segments win) and retry later
+        batch.forEach(({ segment, text }) => {
+            if (!pendingEdits.has(segment)) pendingEdits.set(segment, text);
+        });
+        editSyncTimer = setTimeout(flushEdits, EDIT_SYNC_RETRY_MS);
+        return false;
+    } finally {
+        editSyncInFlight = false;
+    }
+}
+
+// Edits used to be kept in this browser's localStorage ("revision_<id>"). The
+// keys don't say which job they belong to, and jobs can share segment ids, so
+// the ones matching this job's segments are only imported once the reviewer
+// confirms it (asked once per job). Keys stay in storage until the server has them.
+const LEGACY_EDITS_DECIDED_KEY = 'legacyEditsDecided';
+
+async function migrateLocalEdits(jobId, rows) {
+    const decided = JSON.parse(localStorage.getItem(LEGACY_EDITS_DECIDED_KEY) || '[]');
+    if (decided.includes(jobId)) return;
+    const matecatIds = new Set(rows.map(row => row['ID Matecat']));
+    const candidates = Object.keys(localStorage)
+        .filter(key => key.startsWith('revision_'))
+        .map(key => [key, key.slice('revision_'.length)])
+        .filter(([key, revisionId]) => matecatIds.has(revisionId.replace(/-(ai|xlf)$/, ''))
+            && !jobEdits.has(revisionId) && !migratedEdits.has(revisionId));
+    if (candidates.length === 0) return;
+
+    const confirmed = await showConfirm(
+        `${candidates.length} edit${candidates.length !== 1 ? 's' : ''} saved in this browser by an earlier version ` +
+        `match segments of this job. They may belong to another job with the same segment ids. Import them into this job?`
+    );
+    // (asked again next time if another job was opened meanwhile)
+    if (currentJobId !== jobId) return;
+    localStorage.setItem(LEGACY_EDITS_DECIDED_KEY, JSON.stringify([...decided, jobId]));
+    if (!confirmed) return;
+    candidates.forEach(([key, revisionId]) => {
+        migratedEdits.set(revisionId, key);
+        queueEdit(revisionId, localStorage.getItem(key));
+        const tr = document.querySelector(`tr[data-matecat-id="${revisionId.replace(/-(ai|xlf)$/, '')}"]`);
+        if (tr) applySavedEdits(tr);
     });
+}
+
+// --- Export ---
+// The server streams the export (rows matching the current filters, with
+// reviewer edits merged in), so big jobs don't have to be built in the tab
+async function exportJob() {
+    if (!currentJobId) return;
+    // The export reads the edits from the server: every queued one must be there first
+    if (!(await flushEdits())) {
+        showAlert('Some edits could not be saved yet, so the export would miss them. Please try again in a moment.');
+        return;
+    }
+
+    const filters = currentFilters();
+    const params = new URLSearchParams({ format: document.getElementById('exportFormat')?.value || 'csv' });
+    if (filters.search) params.set('search', filters.search);
+    if (filters.code) params.set('code', filters.code);
+    if (filters.state) params.set('state', filters.state);
+    if (filters.minId !== null) params.set('min_id', filters.minId);
+    if (filters.maxId !== null) params.set('max_id', filters.maxId);
+    if (filters.stat) params.set('stat', filters.stat);
 
-    // Create download
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
     const link = document.createElement('a');
-    const url = URL.createObjectURL(blob);
-    
-    // Generate filename with job name and timestamp
-    const jobName = currentJobId ? currentJobId.replace(/[^a-z0-9]/gi, '_') : 'export';
-    const timestamp = new Date().toISOString().split('T')[0];
-    const filename = `${jobName}_${timestamp}.csv`;
-    
-    link.setAttribute('href', url);
-    link.setAttribute('download', filename);
+    link.href = `${API_BASE}/jobs/${currentJobId}/export?${params}`;
     link.style.visibility = 'hidden';
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
-    
-    showCustomModal('Export Successful', `Exported ${rows.length} row${rows.length !== 1 ? 's' : ''} to ${filename}`);
 }
 
 function getConfidenceColor(score) {
@@ -1215,19 +1235,171 @@ function getConfidenceColor(score) {
 }
 
 // --- Table Rendering & Filtering ---
-function renderTable(rows, containerId) {
+// Markup of one segment row (materialized only while it is near the viewport)
+function renderRowHtml(row) {
+    const matecatId = escapeHtml(row['ID Matecat'] || '');
+    const state = (row['State'] || '').toLowerCase();
+    const sourceRaw = row['Source'] || '';
+    const targetRaw = row['Target'] || '';
+    const newTargetRaw = row['New target'] || '';
+    const aiRevisionRaw = row['AI Revision'] || '';
+    const confidenceScore = row['Confidence Score'] || '';
+    const code = escapeHtml(row['Code'] || '');
+    const comment = escapeHtml(row['Comment'] || '');
+
+    const source = formatTextWithTags(sourceRaw);
+    const target = formatTextWithTags(targetRaw);
+    const newTarget = formatTextWithTags(newTargetRaw);
+    const aiRevision = formatTextWithTags(aiRevisionRaw);
+
+    const hasAnyRevision = newTargetRaw || aiRevisionRaw;
+    const hasAiRevision = !!aiRevisionRaw;
+    const rowClass = hasAnyRevision ? 'has-revision' : 'no-revision';
+    const hasRevision = hasAnyRevision ? 'true' : 'false';
+    const hasAiRevisionAttr = hasAiRevision ? 'true' : 'false';
+
+    let codeHtml = '';
+    if (code) {
+        const codes = code.split(',').map(c => c.trim());
+        codeHtml = codes.map(c => {
+            const cssClass = `code-${c.replace(/\./g, '').replace(/-/g, '')}`;
+            return `<span class="${cssClass}">${c}</span>`;
+        }).join(' ');
+    }
+
+    let stateBadge = '<span style="color: #94a3b8;">—</span>';
+    if (state) {
+        stateBadge = `<span class="state-badge state-${state}">${state}</span>`;
+    }
+
+    let commentDisplay = '';
+    if (comment) {
+        const commentB64 = btoa(unescape(encodeURIComponent(comment)));
+        commentDisplay = `
+            <div class="comment-wrapper">
+                <div>${comment}</div>
+                <button class="comment-copy-button" data-text-b64="${commentB64}" onclick="copyCommentToClipboard(this)" title="Copy comment">
+                    <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
+                    </svg>
+                    Copy
+                </button>
+            </div>
+        `;
+    }
+
+    let newTargetDisplay = '<em>No revision</em>';
+    if (newTargetRaw) {
+        const newTargetB64 = btoa(unescape(encodeURIComponent(newTargetRaw)));
+        const newTargetFormatted = formatTextWithTags(newTargetRaw);
+        newTargetDisplay = `
+            <div class="has-revision xlf-revision" data-matecat-id="${matecatId}-xlf">
+                <div class="revision-text" id="text-${matecatId}-xlf">${newTargetFormatted}<span class="edited-badge" id="badge-${matecatId}-xlf" style="display: none;">EDITED</span></div>
+                <textarea class="revision-textarea" id="textarea-${matecatId}-xlf" data-original-b64="${newTargetB64}">${escapeHtml(showNonBreakingSpaces(newTargetRaw))}</textarea>
+                <div class="button-group">
+                    <button class="copy-button" data-text-b64="${newTargetB64}" data-matecat-id="${matecatId}-xlf" onclick="copyToClipboard(this)" title="Copy revision">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
+                        </svg>
+                        Copy
+                    </button>
+                    <button class="edit-button" data-matecat-id="${matecatId}-xlf" onclick="editRevision(this)" title="Edit revision">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"></path>
+                        </svg>
+                        Edit
+                    </button>
+                    <button class="save-button" data-matecat-id="${matecatId}-xlf" onclick="saveRevision(this)" title="Save changes" style="display: none;">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+                        </svg>
+                        Save
+                    </button>
+                    <button class="cancel-button" data-matecat-id="${matecatId}-xlf" onclick="cancelEdit(this)" title="Cancel editing" style="display: none;">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path>
+                        </svg>
+                        Cancel
+                    </button>
+                </div>
+            </div>
+        `;
+    }
+
+    let aiRevisionDisplay = '<em>No AI revision</em>';
+    if (aiRevisionRaw) {
+        const aiRevisionB64 = btoa(unescape(encodeURIComponent(aiRevisionRaw)));
+        // Changes against the checked translation, with all whitespace visualized
+        const aiDiff = row['AI Diff'] || '';
+        const aiRevisionFormatted = paintDiff(aiRevisionRaw, aiDiff, formatTextWithTagsAndWhitespace);
+
+        let confidenceBadge = '';
+        if (confidenceScore) {
+            const color = getConfidenceColor(confidenceScore);
+            confidenceBadge = `<span class="confidence-badge" style="background-color: ${color}; color: white; padding: 2px 6px; border-radius: 4px; font-size: 10px; font-weight: bold; margin-left: 6px;" title="Confidence Score: ${confidenceScore}%">${confidenceScore}%</span>`;
+        }
+
+        aiRevisionDisplay = `
+            <div class="has-revision ai-revision" data-matecat-id="${matecatId}-ai" data-diff="${aiDiff}">
+                <div class="revision-text" id="text-${matecatId}-ai">${aiRevisionFormatted}<span class="ai-badge">AI</span>${confidenceBadge}<span class="edited-badge" id="badge-${matecatId}-ai" style="display: none;">EDITED</span></div>
+                <textarea class="revision-textarea" id="textarea-${matecatId}-ai" data-original-b64="${aiRevisionB64}">${escapeHtml(showNonBreakingSpaces(aiRevisionRaw))}</textarea>
+                <div class="button-group">
+                    <button class="copy-button" data-text-b64="${aiRevisionB64}" data-matecat-id="${matecatId}-ai" onclick="copyToClipboard(this)" title="Copy AI revision">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
+                        </svg>
+                        Copy
+                    </button>
+                    <button class="edit-button" data-matecat-id="${matecatId}-ai" onclick="editRevision(this)" title="Edit AI revision">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"></path>
+                        </svg>
+                        Edit
+                    </button>
+                    <button class="save-button" data-matecat-id="${matecatId}-ai" onclick="saveRevision(this)" title="Save changes" style="display: none;">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+                        </svg>
+                        Save
+                    </button>
+                    <button class="cancel-button" data-matecat-id="${matecatId}-ai" onclick="cancelEdit(this)" title="Cancel editing" style="display: none;">
+                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path>
+                        </svg>
+                        Cancel
+                    </button>
+                </div>
+            </div>
+        `;
+    }
+
+    return `
+        <tr class="${rowClass}" data-code="${code}" data-has-revision="${hasRevision}" data-has-ai-revision="${hasAiRevisionAttr}" data-has-xlf-revision="${newTargetRaw ? 'true' : 'false'}" data-state="${state}" data-matecat-id="${matecatId}">
+            <td class="id-col">${matecatId}${aiRevisionRaw ? '<span class="ai-badge">✨ AI</span>' : newTargetRaw ? '<span class="xlf-badge">📄 XLF</span>' : ''}</td>
+            <td class="state-col">${stateBadge}</td>
+            <td class="source-col">${source}</td>
+            <td class="target-col" data-raw-target="${escapeHtml(targetRaw)}">${target}</td>
+            <td class="new-target-col ${newTargetRaw ? 'has-revision xlf-revision-col' : ''}">${newTargetDisplay}</td>
+            <td class="ai-revision-col ${aiRevisionRaw ? 'has-revision ai-revision-col' : ''}">${aiRevisionDisplay}</td>
+            <td class="code-col">${codeHtml}</td>
+            <td class="comment-col">${commentDisplay}</td>
+        </tr>
+    `;
+}
+
+// stats: counts computed by the server (when only part of the rows is given)
+function renderTable(rows, containerId, stats = null) {
     const container = document.getElementById(containerId);
     if (!container) return;
 
     // Store rows for export functionality
     currentTableData = rows;
 
-    const total = rows.length;
-    const withXlfRevisions = rows.filter(r => r['New target']?.trim()).length;
-    const withAiRevisions = rows.filter(r => r['AI Revision']?.trim()).length;
-    const withRevisions = withXlfRevisions + withAiRevisions;
-    const withCodes = rows.filter(r => r['Code']?.trim()).length;
-    const majorErrors = rows.filter(r => r['Code']?.includes('TE-2')).length;
+    const total = stats ? stats.total : rows.length;
+    const withXlfRevisions = stats ? stats.with_revisions : rows.filter(r => r['New target']?.trim()).length;
+    const withAiRevisions = stats ? stats.ai_revised : rows.filter(r => r['AI Revision']?.trim()).length;
+    const withCodes = stats ? stats.with_codes : rows.filter(r => r['Code']?.trim()).length;
+    const majorErrors = stats ? stats.major_errors : rows.filter(r => r['Code']?.includes('TE-2')).length;
 
     const statsHtml = `
         <div class="stats">
@@ -1265,6 +1437,8 @@ function renderTable(rows, containerId) {
                     <option value="TC-0.5">TC-0.5 (Terminology)</option>
                     <option value="LQ-0.5">LQ-0.5 (Language Quality)</option>
                     <option value="ST-0.5">ST-0.5 (Style)</option>
+                    <option value="TG-2">TG-2 (Tag Issue)</option>
+                    <option value="TG-0.5">TG-0.5 (Tag Order)</option>
                 </select>
             </div>
             <div class="filter-group">
@@ -1281,11 +1455,11 @@ function renderTable(rows, containerId) {
             <div class="id-range-group">
                 <div class="filter-group">
                     <label for="idRangeMin">ID Min</label>
-                    <input type="number" id="idRangeMin" placeholder="e.g. 100" oninput="filterTable()">
+                    <input type="number" id="idRangeMin" placeholder="e.g. 100" oninput="filterTable(true)">
                 </div>
                 <div class="filter-group">
                     <label for="idRangeMax">ID Max</label>
-                    <input type="number" id="idRangeMax" placeholder="e.g. 500" oninput="filterTable()">
+                    <input type="number" id="idRangeMax" placeholder="e.g. 500" oninput="filterTable(true)">
                 </div>
             </div>
         </div>
@@ -1294,168 +1468,20 @@ function renderTable(rows, containerId) {
                 <svg class="search-icon" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M21 21l-6-6m2-5a7 7 0 11-14 0 7 7 0 0114 0z"></path>
                 </svg>
-                <input type="text" id="searchInput" placeholder="Search in source, target, or revision..." oninput="filterTable()">
+                <input type="text" id="searchInput" placeholder="Search in source, target, or revision..." oninput="filterTable(true)">
             </div>
         </div>
     `;
 
-    let tableRowsHtml = '';
-    for (const row of rows) {
-        const matecatId = escapeHtml(row['ID Matecat'] || '');
-        const state = (row['State'] || '').toLowerCase();
-        const sourceRaw = row['Source'] || '';
-        const targetRaw = row['Target'] || '';
-        const newTargetRaw = row['New target'] || '';
-        const aiRevisionRaw = row['AI Revision'] || '';
-        const confidenceScore = row['Confidence Score'] || '';
-        const code = escapeHtml(row['Code'] || '');
-        const comment = escapeHtml(row['Comment'] || '');
-
-        const source = formatTextWithTags(sourceRaw);
-        const target = formatTextWithTags(targetRaw);
-        const newTarget = formatTextWithTags(newTargetRaw);
-        const aiRevision = formatTextWithTags(aiRevisionRaw);
-
-        const hasAnyRevision = newTargetRaw || aiRevisionRaw;
-        const hasAiRevision = !!aiRevisionRaw;
-        const rowClass = hasAnyRevision ? 'has-revision' : 'no-revision';
-        const hasRevision = hasAnyRevision ? 'true' : 'false';
-        const hasAiRevisionAttr = hasAiRevision ? 'true' : 'false';
-
-        let codeHtml = '';
-        if (code) {
-            const codes = code.split(',').map(c => c.trim());
-            codeHtml = codes.map(c => {
-                const cssClass = `code-${c.replace(/\./g, '').replace(/-/g, '')}`;
-                return `<span class="${cssClass}">${c}</span>`;
-            }).join(' ');
-        }
-
-        let stateBadge = '<span style="color: #94a3b8;">—</span>';
-        if (state) {
-            stateBadge = `<span class="state-badge state-${state}">${state}</span>`;
-        }
-
-        let commentDisplay = '';
-        if (comment) {
-            const commentB64 = btoa(unescape(encodeURIComponent(comment)));
-            commentDisplay = `
-                <div class="comment-wrapper">
-                    <div>${comment}</div>
-                    <button class="comment-copy-button" data-text-b64="${commentB64}" onclick="copyCommentToClipboard(this)" title="Copy comment">
-                        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
-                        </svg>
-                        Copy
-                    </button>
-                </div>
-            `;
-        }
-
-        let newTargetDisplay = '<em>No revision</em>';
-        if (newTargetRaw) {
-            const newTargetB64 = btoa(unescape(encodeURIComponent(newTargetRaw)));
-            const newTargetFormatted = formatTextWithTags(newTargetRaw);
-            newTargetDisplay = `
-                <div class="has-revision xlf-revision" data-matecat-id="${matecatId}-xlf">
-                    <div class="revision-text" id="text-${matecatId}-xlf">${newTargetFormatted}<span class="edited-badge" id="badge-${matecatId}-xlf" style="display: none;">EDITED</span></div>
-                    <textarea class="revision-textarea" id="textarea-${matecatId}-xlf" data-original-b64="${newTargetB64}">${escapeHtml(showNonBreakingSpaces(newTargetRaw))}</textarea>
-                    <div class="button-group">
-                        <button class="copy-button" data-text-b64="${newTargetB64}" data-matecat-id="${matecatId}-xlf" onclick="copyToClipboard(this)" title="Copy revision">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
-                            </svg>
-                            Copy
-                        </button>
-                        <button class="edit-button" data-matecat-id="${matecatId}-xlf" onclick="editRevision(this)" title="Edit revision">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"></path>
-                            </svg>
-                            Edit
-                        </button>
-                        <button class="save-button" data-matecat-id="${matecatId}-xlf" onclick="saveRevision(this)" title="Save changes" style="display: none;">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
-                            </svg>
-                            Save
-                        </button>
-                        <button class="cancel-button" data-matecat-id="${matecatId}-xlf" onclick="cancelEdit(this)" title="Cancel editing" style="display: none;">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path>
-                            </svg>
-                            Cancel
-                        </button>
-                    </div>
-                </div>
-            `;
-        }
-
-        let aiRevisionDisplay = '<em>No AI revision</em>';
-        if (aiRevisionRaw) {
-            const aiRevisionB64 = btoa(unescape(encodeURIComponent(aiRevisionRaw)));
-            // Use highlightDifferences with whitespace visualization for AI Revision
-            // This shows differences from target AND visualizes all whitespace characters
-            const aiRevisionFormatted = highlightDifferences(targetRaw, aiRevisionRaw, true);
-
-            let confidenceBadge = '';
-            if (confidenceScore) {
-                const color = getConfidenceColor(confidenceScore);
-                confidenceBadge = `<span class="confidence-badge" style="background-color: ${color}; color: white; padding: 2px 6px; border-radius: 4px; font-size: 10px; font-weight: bold; margin-left: 6px;" title="Confidence Score: ${confidenceScore}%">${confidenceScore}%</span>`;
-            }
-
-            aiRevisionDisplay = `
-                <div class="has-revision ai-revision" data-matecat-id="${matecatId}-ai">
-                    <div class="revision-text" id="text-${matecatId}-ai">${aiRevisionFormatted}<span class="ai-badge">AI</span>${confidenceBadge}<span class="edited-badge" id="badge-${matecatId}-ai" style="display: none;">EDITED</span></div>
-                    <textarea class="revision-textarea" id="textarea-${matecatId}-ai" data-original-b64="${aiRevisionB64}">${escapeHtml(showNonBreakingSpaces(aiRevisionRaw))}</textarea>
-                    <div class="button-group">
-                        <button class="copy-button" data-text-b64="${aiRevisionB64}" data-matecat-id="${matecatId}-ai" onclick="copyToClipboard(this)" title="Copy AI revision">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
-                            </svg>
-                            Copy
-                        </button>
-                        <button class="edit-button" data-matecat-id="${matecatId}-ai" onclick="editRevision(this)" title="Edit AI revision">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"></path>
-                            </svg>
-                            Edit
-                        </button>
-                        <button class="save-button" data-matecat-id="${matecatId}-ai" onclick="saveRevision(this)" title="Save changes" style="display: none;">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
-                            </svg>
-                            Save
-                        </button>
-                        <button class="cancel-button" data-matecat-id="${matecatId}-ai" onclick="cancelEdit(this)" title="Cancel editing" style="display: none;">
-                            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path>
-                            </svg>
-                            Cancel
-                        </button>
-                    </div>
-                </div>
-            `;
-        }
-
-        tableRowsHtml += `
-           <tr class="${rowClass}" data-code="${code}" data-has-revision="${hasRevision}" data-has-ai-revision="${hasAiRevisionAttr}" data-has-xlf-revision="${newTargetRaw ? 'true' : 'false'}" data-state="${state}" data-matecat-id="${matecatId}">
-                <td class="id-col">${matecatId}${aiRevisionRaw ? '<span class="ai-badge">✨ AI</span>' : newTargetRaw ? '<span class="xlf-badge">📄 XLF</span>' : ''}</td>
-                <td class="state-col">${stateBadge}</td>
-                <td class="source-col">${source}</td>
-                <td class="target-col" data-raw-target="${escapeHtml(targetRaw)}">${target}</td>
-                <td class="new-target-col ${newTargetRaw ? 'has-revision xlf-revision-col' : ''}">${newTargetDisplay}</td>
-                <td class="ai-revision-col ${aiRevisionRaw ? 'has-revision ai-revision-col' : ''}">${aiRevisionDisplay}</td>
-                <td class="code-col">${codeHtml}</td>
-                <td class="comment-col">${commentDisplay}</td>
-            </tr>
-        `;
-    }
-
     container.innerHTML = `
         ${statsHtml}
         ${filtersHtml}
         <div class="table-wrapper">
-            <table id="revisionTable">
+            <table id="revisionTable" class="virtual-table">
+                <colgroup>
+                    <col class="col-id"><col class="col-state"><col class="col-text"><col class="col-text">
+                    <col class="col-revision"><col class="col-revision"><col class="col-code"><col class="col-comment">
+                </colgroup>
                 <thead>
                     <tr>
                         <th>ID Matecat</th>
@@ -1469,13 +1495,45 @@ function renderTable(rows, containerId) {
                     </tr>
                 </thead>
                 <tbody>
-                    ${tableRowsHtml}
+                    <tr class="virtual-spacer"><td colspan="8"></td></tr>
+                    <tr class="virtual-spacer"><td colspan="8"></td></tr>
                 </tbody>
             </table>
         </div>
     `;
 
-    loadSavedEdits();
+    // Filtering runs in the search worker; rows are materialized on scroll
+    indexRows(rows);
+    rowHeights = new Map();
+    renderedRows = new Map();
+    showFilteredRows(rows.map((_, i) => i));
+    filterTable();
+}
+
+function indexRows(rows) {
+    getSearchWorker().postMessage({
+        type: 'build',
+        rows: rows.map(r => [r['Source'], r['Target'], r['New target'], r['AI Revision'],
+            r['Code'], r['State'], r['ID Matecat']])
+    });
+}
+
+// Replace the rows of the rendered table (stat cards and filters stay as they
+// are; the new rows start with the ones already shown, so measured heights hold)
+function replaceTableRows(rows) {
+    currentTableData = rows;
+    indexRows(rows);
+    filterTable();
+}
+
+function getSearchWorker() {
+    if (!searchWorker) {
+        searchWorker = new Worker('assets/js/search_worker.js');
+        searchWorker.onmessage = (e) => {
+            if (e.data.seq === searchSeq) showFilteredRows(Array.from(e.data.ids));
+        };
+    }
+    return searchWorker;
 }
 
 function applyStatFilter(filterType) {
@@ -1510,12 +1568,15 @@ function applyStatFilter(filterType) {
     filterTable();
 }
 
-function filterTable() {
+// debounce: called while typing; the query is sent once input pauses
+function filterTable(debounce = false) {
+    clearTimeout(filterTimer);
+    if (debounce) {
+        filterTimer = setTimeout(filterTable, FILTER_DEBOUNCE_MS);
+        return;
+    }
+
     const codeFilter = document.getElementById('codeFilter')?.value || '';
-    const stateFilter = document.getElementById('stateFilter')?.value || '';
-    const idRangeMin = document.getElementById('idRangeMin')?.value;
-    const idRangeMax = document.getElementById('idRangeMax')?.value;
-    const searchText = (document.getElementById('searchInput')?.value || '').toLowerCase();
     const activeStatFilter = window.activeStatFilter || '';
     const table = document.getElementById('revisionTable');
     if (!table) return;
@@ -1534,76 +1595,178 @@ function filterTable() {
     }
     window._statFilterTriggered = false;
 
-    const rows = table.getElementsByTagName('tr');
-
-    const minId = idRangeMin ? parseInt(idRangeMin) : null;
-    const maxId = idRangeMax ? parseInt(idRangeMax) : null;
-
-    for (let i = 1; i < rows.length; i++) {
-        const row = rows[i];
-        const code = row.getAttribute('data-code') || '';
-        const state = row.getAttribute('data-state') || '';
-        const hasRevision = row.getAttribute('data-has-revision') === 'true';
-        const hasAiRevision = row.getAttribute('data-has-ai-revision') === 'true';
-        const source = row.cells[2]?.textContent.toLowerCase() || '';
-        const target = row.cells[3]?.textContent.toLowerCase() || '';
-        const newTarget = row.cells[4]?.textContent.toLowerCase() || '';
-        const aiRevision = row.cells[5]?.textContent.toLowerCase() || '';
-
-        const matecatIdText = row.cells[0]?.textContent || '';
-        const matecatIdMatch = matecatIdText.match(/\d+/);
-        const matecatId = matecatIdMatch ? parseInt(matecatIdMatch[0]) : null;
-
-        let inRange = true;
-        if (minId !== null || maxId !== null) {
-            if (matecatId === null) {
-                inRange = false;
-            } else {
-                if (minId !== null && matecatId < minId) inRange = false;
-                if (maxId !== null && matecatId > maxId) inRange = false;
-            }
+    getSearchWorker().postMessage({ type: 'query', seq: ++searchSeq, query: currentFilters() });
+}
+
+// The filter controls as a query (for the search worker and the export endpoint)
+function currentFilters() {
+    const idRangeMin = document.getElementById('idRangeMin')?.value;
+    const idRangeMax = document.getElementById('idRangeMax')?.value;
+    const activeStatFilter = window.activeStatFilter || '';
+    return {
+        search: (document.getElementById('searchInput')?.value || '').toLowerCase(),
+        code: document.getElementById('codeFilter')?.value || '',
+        state: document.getElementById('stateFilter')?.value || '',
+        minId: idRangeMin ? parseInt(idRangeMin) : null,
+        maxId: idRangeMax ? parseInt(idRangeMax) : null,
+        stat: activeStatFilter === 'all' ? '' : activeStatFilter
+    };
+}
+
+// Show a new result set: drop the materialized rows and render the window again
+function showFilteredRows(indexes) {
+    filteredIndexes = indexes;
+    renderedRows.forEach(tr => tr.remove());
+    renderedRows.clear();
+    renderedStart = renderedEnd = 0;
+    buildHeightTree();
+    renderVisibleRows(true);
+}
+
+// Sum the (measured or estimated) heights of the filtered rows, O(n) once per filter
+function buildHeightTree() {
+    const count = filteredIndexes.length;
+    positionHeights = new Float64Array(count);
+    heightTree = new Float64Array(count + 1);
+    for (let i = 1; i <= count; i++) {
+        positionHeights[i - 1] = rowHeights.get(filteredIndexes[i - 1]) || VIRTUAL_ROW_ESTIMATE;
+        heightTree[i] += positionHeights[i - 1];
+        const parent = i + (i & -i);
+        if (parent <= count) heightTree[parent] += heightTree[i];
+    }
+}
+
+function setPositionHeight(pos, height) {
+    const delta = height - positionHeights[pos];
+    if (!delta) return;
+    positionHeights[pos] = height;
+    for (let i = pos + 1; i < heightTree.length; i += i & -i) heightTree[i] += delta;
+}
+
+// Total height of the filtered rows before position `pos`
+function offsetOfPosition(pos) {
+    let offset = 0;
+    for (let i = pos; i > 0; i -= i & -i) offset += heightTree[i];
+    return offset;
+}
+
+// First filtered position whose row ends below `offset` (the row count if none does)
+function positionAtOffset(offset) {
+    const count = heightTree.length - 1;
+    let pos = 0;
+    let step = 1;
+    while (step * 2 <= count) step *= 2;
+    for (; step > 0; step >>= 1) {
+        if (pos + step <= count && heightTree[pos + step] <= offset) {
+            pos += step;
+            offset -= heightTree[pos];
         }
+    }
+    return pos;
+}
+
+// Record the real heights of the rows in the DOM
+function measureRenderedRows() {
+    for (let pos = renderedStart; pos < renderedEnd; pos++) {
+        const index = filteredIndexes[pos];
+        const tr = renderedRows.get(index);
+        if (!tr) continue;
+        rowHeights.set(index, tr.offsetHeight);
+        setPositionHeight(pos, tr.offsetHeight);
+    }
+}
+
+// Materialize the filtered rows around the viewport; spacer rows stand in for the rest
+function renderVisibleRows(force = false) {
+    const table = document.getElementById('revisionTable');
+    if (!table || table.offsetParent === null) return;
+    const tbody = table.tBodies[0];
+    const topSpacer = tbody.firstElementChild;
+    const bottomSpacer = tbody.lastElementChild;
 
-        let show = true;
-        if (codeFilter && !code.includes(codeFilter)) show = false;
-        if (stateFilter && state !== stateFilter) show = false;
-        if (!inRange) show = false;
-        if (searchText && !source.includes(searchText) && !target.includes(searchText) && !newTarget.includes(searchText) && !aiRevision.includes(searchText)) show = false;
+    // Measure what is on screen so offsets converge on the real layout
+    measureRenderedRows();
 
-        const hasXlfRevision = row.getAttribute('data-has-xlf-revision') === 'true';
-        if (activeStatFilter === 'ai-revisions' && !hasAiRevision) show = false;
-        if (activeStatFilter === 'xlf-revisions' && !hasXlfRevision) show = false;
-        if (activeStatFilter === 'error-codes' && !code.trim()) show = false;
-        if (activeStatFilter === 'major-errors' && !code.includes('TE-2')) show = false;
+    const tbodyTop = topSpacer.getBoundingClientRect().top;
+    const windowStart = -tbodyTop - VIRTUAL_OVERSCAN;
+    const windowEnd = -tbodyTop + window.innerHeight + VIRTUAL_OVERSCAN;
 
-        row.style.display = show ? '' : 'none';
+    const count = filteredIndexes.length;
+    const start = positionAtOffset(windowStart);
+    const end = Math.min(positionAtOffset(windowEnd) + 1, count);
+
+    if (!force && renderedRows.size === end - start &&
+        renderedRows.has(filteredIndexes[start]) && renderedRows.has(filteredIndexes[end - 1])) {
+        return;
     }
+
+    // Keep rows that stay in the window (preserves edits in progress), add the new ones in order
+    const visible = new Set(filteredIndexes.slice(start, end));
+    renderedRows.forEach((tr, index) => {
+        if (!visible.has(index)) {
+            tr.remove();
+            renderedRows.delete(index);
+        }
+    });
+    let next = bottomSpacer;
+    for (let pos = end - 1; pos >= start; pos--) {
+        const index = filteredIndexes[pos];
+        let tr = renderedRows.get(index);
+        if (!tr) {
+            tr = createRowElement(currentTableData[index]);
+            tbody.insertBefore(tr, next);
+            renderedRows.set(index, tr);
+        }
+        next = tr;
+    }
+
+    renderedStart = start;
+    renderedEnd = end;
+    measureRenderedRows();
+    const before = offsetOfPosition(start);
+    const after = offsetOfPosition(count) - offsetOfPosition(end);
+    topSpacer.firstElementChild.style.height = `${before}px`;
+    bottomSpacer.firstElementChild.style.height = `${after}px`;
 }
 
-function loadSavedEdits() {
-    setTimeout(() => {
-        const revisions = document.querySelectorAll('.has-revision[data-matecat-id]');
-        revisions.forEach(function (rev) {
-            const matecatId = rev.getAttribute('data-matecat-id');
-            const savedText = localStorage.getItem('revision_' + matecatId);
-            if (savedText) {
-                const textDiv = document.getElementById('text-' + matecatId);
-                const textarea = document.getElementById('textarea-' + matecatId);
-                const badge = document.getElementById('badge-' + matecatId);
-                const copyButton = rev.querySelector('.copy-button');
-
-                if (textDiv && textarea && badge && copyButton) {
-                    const formattedText = formatTextWithTags(savedText);
-                    textDiv.innerHTML = formattedText + '<span class="edited-badge">EDITED</span>';
-                    // Show non-breaking spaces as ° in textarea
-                    textarea.value = showNonBreakingSpaces(savedText);
-                    badge.style.display = 'inline-block';
-                    const editedB64 = btoa(unescape(encodeURIComponent(savedText)));
-                    copyButton.setAttribute('data-text-b64', editedB64);
-                }
+function scheduleVirtualRender() {
+    if (virtualRenderPending) return;
+    virtualRenderPending = true;
+    requestAnimationFrame(() => {
+        virtualRenderPending = false;
+        renderVisibleRows();
+    });
+}
+
+function createRowElement(row) {
+    const template = document.createElement('tbody');
+    template.innerHTML = renderRowHtml(row);
+    const tr = template.firstElementChild;
+    applySavedEdits(tr);
+    return tr;
+}
+
+function applySavedEdits(tr) {
+    tr.querySelectorAll('.has-revision[data-matecat-id]').forEach(function (rev) {
+        const matecatId = rev.getAttribute('data-matecat-id');
+        const savedText = savedEditText(matecatId);
+        if (savedText) {
+            const textDiv = rev.querySelector('.revision-text');
+            const textarea = rev.querySelector('.revision-textarea');
+            const badge = rev.querySelector('.edited-badge');
+            const copyButton = rev.querySelector('.copy-button');
+
+            if (textDiv && textarea && badge && copyButton) {
+                const formattedText = formatTextWithTags(savedText);
+                textDiv.innerHTML = formattedText + '<span class="edited-badge">EDITED</span>';
+                // Show non-breaking spaces as ° in textarea
+                textarea.value = showNonBreakingSpaces(savedText);
+                badge.style.display = 'inline-block';
+                const editedB64 = btoa(unescape(encodeURIComponent(savedText)));
+                copyButton.setAttribute('data-text-b64', editedB64);
             }
-        });
-    }, 100);
+        }
+    });
 }
 
 // --- Initialization ---
@@ -1639,6 +1802,10 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    window.addEventListener('scroll', scheduleVirtualRender, { passive: true });
+    window.addEventListener('pagehide', () => flushEdits(true));
+    window.addEventListener('resize', scheduleVirtualRender);
+
     document.addEventListener('keydown', function (e) {
         if ((e.ctrlKey || e.metaKey) && e.key === 'f') {
             e.preventDefault();
@@ -0,0 +1,304 @@
+// Behaviour of the generated revision_table.html pages
+// Format text with tags for display
+function formatTextWithTags(text) {
+    const tagPattern = /(<[^>]+>|<\/[^>]+>)/g;
+    let result = text;
+    result = result.replace(tagPattern, function(match) {
+        const escaped = match.replace(/</g, '&lt;').replace(/>/g, '&gt;');
+        if (match.startsWith('</')) {
+            return '<span class="tag tag-closing">' + escaped + '</span>';
+        } else {
+            return '<span class="tag">' + escaped + '</span>';
+        }
+    });
+    result = result.replace(/([^<]+)/g, function(match) {
+        if (match.trim()) {
+            return '<span class="text-content">' + match.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;') + '</span>';
+        }
+        return match;
+    });
+    return result;
+}
+
+// Load saved edits from localStorage on page load
+window.addEventListener('DOMContentLoaded', function() {
+    const revisions = document.querySelectorAll('.has-revision[data-matecat-id]');
+    revisions.forEach(function(rev) {
+        const matecatId = rev.getAttribute('data-matecat-id');
+        const savedText = localStorage.getItem('revision_' + matecatId);
+        if (savedText) {
+            const textDiv = document.getElementById('text-' + matecatId);
+            const textarea = document.getElementById('textarea-' + matecatId);
+            const badge = document.getElementById('badge-' + matecatId);
+            const copyButton = rev.querySelector('.copy-button');
+
+            if (textDiv && textarea && badge && copyButton) {
+                const formattedText = formatTextWithTags(savedText);
+                textDiv.innerHTML = formattedText + '<span class="edited-badge">EDITED</span>';
+                textarea.value = savedText;
+                badge.style.display = 'inline-block';
+
+                const editedB64 = btoa(unescape(encodeURIComponent(savedText)));
+                copyButton.setAttribute('data-text-b64', editedB64);
+            }
+        }
+    });
+});
+
+// Properly decode UTF-8 from base64
+function base64ToUtf8(base64) {
+    const binaryString = atob(base64);
+    const bytes = new Uint8Array(binaryString.length);
+    for (let i = 0; i < binaryString.length; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+    }
+    // Use TextDecoder to properly decode UTF-8
+    const decoder = new TextDecoder('utf-8');
+    return decoder.decode(bytes);
+}
+
+// Decode HTML entities and remove tags to get plain text
+function getPlainText(htmlText) {
+    // Create a temporary div to decode HTML entities and extract text
+    const tempDiv = document.createElement('div');
+    tempDiv.innerHTML = htmlText;
+    // Get plain text content (this automatically decodes entities and removes tags)
+    let plainText = tempDiv.textContent || tempDiv.innerText || '';
+    // Clean up any remaining issues
+    plainText = plainText.replace(/\s+/g, ' ').trim();
+    return plainText;
+}
+
+// Copy comment to clipboard function
+function copyCommentToClipboard(button) {
+    const textB64 = button.getAttribute('data-text-b64');
+    // Properly decode UTF-8 from base64
+    let text = base64ToUtf8(textB64);
+    // The text should already be plain text, but remove any HTML tags just in case
+    const tempDiv = document.createElement('div');
+    tempDiv.textContent = text;
+    text = tempDiv.textContent || text;
+
+    navigator.clipboard.writeText(text).then(function() {
+        const originalText = button.innerHTML;
+        button.innerHTML = `
+            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+            </svg>
+            Copied!
+        `;
+        button.classList.add('copied');
+
+        setTimeout(function() {
+            button.innerHTML = originalText;
+            button.classList.remove('copied');
+        }, 2000);
+    }).catch(function(err) {
+        console.error('Failed to copy: ', err);
+        alert('Failed to copy to clipboard');
+    });
+}
+
+// Copy to clipboard function
+function copyToClipboard(button) {
+    const textB64 = button.getAttribute('data-text-b64');
+    // Properly decode UTF-8 from base64
+    let text = base64ToUtf8(textB64);
+    // The text should already be plain text, but remove any HTML tags just in case
+    const tempDiv = document.createElement('div');
+    tempDiv.textContent = text;
+    text = tempDiv.textContent || text;
+
+    navigator.clipboard.writeText(text).then(function() {
+        const originalText = button.innerHTML;
+        button.innerHTML = `
+            <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+            </svg>
+            Copied!
+        `;
+        button.classList.add('copied');
+
+        setTimeout(function() {
+            button.innerHTML = originalText;
+            button.classList.remove('copied');
+        }, 2000);
+    }).catch(function(err) {
+        console.error('Failed to copy: ', err);
+        alert('Failed to copy to clipboard');
+    });
+}
+
+// Edit revision function
+function editRevision(button) {
+    const matecatId = button.getAttribute('data-matecat-id');
+    const textDiv = document.getElementById('text-' + matecatId);
+    const textarea = document.getElementById('textarea-' + matecatId);
+    const editButton = button;
+    const saveButton = button.parentElement.querySelector('.save-button');
+    const cancelButton = button.parentElement.querySelector('.cancel-button');
+    const copyButton = button.parentElement.querySelector('.copy-button');
+
+    textDiv.classList.add('editing');
+    textarea.classList.add('editing');
+
+    editButton.style.display = 'none';
+    saveButton.style.display = 'inline-flex';
+    cancelButton.style.display = 'inline-flex';
+    copyButton.style.display = 'none';
+
+    textarea.focus();
+    textarea.setSelectionRange(textarea.value.length, textarea.value.length);
+}
+
+// Save revision function
+function saveRevision(button) {
+    const matecatId = button.getAttribute('data-matecat-id');
+    const textDiv = document.getElementById('text-' + matecatId);
+    const textarea = document.getElementById('textarea-' + matecatId);
+    const editButton = button.parentElement.querySelector('.edit-button');
+    const saveButton = button;
+    const cancelButton = button.parentElement.querySelector('.cancel-button');
+    const copyButton = button.parentElement.querySelector('.copy-button');
+    const badge = document.getElementById('badge-' + matecatId);
+
+    const newText = textarea.value;
+
+    const formattedText = formatTextWithTags(newText);
+    textDiv.innerHTML = formattedText + '<span class="edited-badge">EDITED</span>';
+    textDiv.classList.remove('editing');
+    textarea.classList.remove('editing');
+
+    if (badge) {
+        badge.style.display = 'inline-block';
+    }
+
+    localStorage.setItem('revision_' + matecatId, newText);
+
+    const newTextB64 = btoa(unescape(encodeURIComponent(newText)));
+    copyButton.setAttribute('data-text-b64', newTextB64);
+
+    editButton.style.display = 'inline-flex';
+    saveButton.style.display = 'none';
+    cancelButton.style.display = 'none';
+    copyButton.style.display = 'inline-flex';
+
+    const originalText = button.innerHTML;
+    button.innerHTML = `
+        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+        </svg>
+        Saved!
+    `;
+    setTimeout(function() {
+        button.innerHTML = originalText;
+    }, 1500);
+}
+
+// Cancel edit function
+function cancelEdit(button) {
+    const matecatId = button.getAttribute('data-matecat-id');
+    const textDiv = document.getElementById('text-' + matecatId);
+    const textarea = document.getElementById('textarea-' + matecatId);
+    const editButton = button.parentElement.querySelector('.edit-button');
+    const saveButton = button.parentElement.querySelector('.save-button');
+    const cancelButton = button;
+    const copyButton = button.parentElement.querySelector('.copy-button');
+
+    const originalB64 = textarea.getAttribute('data-original-b64');
+    const savedText = localStorage.getItem('revision_' + matecatId);
+    const textToShow = savedText || atob(originalB64);
+
+    const badge = document.getElementById('badge-' + matecatId);
+    if (savedText && badge) {
+        textDiv.innerHTML = formatTextWithTags(textToShow) + '<span class="edited-badge">EDITED</span>';
+        badge.style.display = 'inline-block';
+    } else {
+        textDiv.innerHTML = formatTextWithTags(textToShow);
+        if (badge) badge.style.display = 'none';
+    }
+
+    textarea.value = textToShow;
+    textDiv.classList.remove('editing');
+    textarea.classList.remove('editing');
+
+    editButton.style.display = 'inline-flex';
+    saveButton.style.display = 'none';
+    cancelButton.style.display = 'none';
+    copyButton.style.display = 'inline-flex';
+}
+
+// Update checkbox wrapper styling
+document.getElementById('revisionsOnly').addEventListener('change', function() {
+    const wrapper = this.closest('.checkbox-wrapper');
+    if (this.checked) {
+        wrapper.classList.add('checked');
+    } else {
+        wrapper.classList.remove('checked');
+    }
+});
+
+// Filter table function
+function filterTable() {
+    const codeFilter = document.getElementById('codeFilter').value;
+    const stateFilter = document.getElementById('stateFilter').value;
+    const revisionsOnly = document.getElementById('revisionsOnly').checked;
+    const searchText = document.getElementById('searchBox').value.toLowerCase();
+    const table = document.getElementById('revisionTable');
+    const rows = table.getElementsByTagName('tr');
+
+    // Update checkbox wrapper styling
+    const checkboxWrapper = document.getElementById('revisionsOnly').closest('.checkbox-wrapper');
+    if (revisionsOnly) {
+        checkboxWrapper.classList.add('checked');
+    } else {
+        checkboxWrapper.classList.remove('checked');
+    }
+
+    let visibleCount = 0;
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const code = row.getAttribute('data-code') || '';
+        const state = row.getAttribute('data-state') || '';
+        const hasRevision = row.getAttribute('data-has-revision') === 'true';
+        const source = row.cells[2].textContent.toLowerCase();
+        const target = row.cells[3].textContent.toLowerCase();
+        const newTarget = row.cells[4].textContent.toLowerCase();
+
+        let show = true;
+
+        if (codeFilter && !code.includes(codeFilter)) {
+            show = false;
+        }
+
+        if (stateFilter && state !== stateFilter) {
+            show = false;
+        }
+
+        if (revisionsOnly && !hasRevision) {
+            show = false;
+        }
+
+        if (searchText && !source.includes(searchText) && !target.includes(searchText) && !newTarget.includes(searchText)) {
+            show = false;
+        }
+
+        if (show) {
+            row.style.display = '';
+            visibleCount++;
+            row.style.animation = 'fadeInUp 0.3s ease-out';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    // Ctrl/Cmd + F to focus search
+    if ((e.ctrlKey || e.metaKey) && e.key === 'f') {
+        e.preventDefault();
+        document.getElementById('searchBox').focus();
+    }
+});
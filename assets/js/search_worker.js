@@ -0,0 +1,228 @@
+// Search index of the job table, built off the main thread from the job data.
+// Text search goes through an inverted index (word -> row ids); codes, states
+// and revision flags are bitsets, so a query is a handful of bitset ANDs.
+
+const WORD_PATTERN = /[\p{L}\p{N}_]+/gu;
+const TERM_CACHE_SIZE = 256;
+
+let rowCount = 0;
+let texts = [];              // Lowercased searchable text per row (checks phrase queries)
+let postings = new Map();    // word -> Uint32Array of row ids
+let vocabulary = [];
+let trigrams = new Map();    // trigram -> indexes of the vocabulary words containing it
+let codes = [];
+let ids = new Float64Array(0); // Numeric Matecat id per row, -1 when missing
+let idOrder = new Uint32Array(0); // Rows with an id, sorted by id (range filter)
+let stateBits = new Map();   // state -> bitset
+let flagBits = {};           // ai / xlf / code -> bitset
+let codeBits = new Map();    // code filter value -> bitset (built on first use)
+let termMatches = new Map(); // query word -> vocabulary words containing it
+let termBits = new Map();    // query word -> bitset of the rows containing it
+
+function newBitset() {
+    return new Uint32Array(Math.ceil(rowCount / 32));
+}
+
+function setBit(bits, i) {
+    bits[i >>> 5] |= 1 << (i & 31);
+}
+
+function andInto(target, bits) {
+    for (let w = 0; w < target.length; w++) target[w] &= bits[w];
+    return target;
+}
+
+function allBits() {
+    const bits = newBitset().fill(0xFFFFFFFF);
+    const tail = rowCount & 31;
+    if (tail) bits[bits.length - 1] = (1 << tail) - 1;
+    return bits;
+}
+
+function popcount(word) {
+    word -= (word >>> 1) & 0x55555555;
+    word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+    return (((word + (word >>> 4)) & 0x0F0F0F0F) * 0x01010101) >>> 24;
+}
+
+function forEachBit(bits, callback) {
+    for (let w = 0; w < bits.length; w++) {
+        let word = bits[w];
+        while (word) {
+            const low = word & -word;
+            callback((w << 5) + 31 - Math.clz32(low));
+            word ^= low;
+        }
+    }
+}
+
+// rows: [source, target, new target, AI revision, code, state, Matecat id]
+function build(rows) {
+    rowCount = rows.length;
+    texts = new Array(rowCount);
+    codes = new Array(rowCount);
+    ids = new Float64Array(rowCount);
+    stateBits = new Map();
+    flagBits = { ai: newBitset(), xlf: newBitset(), code: newBitset() };
+    codeBits = new Map();
+    termMatches = new Map();
+    termBits = new Map();
+
+    const lists = new Map();
+    rows.forEach((row, i) => {
+        const [source, target, newTarget, aiRevision, code, state, matecatId] = row;
+        const text = [source, target, newTarget, aiRevision].map(t => (t || '').toLowerCase()).join('\n');
+        texts[i] = text;
+        for (const word of new Set(text.match(WORD_PATTERN))) {
+            let list = lists.get(word);
+            if (!list) lists.set(word, list = []);
+            list.push(i);
+        }
+
+        codes[i] = code || '';
+        const stateKey = (state || '').toLowerCase();
+        if (!stateBits.has(stateKey)) stateBits.set(stateKey, newBitset());
+        setBit(stateBits.get(stateKey), i);
+        if (aiRevision) setBit(flagBits.ai, i);
+        if (newTarget) setBit(flagBits.xlf, i);
+        if (codes[i].trim()) setBit(flagBits.code, i);
+
+        const idMatch = (matecatId || '').match(/\d+/);
+        ids[i] = idMatch ? parseInt(idMatch[0]) : -1;
+    });
+
+    idOrder = Uint32Array.from(ids.keys()).filter(i => ids[i] >= 0).sort((a, b) => ids[a] - ids[b]);
+
+    postings = new Map();
+    lists.forEach((list, word) => postings.set(word, Uint32Array.from(list)));
+    vocabulary = Array.from(postings.keys());
+
+    trigrams = new Map();
+    vocabulary.forEach((word, w) => {
+        const seen = new Set();
+        for (let k = 0; k + 3 <= word.length; k++) seen.add(word.slice(k, k + 3));
+        for (const gram of seen) {
+            let list = trigrams.get(gram);
+            if (!list) trigrams.set(gram, list = []);
+            list.push(w);
+        }
+    });
+}
+
+// Same semantics as the old row scan: the code column contains the value
+function codeBitset(value) {
+    let bits = codeBits.get(value);
+    if (!bits) {
+        bits = newBitset();
+        codes.forEach((code, i) => { if (code.includes(value)) setBit(bits, i); });
+        codeBits.set(value, bits);
+    }
+    return bits;
+}
+
+// Vocabulary words containing a query word. Candidates come from the rarest
+// trigram of the word, or from the shorter query word typed just before it.
+function wordsContaining(term) {
+    let matches = termMatches.get(term);
+    if (!matches) {
+        let candidates = termMatches.get(term.slice(0, -1)) || termMatches.get(term.slice(1));
+        if (!candidates && term.length >= 3) {
+            let rarest = null;
+            for (let k = 0; k + 3 <= term.length; k++) {
+                const list = trigrams.get(term.slice(k, k + 3)) || [];
+                if (!rarest || list.length < rarest.length) rarest = list;
+            }
+            candidates = rarest.map(w => vocabulary[w]);
+        }
+        matches = (candidates || vocabulary).filter(word => word.includes(term));
+        if (termMatches.size >= TERM_CACHE_SIZE) termMatches.clear();
+        termMatches.set(term, matches);
+    }
+    return matches;
+}
+
+function termBitset(term) {
+    let bits = termBits.get(term);
+    if (!bits) {
+        bits = newBitset();
+        for (const word of wordsContaining(term)) {
+            for (const i of postings.get(word)) setBit(bits, i);
+        }
+        if (termBits.size >= TERM_CACHE_SIZE) termBits.clear();
+        termBits.set(term, bits);
+    }
+    return bits;
+}
+
+function searchBitset(search) {
+    const terms = [...new Set(search.match(WORD_PATTERN))];
+    // Short words only narrow the candidates when nothing more selective is typed
+    const selective = terms.filter(term => term.length >= 3);
+    let result = terms.length ? null : allBits();
+    for (const term of selective.length ? selective : terms) {
+        const rows = termBitset(term);
+        result = result ? andInto(result, rows) : rows.slice();
+    }
+
+    // A lone word is answered exactly by the index; anything else (phrases,
+    // punctuation, tags) is a substring match checked on the candidates
+    if (!(terms.length === 1 && terms[0] === search)) {
+        forEachBit(result, i => {
+            if (!texts[i].includes(search)) result[i >>> 5] &= ~(1 << (i & 31));
+        });
+    }
+    return result;
+}
+
+// query: { search, code, state, minId, maxId, stat }
+function idRangeBitset(minId, maxId) {
+    const lowerBound = value => {
+        let lo = 0, hi = idOrder.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (ids[idOrder[mid]] < value) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    };
+    const bits = newBitset();
+    const end = maxId === null ? idOrder.length : lowerBound(maxId + 1);
+    for (let k = minId === null ? 0 : lowerBound(minId); k < end; k++) setBit(bits, idOrder[k]);
+    return bits;
+}
+
+function query(q) {
+    const bits = allBits();
+    if (q.minId !== null || q.maxId !== null) andInto(bits, idRangeBitset(q.minId, q.maxId));
+    if (q.code) andInto(bits, codeBitset(q.code));
+    if (q.state) andInto(bits, stateBits.get(q.state) || newBitset());
+    if (q.stat === 'ai-revisions') andInto(bits, flagBits.ai);
+    if (q.stat === 'xlf-revisions') andInto(bits, flagBits.xlf);
+    if (q.stat === 'error-codes') andInto(bits, flagBits.code);
+    if (q.stat === 'major-errors') andInto(bits, codeBitset('TE-2'));
+    if (q.search) andInto(bits, searchBitset(q.search));
+
+    let count = 0;
+    for (let w = 0; w < bits.length; w++) count += popcount(bits[w]);
+    const matches = new Uint32Array(count);
+    let n = 0;
+    for (let w = 0; w < bits.length; w++) {
+        let word = bits[w];
+        while (word) {
+            const low = word & -word;
+            matches[n++] = (w << 5) + 31 - Math.clz32(low);
+            word ^= low;
+        }
+    }
+    return matches;
+}
+
+self.onmessage = function (e) {
+    const message = e.data;
+    if (message.type === 'build') {
+        build(message.rows);
+    } else if (message.type === 'query') {
+        const started = performance.now();
+        const matches = query(message.query);
+        self.postMessage({ seq: message.seq, ids: matches, ms: performance.now() - started }, [matches.buffer]);
+    }
+};
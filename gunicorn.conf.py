@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration for serving CoolerCat in production
+
+    gunicorn -c gunicorn.conf.py
+
+Send SIGHUP to the master (see restart.sh) for a graceful reload: workers
+finish their in-flight requests before being replaced. AI revisions run in
+detached task processes (scripts/tasks.py) and are not affected by reloads.
+"""
+import multiprocessing
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+chdir = os.path.join(PROJECT_ROOT, 'scripts')
+wsgi_app = 'server:app'
+bind = os.getenv('COOLERCAT_BIND', '0.0.0.0:5001')
+pidfile = os.path.join(PROJECT_ROOT, 'gunicorn.pid')
+
+# Threaded workers: progress streams (SSE) hold a thread each, not a whole process
+worker_class = 'gthread'
+workers = int(os.getenv('COOLERCAT_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('COOLERCAT_THREADS', 8))
+
+timeout = 120
+graceful_timeout = int(os.getenv('COOLERCAT_GRACEFUL_TIMEOUT', 60))
+keepalive = 5
+
+# Static assets are handed to the kernel with sendfile()
+sendfile = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('COOLERCAT_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Start every server run with empty metrics (samples of all processes live in jobs/.metrics)
+    import sys
+    sys.path.insert(0, chdir)
+    from metrics import reset_metrics
+    reset_metrics()
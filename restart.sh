@@ -1,9 +1,21 @@
 #!/bin/bash
 # Restart the CoolerCat server
+# A running gunicorn master is reloaded gracefully (in-flight requests drain,
+# background AI revisions keep running); otherwise a new server is started.
+
+cd "$(dirname "$0")"
+PIDFILE="gunicorn.pid"
+
+if [ -f "$PIDFILE" ] && kill -0 "$(cat "$PIDFILE")" 2>/dev/null; then
+    echo "🔄 Reloading CoolerCat workers..."
+    kill -HUP "$(cat "$PIDFILE")"
+    echo "✓ Workers are being replaced gracefully"
+    exit 0
+fi
 
 echo "🔄 Restarting CoolerCat server..."
 
-# Kill existing server process
+# Kill a development server started with scripts/server.py
 pkill -f "python.*server.py" 2>/dev/null
 if [ $? -eq 0 ]; then
     echo "✓ Stopped existing server"
@@ -14,5 +26,4 @@ fi
 
 # Start the server
 echo "🚀 Starting server..."
-cd "$(dirname "$0")"
-venv/bin/python scripts/server.py
+venv/bin/gunicorn -c gunicorn.conf.py
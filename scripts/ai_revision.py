@@ -4,13 +4,24 @@ AI-powered revision system for French translations
 Uses LLM (Gemini/OpenAI) to review translations based on documentation
 """
 import csv
-import json
 import os
 import sys
 import re
+import tempfile
 import time
 from dotenv import load_dotenv
 
+from job_stats import add_stats, empty_stats, row_stats
+from knowledge import load_knowledge
+from llm_output import RESPONSE_SCHEMA, InvalidOutput, parse_output, reask_prompt, validate_output
+from quality_score import add_row as add_quality
+from metrics import observe_llm_call, observe_segment
+from progress import ProgressReporter
+from rollups import add_row as add_rollup
+from tag_integrity import TAG_CODES, tag_problem
+from text_diff import diff_ops, encode_ops
+from translation_memory import TranslationMemory, normalize
+
 # Load environment variables
 load_dotenv()
 
@@ -21,36 +32,57 @@ try:
 except ImportError:
     HAS_GEMINI = False
 
+# Times an invalid answer is sent back to the model with its problems before the segment is given up
+MAX_REASKS = max(int(os.getenv('COOLERCAT_LLM_REASKS', 2)), 0)
+
+# Error code a learning journal category usually maps to, shown with past corrections
+JOURNAL_CATEGORY_CODES = {
+    'Terminologie': 'TC-0.5',
+    'Contexte UI': 'TC-0.5',
+    'Style et ton': 'ST-0.5',
+    'Politesse/registre': 'ST-0.5',
+    'Typographie': 'LQ-0.5',
+    'Formats': 'LQ-0.5',
+}
+
 class LLMReviser:
     def __init__(self, knowledge_base_path=None):
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.knowledge_base = ""
         
-        # Load knowledge base - use absolute path
-        if knowledge_base_path is None:
-            # Default to knowledge_base.txt in project root
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(script_dir)  # Go up one level from scripts/
-            knowledge_base_path = os.path.join(project_root, 'knowledge_base.txt')
-        
-        if os.path.exists(knowledge_base_path):
+        # Compiled from knowledge_base.txt and docs/resources (rebuilt when they change)
+        self.knowledge = load_knowledge()
+        self.knowledge_version = self.knowledge.version
+        # UsageMeter the calls are recorded in (set by the caller)
+        self.usage = None
+        self.knowledge_base = self.knowledge.instructions
+        if knowledge_base_path is not None:
             with open(knowledge_base_path, 'r', encoding='utf-8') as f:
                 self.knowledge_base = f.read()
-            print(f"Loaded knowledge base from: {knowledge_base_path}")
-        else:
-            print(f"WARNING: Knowledge base not found at: {knowledge_base_path}")
+        print(f"Loaded knowledge base {self.knowledge_version} "
+              f"({len(self.knowledge.terms)} glossary terms, {len(self.knowledge.journal)} journal entries)")
         
         if self.api_key and HAS_GEMINI:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
-            print(f"✓ Gemini API configured successfully (using gemini-2.0-flash)")
+            self.model_name = 'gemini-2.0-flash'
+            try:
+                # Constrained to the answer's JSON schema
+                self.model = genai.GenerativeModel(self.model_name, generation_config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': RESPONSE_SCHEMA,
+                })
+            except (TypeError, ValueError) as e:
+                print(f"WARNING: Structured output not supported by this google-generativeai ({e})")
+                self.model = genai.GenerativeModel(self.model_name)
+            print(f"✓ Gemini API configured successfully (using {self.model_name})")
         else:
+            self.model_name = 'mock'
             self.model = None
             print("WARNING: No API key found or google-generativeai not installed. Falling back to mock mode.")
 
-    def revise(self, source_text, target_text, segment_id):
+    def revise(self, source_text, target_text, segment_id, reference=None):
         """
         Revise a translation using LLM
+        `reference` is a translation memory match for a similar source, shown to the model
         """
         if not target_text or not target_text.strip():
             return self._empty_result(target_text)
@@ -63,43 +95,57 @@ class LLMReviser:
         if not self.model:
             return self._mock_revision(source_text, target_text)
 
-        try:
-            prompt = self._build_prompt(source_text, target_text)
-            response = self.model.generate_content(prompt)
-            
-            # Parse JSON response
+        prompt = self._build_prompt(source_text, target_text, reference)
+        # Part of the prompt tokens spent on the knowledge base instructions
+        knowledge_share = len(self.knowledge_base) / len(prompt) if prompt else 0.0
+        contents = [{'role': 'user', 'parts': [prompt]}]
+        problems = []
+        for attempt in range(MAX_REASKS + 1):
+            call_started = time.perf_counter()
             try:
-                # Clean up markdown code blocks if present
-                text = response.text.strip()
-                if text.startswith('```json'):
-                    text = text[7:]
-                if text.endswith('```'):
-                    text = text[:-3]
-                
-                result = json.loads(text.strip())
-                
-                # Debug: Print what AI returned
-                print(f"  AI Response for {segment_id}:")
-                print(f"    Revised: {result.get('revised_text', 'N/A')}")
-                print(f"    Codes: {result.get('error_codes', [])}")
-                print(f"    Comment: {result.get('comment', 'N/A')}")
-                
-                return {
-                    'revised_text': result.get('revised_text', target_text),
-                    'has_revision': len(result.get('error_codes', [])) > 0,  # Has revision if there are error codes
-                    'error_codes': result.get('error_codes', []),
-                    'comment': result.get('comment', ''),
-                    'confidence': result.get('confidence_score', 0)
-                }
-            except json.JSONDecodeError:
-                print(f"Error parsing JSON for segment {segment_id}")
-                return self._empty_result(target_text)
-                
-        except Exception as e:
-            print(f"Error calling AI for segment {segment_id}: {e}")
-            return self._empty_result(target_text)
-
-    def _build_prompt(self, source, target):
+                response = self.model.generate_content(contents)
+                text = response.text
+            except Exception as e:
+                observe_llm_call(self.model_name, time.perf_counter() - call_started, outcome='error')
+                print(f"Error calling AI for segment {segment_id}: {e}")
+                return self._failed_result(target_text, f"API error: {e}")
+            usage = getattr(response, 'usage_metadata', None)
+            if self.usage is not None:
+                self.usage.record_call('review' if attempt == 0 else 'reask', self.model_name, usage,
+                                       knowledge_share)
+            try:
+                result = validate_output(parse_output(text), target_text)
+            except InvalidOutput as e:
+                observe_llm_call(self.model_name, time.perf_counter() - call_started, outcome='invalid',
+                                 prompt_tokens=getattr(usage, 'prompt_token_count', 0) or 0,
+                                 completion_tokens=getattr(usage, 'candidates_token_count', 0) or 0)
+                print(f"  Invalid AI answer for {segment_id} (attempt {attempt + 1}): {e}")
+                problems = e.problems
+                # Only this segment is asked again, with the answer and what is wrong with it
+                contents += [{'role': 'model', 'parts': [text]},
+                             {'role': 'user', 'parts': [reask_prompt(e.problems)]}]
+                continue
+            observe_llm_call(self.model_name, time.perf_counter() - call_started,
+                             prompt_tokens=getattr(usage, 'prompt_token_count', 0) or 0,
+                             completion_tokens=getattr(usage, 'candidates_token_count', 0) or 0)
+            return result
+        
+        return self._failed_result(target_text, f"Invalid answer after {MAX_REASKS} re-asks: {'; '.join(problems)}")
+
+    def _build_prompt(self, source, target, reference=None):
+        memory_note = ""
+        if reference:
+            memory_note = f"""
+TRANSLATION MEMORY ({reference['score']:.0%} match - an approved translation of a similar source;
+follow its terminology and phrasing where it applies to this source):
+Source (English): "{reference['source']}"
+Approved (French): "{reference['target']}"
+"""
+        # Glossary terms of this source
+        knowledge_note = self.knowledge.segment_context(source)
+        if knowledge_note:
+            knowledge_note = f"\n{knowledge_note}\n"
+        examples_note = self._examples_note(source, target)
         return f"""You are a quality reviewer for Notion's French translations.
 
 KNOWLEDGE BASE:
@@ -108,7 +154,7 @@ KNOWLEDGE BASE:
 TASK:
 Source (English): "{source}"
 Target (French): "{target}"
-
+{knowledge_note}{memory_note}
 CRITICAL INSTRUCTIONS - MULTI-PASS REVIEW:
 
 **PASS 1 - CRITICAL ERRORS (MANDATORY - CHECK EVERY SINGLE ONE):**
@@ -186,7 +232,7 @@ CRITICAL INSTRUCTIONS - MULTI-PASS REVIEW:
 
 12. **TYPOGRAPHY ERRORS** (LQ-0.5):
     - NO tiret cadratin (—) in French UI - use period/colon
-    - ICU plurals: {count}°propriété (non-breaking space)
+    - ICU plurals: {{count}}°propriété (non-breaking space)
 
 **PASS 2 - GLOSSARY VALIDATION (MANDATORY):**
 6. **TERMINOLOGY CHECK**: Identify ALL terms in the source text that might be in the Notion Glossary. For EACH term found in the glossary, verify the French translation matches the official fr_FR entry exactly. If ANY glossary term is translated incorrectly, assign TC-0.5 error code.
@@ -225,73 +271,18 @@ OUTPUT FORMAT (JSON ONLY, NO MARKDOWN):
     "confidence_score": 0-100
 }}
 
-EXAMPLES:
+EXAMPLES OF THE OUTPUT:
 
-Example 1 - Untranslated English word (TE-2):
+Untranslated English word (TE-2):
 Source: "Jump to the latest comments"
 Target: "Accéder rapidement aux derniers comments"
 Output: {{"revised_text": "Accéder rapidement aux derniers commentaires", "error_codes": ["TE-2"], "comment": "Untranslated English word: 'comments' → 'commentaires'", "confidence_score": 100}}
 
-Example 2 - Forbidden word "collaborez" (ST-0.5):
-Source: "When collaborating with your team"
-Target: "lorsque vous collaborez avec votre équipe"
-Output: {{"revised_text": "lorsque vous travaillez en équipe", "error_codes": ["ST-0.5"], "comment": "Forbidden word (per Style Guide): 'collaborez' → use 'travaillez en équipe'", "confidence_score": 100}}
-
-Example 3 - Forbidden word "Veuillez" (ST-0.5):
-Source: "Please try again later"
-Target: "Veuillez réessayer plus tard"
-Output: {{"revised_text": "Réessayez plus tard", "error_codes": ["ST-0.5"], "comment": "Forbidden word (per Style Guide): 'Veuillez' is too formal → use direct imperative 'Réessayez'", "confidence_score": 100}}
-
-Example 4 - Missing space (LQ-0.5):
-Source: "So you can spot what matters"
-Target: "pourque vous puissiez repérer l'essentiel"
-Output: {{"revised_text": "pour que vous puissiez repérer l'essentiel", "error_codes": ["LQ-0.5"], "comment": "Missing space in compound word (per Style Guide): 'pourque' → 'pour que'", "confidence_score": 100}}
-
-Example 5 - Typo (LQ-0.5):
-Source: "Click here to continue"
-Target: "Cliquez ici poru continuer"
-Output: {{"revised_text": "Cliquez ici pour continuer", "error_codes": ["LQ-0.5"], "comment": "Typo: 'poru' → 'pour'", "confidence_score": 100}}
-
-Example 6 - Multiple errors (TE-0.5, TE-0.5, LQ-0.5):
-Source: "Please share feedback and use thumbs up/down on any undesirable output!"
-Target: "Partagez vos commentaires dans #channel et utiliser les pouces levé/baissé poru tout résultat indésirable !"
-Output: {{"revised_text": "Partagez vos commentaires dans #channel et utilisez les pouces levés/baissés pour tout résultat indésirable !", "error_codes": ["TE-0.5", "TE-0.5", "LQ-0.5"], "comment": "Verb conjugation: 'utiliser' → 'utilisez'; Agreement: 'levé/baissé' → 'levés/baissés'; Typo: 'poru' → 'pour'", "confidence_score": 100}}
-
-Example 7 - Forbidden phrase "il vous suffit de" (ST-0.5):
-Source: "Just click the button"
-Target: "Il vous suffit de cliquer sur le bouton"
-Output: {{"revised_text": "Cliquez sur le bouton", "error_codes": ["ST-0.5"], "comment": "Forbidden phrase (per Style Guide): 'Il vous suffit de' feels like judgment → use direct imperative", "confidence_score": 100}}
-
-Example 8 - Untranslated word + glossary (TE-2 + TC-0.5):
-Source: "View comments in your workspace"
-Target: "Voir comments dans votre espace de travail"
-Output: {{"revised_text": "Voir les commentaires dans votre espace de travail", "error_codes": ["TE-2"], "comment": "Untranslated English word: 'comments' → 'commentaires' (per Glossary); missing article 'les'", "confidence_score": 100}}
-
-Example 9 - Critical meaning error (TE-2):
-Source: "The feature is live"
-Target: "La fonctionnalité est en arrivée"
-Output: {{"revised_text": "La fonctionnalité est disponible", "error_codes": ["TE-2"], "comment": "Critical meaning error: 'is live' = already available (NOT 'en arrivée' which means coming soon - opposite meaning!)", "confidence_score": 100}}
-
-Example 10 - Upload/Download confusion (TC-0.5):
-Source: "Upload your file"
-Target: "Téléchargez votre fichier"
-Output: {{"revised_text": "Chargez votre fichier", "error_codes": ["TC-0.5"], "comment": "Common error (per Glossary): 'upload' → 'charger' (NOT 'télécharger' which means 'download')", "confidence_score": 100}}
-
-Example 11 - Emoji punctuation error (LQ-0.5):
-Source: "View members in your workspace 👥"
-Target: "Consultez les membres de votre espace de travail Notion 👥"
-Output: {{"revised_text": "Consultez les membres de votre espace de travail Notion.°👥", "error_codes": ["LQ-0.5"], "comment": "Missing period and non-breaking space before emoji (per Style Guide): must be 'Notion.°👥' (period + ° + emoji)", "confidence_score": 100}}
-
-Example 12 - Tiret cadratin forbidden (LQ-0.5):
-Source: "It's simple — just click here"
-Target: "C'est simple — cliquez simplement ici"
-Output: {{"revised_text": "C'est simple : cliquez simplement ici", "error_codes": ["LQ-0.5"], "comment": "Tiret cadratin (—) forbidden in French UI (per Style Guide) → use colon (:)", "confidence_score": 100}}
-
-Example 13 - No errors:
+No errors:
 Source: "Hello world"
 Target: "Bonjour le monde"
 Output: {{"revised_text": "Bonjour le monde", "error_codes": [], "comment": null, "confidence_score": 100}}
-
+{examples_note}
 REMEMBER - SYSTEMATIC REVIEW (12-POINT CHECKLIST):
 
 **🚨 PASS 1 - CRITICAL ERRORS (1-5):**
@@ -321,6 +312,18 @@ REMEMBER - SYSTEMATIC REVIEW (12-POINT CHECKLIST):
 - Common combos: TE-2 + TC-0.5 (untranslated + glossary), ST-0.5 + LQ-0.5 (forbidden word + spacing)
 """
 
+    def _examples_note(self, source, target):
+        """Past corrections from the learning journal closest to this segment, as prompt examples"""
+        entries = self.knowledge.examples_for(source, target)
+        if not entries:
+            return ""
+        lines = ["", "PAST CORRECTIONS (learning journal decisions closest to this segment; apply them where they fit):"]
+        for entry in entries:
+            code = JOURNAL_CATEGORY_CODES.get(entry['category'])
+            lines.append(f"- {f'[{code}] ' if code else ''}{entry['title']}: {entry['decision']} "
+                         f"(e.g. {' / '.join(entry['examples'].splitlines())})")
+        return "\n".join(lines) + "\n"
+
     def _empty_result(self, text, confidence=0):
         return {
             'revised_text': text,
@@ -330,6 +333,10 @@ REMEMBER - SYSTEMATIC REVIEW (12-POINT CHECKLIST):
             'confidence': confidence
         }
 
+    def _failed_result(self, text, error):
+        """No usable answer: nothing is written for the segment and it is counted as an error"""
+        return dict(self._empty_result(text), error=error)
+
     def _mock_revision(self, source, target):
         """Fallback for when no API key is present (matches old logic for testing)"""
         # Simple rule-based fallback for testing purposes
@@ -350,33 +357,47 @@ REMEMBER - SYSTEMATIC REVIEW (12-POINT CHECKLIST):
             'confidence': 50
         }
 
-def revise_csv_with_ai(csv_path, output_path=None, progress_callback=None):
+def memory_result(match, translation):
+    """
+    Review result taken from a reviewer-approved translation of the same
+    source, or None when the model must still review the segment: the match
+    is fuzzy, or the approved translation differs but carries no error codes
+    to justify the change or does not have this segment's tags
+    """
+    if not match or match['score'] < 1.0 or match['origin'] != 'reviewer':
+        return None
+    if normalize(translation) == normalize(match['target']):
+        return {'revised_text': translation, 'has_revision': False, 'error_codes': [],
+                'comment': None, 'confidence': 100}
+    codes = [code.strip() for code in match['codes'].split(',') if code.strip()]
+    if not codes or tag_problem(translation, match['target']):
+        return None
+    return {
+        'revised_text': match['target'],
+        'has_revision': True,
+        'error_codes': codes,
+        'comment': f"Translation memory: {match['comment']}" if match['comment'] else 'Translation memory',
+        'confidence': 100,
+    }
+
+
+def revise_csv_with_ai(csv_path, output_path=None, progress_callback=None, progress=None, usage=None, start=0):
     """
     Revise a CSV file using AI.
+    Pass a ProgressReporter as `progress` to report into a run owned by the caller
+    (the caller then writes the final snapshot).
+    Segments whose source a reviewer already approved in the translation
+    memory are not sent to the model.
+    Calls are recorded in `usage` (a UsageMeter); when it is over budget the
+    run stops and 'paused_at' is the row to resume from, passed back as `start`.
     """
     if output_path is None:
         output_path = csv_path
     
     print(f"Starting AI revision of {csv_path}...")
     
-    # Setup progress file
-    job_dir = os.path.dirname(csv_path)
-    progress_file = os.path.join(job_dir, 'progress.json')
-    
-    def update_progress(current, total, message="Processing..."):
-        try:
-            with open(progress_file, 'w') as f:
-                json.dump({
-                    'current': current,
-                    'total': total,
-                    'percentage': int((current / total) * 100) if total > 0 else 0,
-                    'message': message,
-                    'status': 'processing'
-                }, f)
-        except Exception as e:
-            print(f"Error writing progress: {e}")
-    
     reviser = LLMReviser()
+    reviser.usage = usage
     
     rows = []
     with open(csv_path, 'r', encoding='utf-8') as f:
@@ -394,20 +415,45 @@ def revise_csv_with_ai(csv_path, output_path=None, progress_callback=None):
         if 'Confidence Score' not in fieldnames:
             fieldnames.append('Confidence Score')
         
+        # Edit ops between the checked translation and the AI revision, so
+        # viewers paint the changes without diffing in the browser
+        if 'AI Diff' not in fieldnames:
+            fieldnames.append('AI Diff')
+        
         for row in reader:
             if 'AI Revision' not in row:
                 row['AI Revision'] = ''
             if 'Confidence Score' not in row:
                 row['Confidence Score'] = ''
+            if 'AI Diff' not in row:
+                row['AI Diff'] = ''
             rows.append(row)
     
     total = len(rows)
     revised_count = 0
+    error_count = 0
+    # How the reviewed rows move the job's stat counts (applied to the catalog by the task)
+    stat_changes = empty_stats()
+    quality_changes = {}
+    rollup_changes = {}
+    
+    # Identical (source, translation) pairs are only sent to the model once
+    results_cache = {}
+    cache_hits = 0
+    memory = TranslationMemory()
+    memory_hits = 0
     
     # Initial progress
-    update_progress(0, total, "Initializing AI...")
+    owns_progress = progress is None
+    if owns_progress:
+        progress = ProgressReporter(os.path.dirname(os.path.abspath(csv_path)))
+    progress.update(0, "Initializing AI...", force=True, total=total)
+    paused_at = None
     
     for i, row in enumerate(rows):
+        # (rows before `start` were reviewed by the run that paused)
+        if i < start:
+            continue
         source = row.get('Source', '')
         target = row.get('Target', '')
         new_target = row.get('New target', '').strip()
@@ -421,26 +467,72 @@ def revise_csv_with_ai(csv_path, output_path=None, progress_callback=None):
         if not translation_to_check.strip():
             continue
         
+        if usage is not None and usage.over_budget():
+            paused_at = i
+            print(f"Budget of ${usage.budget:.2f} reached, pausing at row {i + 1}/{total}")
+            break
+        
         # Update progress
-        update_progress(i + 1, total, f"Reviewing {translation_type} for segment {segment_id}...")
+        progress.update(i + 1, f"Reviewing {translation_type} for segment {segment_id}...",
+                        unique=len(results_cache), cache_hits=cache_hits, memory_hits=memory_hits,
+                        errors=error_count, usage=usage.snapshot() if usage is not None else None)
         print(f"Progress: {i+1}/{total} ({(i+1)/total*100:.1f}%) - Reviewing {translation_type} for segment {segment_id}")
         
         if progress_callback:
             progress_callback(i + 1, total, segment_id)
         
-        # Rate limiting for API - Gemini free tier allows 15 RPM
-        if reviser.model:
-            time.sleep(0.25)  # 4 requests/second = safe margin 
-            
+        add_stats(stat_changes, row_stats(row), -1)
+        add_quality(quality_changes, row, -1)
+        add_rollup(rollup_changes, row, -1)
         try:
-            result = reviser.revise(source, translation_to_check, segment_id)
+            segment_started = time.perf_counter()
+            match = memory.best_match(source)
+            cache_key = (source, translation_to_check)
+            result = results_cache.get(cache_key)
+            cached = result is not None
+            if cached:
+                cache_hits += 1
+                if usage is not None:
+                    usage.record_saved('cache', reviser.model_name)
+            else:
+                result = memory_result(match, translation_to_check)
+                cached = result is not None
+                if cached:
+                    memory_hits += 1
+                    if usage is not None:
+                        usage.record_saved('memory', reviser.model_name)
+            if not cached:
+                # Rate limiting for API - Gemini free tier allows 15 RPM
+                if reviser.model:
+                    time.sleep(0.25)  # 4 requests/second = safe margin 
+                result = reviser.revise(source, translation_to_check, segment_id, reference=match)
+                # (failed calls come back with an error and are asked again next time)
+                if not result.get('error'):
+                    results_cache[cache_key] = result
+            observe_segment(reviser.model_name, time.perf_counter() - segment_started, cached)
+            
+            # A revision that loses or reorders the segment's tags would break the export: rejected
+            tags = not result.get('error') and result.get('error_codes') and tag_problem(
+                translation_to_check, result['revised_text'])
+            if tags:
+                result = reviser._failed_result(translation_to_check, f"Tag check: revision rejected ({tags[1]})")
             
+            if result.get('error'):
+                # No usable answer - nothing is written, the rule-based Code/Comment stay
+                print(f"Error processing segment {segment_id}: {result['error']}")
+                error_count += 1
+                row['AI Revision'] = ""
+                row['AI Diff'] = ""
+                row['Confidence Score'] = "0"
             # Only mark as revised if there are actual error codes
-            if result.get('error_codes') and len(result['error_codes']) > 0:
+            elif result.get('error_codes') and len(result['error_codes']) > 0:
                 row['AI Revision'] = result['revised_text']
+                row['AI Diff'] = encode_ops(diff_ops(translation_to_check, result['revised_text']))
                 
-                # Write to existing Code and Comment columns
-                row['Code'] = ", ".join(result['error_codes'])
+                # Write to existing Code and Comment columns (tag issues of the target stay,
+                # the model cannot fix them)
+                kept = [code for code in TAG_CODES if code in (row.get('Code') or '').split(', ')]
+                row['Code'] = ", ".join(result['error_codes'] + kept)
                 
                 # Add note about which version was checked
                 comment = result.get('comment', '')
@@ -455,40 +547,53 @@ def revise_csv_with_ai(csv_path, output_path=None, progress_callback=None):
             else:
                 # No errors found - leave AI Revision empty but don't touch Code/Comment
                 row['AI Revision'] = ""
+                row['AI Diff'] = ""
                 row['Confidence Score'] = "100"
                 
         except Exception as e:
             print(f"Error processing segment {segment_id}: {e}")
+            error_count += 1
             row['AI Revision'] = ""
+            row['AI Diff'] = ""
             row['Comment'] = f"[AI Error] {str(e)}"
             row['Confidence Score'] = "0"
+        add_stats(stat_changes, row_stats(row))
+        add_quality(quality_changes, row)
+        add_rollup(rollup_changes, row)
     
-    # Write output
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+    # Write output (through a temp file, so a run stopped by its task limits leaves the CSV whole)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), prefix='.revision_table-',
+                                    suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
+    os.replace(tmp_path, output_path)
+    
+    memory.close()
     
     # Final progress
-    update_progress(total, total, "Completed!")
-    try:
-        with open(progress_file, 'w') as f:
-            json.dump({
-                'current': total,
-                'total': total,
-                'percentage': 100,
-                'message': "Revision Complete!",
-                'status': 'completed'
-            }, f)
-    except:
-        pass
+    progress.state.update(unique=len(results_cache), cache_hits=cache_hits, memory_hits=memory_hits,
+                          errors=error_count, usage=usage.snapshot() if usage is not None else None)
+    if owns_progress and paused_at is not None:
+        progress.finish('paused', "Paused: budget reached", stats={'total': total, 'revised': revised_count})
+    elif owns_progress:
+        progress.finish('completed', "Revision Complete!", stats={'total': total, 'revised': revised_count})
     
     print(f"\n✓ AI revision complete!")
     print(f"  Total segments: {total}")
     print(f"  Revised: {revised_count}")
+    print(f"  From translation memory: {memory_hits}")
+    if usage is not None:
+        spent = usage.snapshot()
+        print(f"  Tokens: {spent['tokens']} (${spent['cost']:.4f}, job total ${spent['job_cost']:.4f})")
+    if paused_at is not None:
+        print(f"  Paused at row {paused_at + 1}: budget reached")
     print(f"  Output: {output_path}")
     
-    return {'total': total, 'revised': revised_count}
+    return {'total': total, 'revised': revised_count, 'paused_at': paused_at,
+            'usage': usage.snapshot() if usage is not None else None, 'stat_changes': stat_changes,
+            'quality_changes': quality_changes, 'rollup_changes': rollup_changes}
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Attribution rules
+Who translated or reviewed a segment when the XLF does not say: rules kept in
+the catalog assign a person to a Matecat segment id range, or to every unit
+whose metadata (or segment attributes) mention a text. Rules are applied when
+a job is processed; reprocess a job to apply rules added since.
+"""
+import time
+
+from catalog import transaction
+
+ROLES = ('translator', 'reviewer')
+KINDS = ('range', 'meta')
+MAX_TEXT_LENGTH = 200
+
+
+def load_rules():
+    """All rules, oldest first"""
+    with transaction() as conn:
+        return [dict(row) for row in conn.execute('SELECT * FROM attribution_rules ORDER BY id')]
+
+
+def validate_rule(rule):
+    """Error message for a malformed rule, or None"""
+    if not isinstance(rule, dict):
+        return 'Expected a rule object'
+    if rule.get('role') not in ROLES:
+        return f"role must be one of {', '.join(ROLES)}"
+    if rule.get('kind') not in KINDS:
+        return f"kind must be one of {', '.join(KINDS)}"
+    person = rule.get('person')
+    if not isinstance(person, str) or not person.strip() or len(person) > MAX_TEXT_LENGTH:
+        return 'Invalid person'
+    if rule['kind'] == 'range':
+        min_id, max_id = rule.get('min_id'), rule.get('max_id')
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in (min_id, max_id)):
+            return 'A range rule needs integer min_id and max_id'
+        if min_id > max_id:
+            return 'min_id is greater than max_id'
+    else:
+        pattern = rule.get('pattern')
+        if not isinstance(pattern, str) or not pattern.strip() or len(pattern) > MAX_TEXT_LENGTH:
+            return 'A meta rule needs a pattern'
+    return None
+
+
+def add_rule(rule):
+    """Store a validated rule and return it with its id"""
+    kind = rule['kind']
+    values = (rule['role'], kind, rule['person'].strip(),
+              rule['min_id'] if kind == 'range' else None,
+              rule['max_id'] if kind == 'range' else None,
+              rule['pattern'].strip() if kind == 'meta' else None,
+              time.time())
+    with transaction() as conn:
+        rule_id = conn.execute(
+            'INSERT INTO attribution_rules (role, kind, person, min_id, max_id, pattern, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', values
+        ).lastrowid
+        return dict(conn.execute('SELECT * FROM attribution_rules WHERE id = ?', (rule_id,)).fetchone())
+
+
+def delete_rule(rule_id):
+    """Whether the rule existed"""
+    with transaction() as conn:
+        return conn.execute('DELETE FROM attribution_rules WHERE id = ?', (rule_id,)).rowcount > 0
+
+
+def attribute(rules, segment_id, meta_texts):
+    """
+    {role: person} of the first rule of each role matching a segment: its
+    Matecat id is in the rule's range, or a metadata text contains the pattern
+    """
+    try:
+        numeric_id = int(segment_id)
+    except (TypeError, ValueError):
+        numeric_id = None
+    meta = '\n'.join(meta_texts).casefold()
+    people = {}
+    for rule in rules:
+        if rule['role'] in people:
+            continue
+        if rule['kind'] == 'range':
+            matched = numeric_id is not None and rule['min_id'] <= numeric_id <= rule['max_id']
+        else:
+            matched = rule['pattern'].casefold() in meta
+        if matched:
+            people[rule['role']] = rule['person']
+    return people
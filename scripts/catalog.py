@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Job catalog
+SQLite index of jobs shared by every server worker and background task
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR = os.path.join(PROJECT_ROOT, 'jobs')
+CATALOG_PATH = os.path.join(JOBS_DIR, 'catalog.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    sha256 TEXT,
+    size INTEGER,
+    created TEXT,
+    opened_at REAL,
+    -- Stat card counts (see job_stats.py), NULL until the job is processed
+    stat_total INTEGER,
+    stat_with_revisions INTEGER,
+    stat_ai_revised INTEGER,
+    stat_with_codes INTEGER,
+    stat_major_errors INTEGER,
+    -- LLM spend limit in USD (NULL: COOLERCAT_JOB_BUDGET), and the row a revision
+    -- paused by it resumes from (see llm_usage.py)
+    budget REAL,
+    resume_from INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_sha256 ON jobs (sha256);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cost INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    pid INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, enqueued_at);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id, status);
+
+CREATE TABLE IF NOT EXISTS edits (
+    job_id TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    text TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, segment)
+);
+
+-- The start page's job list, built once and kept until a job is added, removed
+-- or rewritten. generation goes up on every change, so a build that raced with
+-- one is not saved.
+CREATE TABLE IF NOT EXISTS dashboard (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL,
+    jobs TEXT,
+    job_dirs TEXT
+);
+
+-- Word and penalty point totals per job, and per file and translator within it
+-- (see quality_score.py)
+CREATE TABLE IF NOT EXISTS quality (
+    job_id TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    words REAL NOT NULL,
+    points REAL NOT NULL,
+    PRIMARY KEY (job_id, dimension, key)
+);
+
+-- Who translated or reviewed segments the XLF does not attribute (see attribution.py)
+CREATE TABLE IF NOT EXISTS attribution_rules (
+    id INTEGER PRIMARY KEY,
+    role TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    person TEXT NOT NULL,
+    min_id INTEGER,
+    max_id INTEGER,
+    pattern TEXT,
+    created_at REAL NOT NULL
+);
+
+-- Per-job totals of each translator and reviewer, by the week the job was
+-- created (see rollups.py)
+CREATE TABLE IF NOT EXISTS rollups (
+    job_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    role TEXT NOT NULL,
+    person TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (job_id, role, person, metric)
+);
+CREATE INDEX IF NOT EXISTS rollups_role_week ON rollups (role, week);
+
+-- Tokens and estimated spend of the LLM calls of each job, by stage and model;
+-- 'cache' and 'memory' rows count the calls saved (see llm_usage.py)
+CREATE TABLE IF NOT EXISTS llm_usage (
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    model TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    knowledge_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    saved_calls INTEGER NOT NULL DEFAULT 0,
+    saved_cost REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, stage, model)
+);
+"""
+
+# Columns added to existing tables after they were first created:
+# (table, column, definition), added to catalogs that predate them
+MIGRATIONS = [
+    ('jobs', 'opened_at', 'REAL'),
+    ('jobs', 'stat_total', 'INTEGER'),
+    ('jobs', 'stat_with_revisions', 'INTEGER'),
+    ('jobs', 'stat_ai_revised', 'INTEGER'),
+    ('jobs', 'stat_with_codes', 'INTEGER'),
+    ('jobs', 'stat_major_errors', 'INTEGER'),
+    ('jobs', 'budget', 'REAL'),
+    ('jobs', 'resume_from', 'INTEGER'),
+]
+
+_schema_ready = False
+
+
+def _migrate(conn):
+    for table, column, definition in MIGRATIONS:
+        columns = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+        if column in columns:
+            continue
+        try:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        except sqlite3.OperationalError as e:
+            # Another worker added it first
+            if 'duplicate column' not in str(e):
+                raise
+
+
+def connect():
+    """Open a connection to the catalog (creating the schema on first use)"""
+    global _schema_ready
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    conn = sqlite3.connect(CATALOG_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if not _schema_ready:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        _schema_ready = True
+    return conn
+
+
+@contextmanager
+def transaction():
+    """Connection that commits on success, rolls back on error and is always closed"""
+    conn = connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _invalidate_dashboard(conn):
+    conn.execute(
+        'INSERT INTO dashboard (id, generation) VALUES (1, 1) '
+        'ON CONFLICT (id) DO UPDATE SET generation = generation + 1, jobs = NULL, job_dirs = NULL'
+    )
+
+
+def register_job(job_id, name, sha256, size, created):
+    with transaction() as conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO jobs (id, name, sha256, size, created) VALUES (?, ?, ?, ?, ?)',
+            (job_id, name, sha256, size, created)
+        )
+        _invalidate_dashboard(conn)
+
+
+def find_job_by_hash(sha256):
+    """Return the catalog row of a job whose upload has this SHA-256, or None"""
+    with transaction() as conn:
+        return conn.execute('SELECT * FROM jobs WHERE sha256 = ? LIMIT 1', (sha256,)).fetchone()
+
+
+def known_job_ids():
+    with transaction() as conn:
+        return {row['id'] for row in conn.execute('SELECT id FROM jobs')}
+
+
+def remove_job(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+        _invalidate_dashboard(conn)
+
+
+def mark_job_opened(job_id):
+    with transaction() as conn:
+        conn.execute('UPDATE jobs SET opened_at = ? WHERE id = ?', (time.time(), job_id))
+
+
+def last_opened_job():
+    """Catalog row of the job opened most recently, or None"""
+    with transaction() as conn:
+        return conn.execute(
+            'SELECT * FROM jobs WHERE opened_at IS NOT NULL ORDER BY opened_at DESC LIMIT 1'
+        ).fetchone()
+
+
+def invalidate_dashboard():
+    """Drop the stored job list (a job's revision table was rewritten)"""
+    with transaction() as conn:
+        _invalidate_dashboard(conn)
+
+
+def load_dashboard():
+    """(generation, jobs, job directory names) of the stored job list; jobs is None when it must be built"""
+    with transaction() as conn:
+        row = conn.execute('SELECT * FROM dashboard WHERE id = 1').fetchone()
+    if row is None:
+        return 0, None, None
+    if row['jobs'] is None:
+        return row['generation'], None, None
+    return row['generation'], json.loads(row['jobs']), json.loads(row['job_dirs'])
+
+
+def save_dashboard(generation, jobs, job_dirs):
+    """Store a job list built at this generation, unless a job changed since"""
+    with transaction() as conn:
+        conn.execute('INSERT OR IGNORE INTO dashboard (id, generation) VALUES (1, 0)')
+        conn.execute(
+            'UPDATE dashboard SET jobs = ?, job_dirs = ? WHERE id = 1 AND generation = ?',
+            (json.dumps(jobs), json.dumps(sorted(job_dirs)), generation)
+        )
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cross-segment consistency
+Job-level check the per-segment rules and the LLM cannot make: the same source
+translated in different ways, or one translation used for different sources.
+One pass builds hash indexes (normalized source -> distinct translations, and
+translation -> sources), a second flags the outliers, so it runs in linear time.
+"""
+import re
+import time
+from itertools import islice
+
+from metrics import observe_stage
+
+CONSISTENCY_CODE = 'TC-0.5'
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+# Other segment ids listed in a comment
+MAX_LISTED_IDS = 3
+
+
+def normalize(text):
+    """Key under which two texts count as the same (case and spacing ignored)"""
+    return WHITESPACE_PATTERN.sub(' ', text or '').strip().casefold()
+
+
+def final_target(translation):
+    """The translation as it will be delivered: the rule revision if there is one"""
+    return translation['new_target'] or translation['target']
+
+
+def add_finding(translation, code, comment):
+    codes = [c.strip() for c in translation['code'].split(',') if c.strip()]
+    if code and code not in codes:
+        codes.append(code)
+    translation['code'] = ', '.join(codes)
+    translation['comment'] = ' | '.join(filter(None, [translation['comment'], comment]))
+
+
+def listed_ids(translations, indexes, count):
+    """The ids of the first segments out of `count`, e.g. '12, 15, 18 (+4 more)'"""
+    ids = [translations[i]['matecat_id'] for i in indexes[:MAX_LISTED_IDS]]
+    more = count - len(ids)
+    return ', '.join(ids) + (f' (+{more} more)' if more > 0 else '')
+
+
+def flag_inconsistencies(translations):
+    """
+    Attach findings to the translation dicts of a job (as built by
+    parse_xlf_file) and return how many were flagged:
+    - a source translated several ways gets CONSISTENCY_CODE on every segment
+      not using the majority translation, with that translation in the comment
+    - a translation shared by different sources gets a comment naming them
+    """
+    started = time.perf_counter()
+
+    # source key -> {target key: [segment indexes]}, in order of first appearance
+    by_source = {}
+    # target key -> {source key: [segment indexes]}
+    by_target = {}
+    for i, translation in enumerate(translations):
+        source_key = normalize(translation['source'])
+        target_key = normalize(final_target(translation))
+        if not target_key or not LETTER_PATTERN.search(source_key):
+            continue
+        by_source.setdefault(source_key, {}).setdefault(target_key, []).append(i)
+        by_target.setdefault(target_key, {}).setdefault(source_key, []).append(i)
+
+    flagged = set()
+    for variants in by_source.values():
+        if len(variants) < 2:
+            continue
+        # Most used translation wins; ties go to the one that appears first
+        majority_key = max(variants, key=lambda key: len(variants[key]))
+        majority = variants[majority_key]
+        comment = (f'Terminology Minor: Inconsistent translation - the same source is translated '
+                   f'"{final_target(translations[majority[0]])}" in {len(majority)} other segment(s) '
+                   f'({listed_ids(translations, majority, len(majority))})')
+        for target_key, indexes in variants.items():
+            if target_key == majority_key:
+                continue
+            for i in indexes:
+                add_finding(translations[i], CONSISTENCY_CODE, comment)
+                flagged.add(i)
+
+    for sources in by_target.values():
+        if len(sources) < 2:
+            continue
+        total = sum(len(indexes) for indexes in sources.values())
+        # Enough groups to list the first ids of the other sources whichever is left out
+        leading = list(islice(sources.items(), MAX_LISTED_IDS + 1))
+        for source_key, indexes in sources.items():
+            others = [i for key, other in leading if key != source_key for i in other[:MAX_LISTED_IDS]]
+            comment = (f'Consistency: the same translation is used for a different source in '
+                       f'segment(s) {listed_ids(translations, others, total - len(indexes))}')
+            for i in indexes:
+                add_finding(translations[i], None, comment)
+                flagged.add(i)
+
+    observe_stage('consistency', time.perf_counter() - started)
+    return len(flagged)
@@ -5,7 +5,18 @@ Columns: ID Matecat, Source, Target, New target, Code, Comment
 """
 import xml.etree.ElementTree as ET
 import csv
+import os
 import re
+import tempfile
+import time
+
+from attribution import attribute, load_rules
+from consistency import flag_inconsistencies
+from job_stats import add_stats, empty_stats, row_stats
+from quality_score import add_row as add_quality
+from metrics import observe_stage
+from rollups import add_row as add_rollup
+from tag_integrity import check_segment
 
 # XLIFF namespace
 NS = {
@@ -270,16 +281,22 @@ def revise_translation(source, target):
 def parse_xlf_file(xlf_path):
     """Parse XLF file and extract translations with Matecat IDs"""
     translations = []
+    started = time.perf_counter()
+    rules_seconds = 0.0
+    attribution_rules = load_rules()
     
     print(f"Parsing {xlf_path}...")
     
     tree = ET.parse(xlf_path)
     root = tree.getroot()
     
-    units = root.findall('.//xliff:unit', NS)
+    # Units with the name of the file they belong to
+    units = [(file_elem.get('original') or file_elem.get('id', ''), unit)
+             for file_elem in root.findall('xliff:file', NS)
+             for unit in file_elem.findall('.//xliff:unit', NS)]
     print(f"Found {len(units)} units")
     
-    for unit in units:
+    for file_name, unit in units:
         unit_id = unit.get('id', '')
         matecat_segment_id = unit.get('{https://www.matecat.com}segment-id', '')
         
@@ -311,43 +328,50 @@ def parse_xlf_file(xlf_path):
             # Try to extract translator/reviewer info from metadata
             translator = ''
             reviewer = ''
+            words = ''
+            # Texts attribution rules look for
+            meta_texts = []
             metadata = unit.find('.//mda:metadata', NS)
             if metadata is not None:
                 # Look for translator/reviewer in various metadata fields
                 for meta in metadata.findall('.//mda:meta', NS):
                     meta_type = meta.get('type', '').lower()
                     meta_text = meta.text or ''
+                    meta_texts.append(meta_text)
+                    # Matecat's raw word count of the unit (scores are per word)
+                    if meta_type == 'x-matecat-raw' and len(segments) == 1:
+                        words = meta_text.strip()
                     if 'translator' in meta_type or 'agent' in meta_type:
                         translator = meta_text
                     elif 'reviewer' in meta_type:
                         reviewer = meta_text
-                    # Also check if name appears in any metadata
-                    if 'audrey' in meta_text.lower() or 'bernard' in meta_text.lower():
-                        if not translator:
-                            translator = meta_text
             
             # Check segment attributes for translator info
             for attr_name, attr_value in segment.attrib.items():
+                meta_texts.append(attr_value)
                 if 'translator' in attr_name.lower() or 'agent' in attr_name.lower():
                     translator = attr_value
                 elif 'reviewer' in attr_name.lower():
                     reviewer = attr_value
             
             # Revise translation
+            rules_started = time.perf_counter()
             revised_target, error_code, comment = revise_translation(source_text, target_text)
+            # Tags must survive: a revision changing them is dropped, a target missing some is flagged
+            revision, tag_code, tag_comment = check_segment(
+                source_text, target_text, revised_target if revised_target != target_text else '')
+            revised_target = revision or target_text
+            if tag_code:
+                error_code = ', '.join(filter(None, [error_code, tag_code]))
+            comment = ' | '.join(filter(None, [comment, tag_comment])) or None
+            rules_seconds += time.perf_counter() - rules_started
             
             # Only include if there's a revision or if it has a target
             if revised_target != target_text or target_text:
-                # Check if segment ID is in a specific range (for filtering by translator)
-                is_in_range = False
-                if matecat_segment_id:
-                    try:
-                        seg_id_int = int(matecat_segment_id)
-                        # Range for Audrey Bernard: 4778127503 to 4778127875
-                        if 4778127503 <= seg_id_int <= 4778127875:
-                            is_in_range = True
-                    except ValueError:
-                        pass
+                # Configured rules attribute segments the XLF leaves unattributed
+                people = attribute(attribution_rules, matecat_segment_id, meta_texts)
+                translator = translator or people.get('translator', '')
+                reviewer = reviewer or people.get('reviewer', '')
                 
                 translations.append({
                     'matecat_id': matecat_segment_id or f"{unit_id}-{segment_id}",
@@ -359,16 +383,30 @@ def parse_xlf_file(xlf_path):
                     'comment': comment or '',
                     'translator': translator,
                     'reviewer': reviewer,
-                    'is_audrey_range': 'Yes' if is_in_range else 'No'
+                    'file': file_name,
+                    'words': words
                 })
     
+    observe_stage('rules', rules_seconds)
+    observe_stage('parse', time.perf_counter() - started - rules_seconds)
+    
+    # Checks across segments, once every segment of the job is known
+    flagged = flag_inconsistencies(translations)
+    print(f"Consistency check: {flagged} segments flagged")
     return translations
 
 def write_revision_table(translations, csv_path):
-    """Write revision table with Quality Framework columns"""
+    """
+    Write revision table with Quality Framework columns; returns its stat counts,
+    quality totals and translator/reviewer rollups
+    """
     print(f"Writing {len(translations)} translations to {csv_path}...")
     
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+    # Written next to the CSV and moved into place, so a task stopped by its
+    # time or memory limit leaves the previous table whole (see tasks.py)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(csv_path)), prefix='.revision_table-',
+                                    suffix='.tmp')
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=[
             'ID Matecat',
             'State',
@@ -380,12 +418,16 @@ def write_revision_table(translations, csv_path):
             'Comment',
             'Translator',
             'Reviewer',
-            'Audrey Range'
+            'File',
+            'Words'
         ])
         writer.writeheader()
         
+        stats = empty_stats()
+        quality = {}
+        rollups = {}
         for trans in translations:
-            writer.writerow({
+            row = {
                 'ID Matecat': trans['matecat_id'],
                 'State': trans.get('state', ''),
                 'Source': trans['source'],
@@ -396,18 +438,23 @@ def write_revision_table(translations, csv_path):
                 'Comment': trans['comment'],
                 'Translator': trans.get('translator', ''),
                 'Reviewer': trans.get('reviewer', ''),
-                'Audrey Range': trans.get('is_audrey_range', 'No')
-            })
+                'File': trans.get('file', ''),
+                'Words': trans.get('words', '')
+            }
+            writer.writerow(row)
+            add_stats(stats, row_stats(row))
+            add_quality(quality, row)
+            add_rollup(rollups, row)
+    os.replace(tmp_path, csv_path)
     
     print(f"Revision table created: {csv_path}")
     
     # Summary
-    with_revisions = sum(1 for t in translations if t['new_target'])
-    with_codes = sum(1 for t in translations if t['code'])
     print(f"\nSummary:")
-    print(f"Total translations: {len(translations)}")
-    print(f"With revisions: {with_revisions}")
-    print(f"With error codes: {with_codes}")
+    print(f"Total translations: {stats['total']}")
+    print(f"With revisions: {stats['with_revisions']}")
+    print(f"With error codes: {stats['with_codes']}")
+    return stats, quality, rollups
 
 if __name__ == '__main__':
     import sys
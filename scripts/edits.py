@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Reviewer edits
+Edited revisions of a job's segments, stored in the catalog so every reviewer
+and browser sees the same text. Each segment carries a version: a change is
+only applied on top of the version the client last saw, so concurrent edits
+of one segment are reported as conflicts instead of silently overwritten.
+"""
+import time
+
+from catalog import transaction
+
+# Segment keys are the table's revision ids ("<Matecat id>-ai" / "<Matecat id>-xlf")
+MAX_SEGMENT_LENGTH = 100
+MAX_TEXT_LENGTH = 100_000
+MAX_BATCH = 500
+
+
+def job_edits(job_id):
+    """All edits of a job as {segment: {'text', 'version'}}"""
+    with transaction() as conn:
+        return {
+            row['segment']: {'text': row['text'], 'version': row['version']}
+            for row in conn.execute('SELECT segment, text, version FROM edits WHERE job_id = ?', (job_id,))
+        }
+
+
+def validate_changes(changes):
+    """Error message for a malformed PATCH batch, or None"""
+    if not isinstance(changes, list) or not changes:
+        return 'Expected a non-empty list of edits'
+    if len(changes) > MAX_BATCH:
+        return f'At most {MAX_BATCH} edits per request'
+    for change in changes:
+        if not isinstance(change, dict):
+            return 'Each edit must be an object'
+        segment, text, version = change.get('segment'), change.get('text'), change.get('version')
+        if not isinstance(segment, str) or not segment or len(segment) > MAX_SEGMENT_LENGTH:
+            return 'Invalid segment'
+        if not isinstance(text, str) or len(text) > MAX_TEXT_LENGTH:
+            return f'Invalid text for segment {segment}'
+        if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+            return f'Invalid version for segment {segment}'
+    return None
+
+
+def apply_edits(job_id, changes):
+    """
+    Apply a batch of {'segment', 'text', 'version'} changes, where version is
+    the one the client edited (0 for a segment without edits).
+    Returns (applied, conflicts): the new versions, and the current text and
+    version of the segments that were changed by someone else meanwhile.
+    """
+    applied = []
+    conflicts = []
+    now = time.time()
+    with transaction() as conn:
+        for change in changes:
+            segment, text, version = change['segment'], change['text'], change['version']
+            if version == 0:
+                updated = conn.execute(
+                    'INSERT OR IGNORE INTO edits (job_id, segment, text, version, updated_at) VALUES (?, ?, ?, 1, ?)',
+                    (job_id, segment, text, now)
+                ).rowcount
+            else:
+                updated = conn.execute(
+                    'UPDATE edits SET text = ?, version = version + 1, updated_at = ? '
+                    'WHERE job_id = ? AND segment = ? AND version = ?',
+                    (text, now, job_id, segment, version)
+                ).rowcount
+            if updated:
+                applied.append({'segment': segment, 'version': version + 1})
+                continue
+            current = conn.execute(
+                'SELECT text, version FROM edits WHERE job_id = ? AND segment = ?', (job_id, segment)
+            ).fetchone()
+            conflicts.append({
+                'segment': segment,
+                'text': current['text'] if current else None,
+                'version': current['version'] if current else 0,
+            })
+    return applied, conflicts
+
+
+def forget_job_edits(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM edits WHERE job_id = ?', (job_id,))
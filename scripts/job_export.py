@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Job export
+Streams a job's rows (with reviewer edits merged in) as CSV, XLSX or JSONL.
+Rows are read from the revision CSV one at a time and written out in chunks,
+so memory stays flat whatever the size of the job.
+"""
+import csv
+import html
+import io
+import json
+import re
+import zipfile
+
+from edits import job_edits
+
+EXPORT_COLUMNS = ['ID Matecat', 'State', 'Source', 'Target', 'XLF Revision', 'AI Revision', 'Error Code', 'Comment']
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+STAT_FILTERS = ('ai-revisions', 'xlf-revisions', 'error-codes', 'major-errors')
+
+# Output is handed to the response in chunks of about this size
+CHUNK_SIZE = 64 * 1024
+
+TAG_PATTERN = re.compile(r'<[^>]*>')
+ID_PATTERN = re.compile(r'\d+')
+# Characters XML 1.0 does not allow (XLSX cells are XML)
+XML_INVALID_PATTERN = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class RowFilter:
+    """
+    The table's filters (see assets/js/search_worker.js): search text, error
+    code, state, Matecat id range and the stat card filters
+    """
+
+    def __init__(self, search='', code='', state='', min_id=None, max_id=None, stat=''):
+        self.search = search.lower()
+        self.code = code
+        self.state = state.lower()
+        self.min_id = min_id
+        self.max_id = max_id
+        self.stat = stat if stat in STAT_FILTERS else ''
+
+    @classmethod
+    def from_args(cls, args):
+        """Filter from query string arguments; raises ValueError on a bad id bound"""
+        def bound(name):
+            value = args.get(name, '').strip()
+            return int(value) if value else None
+
+        return cls(search=args.get('search', ''), code=args.get('code', ''), state=args.get('state', ''),
+                   min_id=bound('min_id'), max_id=bound('max_id'), stat=args.get('stat', ''))
+
+    def matches(self, row):
+        code = row.get('Code', '')
+        if self.code and self.code not in code:
+            return False
+        if self.state and row.get('State', '').lower() != self.state:
+            return False
+        if self.min_id is not None or self.max_id is not None:
+            match = ID_PATTERN.search(row.get('ID Matecat', ''))
+            if not match:
+                return False
+            matecat_id = int(match.group())
+            if self.min_id is not None and matecat_id < self.min_id:
+                return False
+            if self.max_id is not None and matecat_id > self.max_id:
+                return False
+        if self.stat == 'ai-revisions' and not row.get('AI Revision'):
+            return False
+        if self.stat == 'xlf-revisions' and not row.get('New target'):
+            return False
+        if self.stat == 'error-codes' and not code.strip():
+            return False
+        if self.stat == 'major-errors' and 'TE-2' not in code:
+            return False
+        if self.search:
+            text = '\n'.join(row.get(column, '') for column in ('Source', 'Target', 'New target', 'AI Revision'))
+            if self.search not in text.lower():
+                return False
+        return True
+
+
+def plain_text(text):
+    """Cell text without inline tags or HTML entities (as the table export always did)"""
+    return html.unescape(TAG_PATTERN.sub('', text or ''))
+
+
+def export_records(csv_path, job_id, row_filter):
+    """Matching rows as lists of EXPORT_COLUMNS values, edited revisions first"""
+    edits = job_edits(job_id)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if not row_filter.matches(row):
+                continue
+            matecat_id = row.get('ID Matecat', '')
+            xlf_revision = row.get('New target', '')
+            ai_revision = row.get('AI Revision', '')
+            if xlf_revision and f'{matecat_id}-xlf' in edits:
+                xlf_revision = edits[f'{matecat_id}-xlf']['text']
+            if ai_revision and f'{matecat_id}-ai' in edits:
+                ai_revision = edits[f'{matecat_id}-ai']['text']
+            code = ', '.join(c.strip() for c in row.get('Code', '').split(',') if c.strip())
+            yield [matecat_id, row.get('State', '').lower()] + [
+                plain_text(text) for text in (row.get('Source', ''), row.get('Target', ''), xlf_revision,
+                                              ai_revision, code, row.get('Comment', ''))
+            ]
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Write-only stream whose contents are taken out in chunks by the generator"""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def take(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        return data
+
+
+def stream_csv(records):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so spreadsheet apps read the file as UTF-8
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+    for record in records:
+        writer.writerow(record)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def stream_jsonl(records):
+    lines = []
+    size = 0
+    for record in records:
+        line = json.dumps(dict(zip(EXPORT_COLUMNS, record)), ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+            size = 0
+    yield ''.join(lines).encode('utf-8')
+
+
+XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+XLSX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Revisions" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+XLSX_SHEET_START = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>"""
+
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def xlsx_row(values):
+    # Inline strings: no shared string table to hold in memory
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{html.escape(XML_INVALID_PATTERN.sub("", value), quote=False)}</t></is></c>'
+        for value in values
+    )
+    return f'<row>{cells}</row>'
+
+
+def stream_xlsx(records):
+    """Minimal single-sheet workbook, zipped on the fly (the zip needs no seeking)"""
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', XLSX_WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', XLSX_WORKBOOK_RELS)
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((XLSX_SHEET_START + xlsx_row(EXPORT_COLUMNS)).encode('utf-8'))
+            for record in records:
+                sheet.write(xlsx_row(record).encode('utf-8'))
+                if buffer.size >= CHUNK_SIZE:
+                    yield buffer.take()
+            sheet.write(XLSX_SHEET_END.encode('utf-8'))
+    yield buffer.take()
+
+
+STREAMS = {'csv': stream_csv, 'xlsx': stream_xlsx, 'jsonl': stream_jsonl}
+
+
+def stream_export(csv_path, job_id, export_format, row_filter):
+    """Chunks of the export file in the given format"""
+    return STREAMS[export_format](export_records(csv_path, job_id, row_filter))
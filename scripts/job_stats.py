@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Job stats
+Stat card counts of a job (total, revisions, AI revisions, error codes, TE-2
+major errors), counted while the revision table is written and kept in the
+catalog, so listing or opening a job never rescans its rows
+"""
+import csv
+
+from catalog import transaction
+
+STAT_KEYS = ('total', 'with_revisions', 'ai_revised', 'with_codes', 'major_errors')
+
+
+def empty_stats():
+    return dict.fromkeys(STAT_KEYS, 0)
+
+
+def row_stats(row):
+    """What one revision table row (CSV column names) adds to each count"""
+    code = row.get('Code') or ''
+    return {
+        'total': 1,
+        'with_revisions': int(bool((row.get('New target') or '').strip())),
+        'ai_revised': int(bool((row.get('AI Revision') or '').strip())),
+        'with_codes': int(bool(code.strip())),
+        'major_errors': int('TE-2' in code),
+    }
+
+
+def add_stats(stats, changes, sign=1):
+    for key in STAT_KEYS:
+        stats[key] += sign * changes[key]
+    return stats
+
+
+def count_csv_stats(csv_path):
+    """Counts of a revision CSV in one streaming pass (CSVs written before stats were stored)"""
+    stats = empty_stats()
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            add_stats(stats, row_stats(row))
+    return stats
+
+
+def load_job_stats(job_id):
+    """Stored counts of a job, or None when they were never recorded"""
+    with transaction() as conn:
+        row = conn.execute(
+            f'SELECT {", ".join("stat_" + key for key in STAT_KEYS)} FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+    if row is None or row['stat_total'] is None:
+        return None
+    return {key: row['stat_' + key] for key in STAT_KEYS}
+
+
+def save_job_stats(job_id, stats):
+    with transaction() as conn:
+        conn.execute(
+            f'UPDATE jobs SET {", ".join(f"stat_{key} = ?" for key in STAT_KEYS)} WHERE id = ?',
+            [stats[key] for key in STAT_KEYS] + [job_id]
+        )
+
+
+def adjust_job_stats(job_id, changes):
+    """Apply count changes of rewritten rows (no-op for jobs whose counts were never stored)"""
+    with transaction() as conn:
+        conn.execute(
+            f'UPDATE jobs SET {", ".join(f"stat_{key} = stat_{key} + ?" for key in STAT_KEYS)} WHERE id = ?',
+            [changes[key] for key in STAT_KEYS] + [job_id]
+        )
+
+
+def job_stats(job_id, csv_path):
+    """Stored counts of a job, counted from its CSV once if they are missing"""
+    stats = load_job_stats(job_id)
+    if stats is None:
+        stats = count_csv_stats(csv_path)
+        save_job_stats(job_id, stats)
+    return stats
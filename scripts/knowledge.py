@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Compiled knowledge base
+Builds the review knowledge from its sources (knowledge_base.txt for the
+instructions, the glossary, style guide rules and learning journal CSVs in
+docs/resources) into one SQLite artifact: term, rule and journal tables with a
+content hash per record, and a version hashed from every source. The artifact
+is rebuilt whenever a source changes and is read through a memory map, so each
+process loads it without re-parsing the CSVs.
+
+Usage: python3 knowledge.py build
+"""
+import csv
+import glob
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from hashlib import blake2b
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOURCES_DIR = os.path.join(PROJECT_ROOT, 'docs', 'resources')
+KNOWLEDGE_PATH = os.getenv('COOLERCAT_KNOWLEDGE_PATH', os.path.join(PROJECT_ROOT, 'knowledge.db'))
+
+# Source name -> file (glob: the exported CSV names end with a Notion id)
+SOURCES = {
+    'instructions': os.path.join(PROJECT_ROOT, 'knowledge_base.txt'),
+    'glossary': os.path.join(RESOURCES_DIR, 'Notion Glossaire *.csv'),
+    'rules': os.path.join(RESOURCES_DIR, 'Enterprise Style Guide * - General Rules.csv'),
+    'journal': os.path.join(RESOURCES_DIR, 'Notion Journal d*apprentissages *.csv'),
+}
+# Bumped when the artifact layout or the way sources are compiled changes, so older artifacts are rebuilt
+FORMAT = '2'
+MMAP_SIZE = 64 * 1024 * 1024
+
+ACTIVE_STATUS = 'Actif'
+# Past corrections picked as examples for each prompt
+FEW_SHOT_LIMIT = 5
+# Added to the overlap score of a correction whose example phrase occurs as a whole in the source
+PHRASE_BONUS = 5.0
+# Words shorter than this are not indexed (articles, prepositions)
+MIN_TOKEN_LENGTH = 3
+WORD_PATTERN = re.compile(r"\w+(?:['’]\w+)*")
+# "Trusted files → fichiers de confiance (pas « fiables »)": the English side of a journal example
+# (after an optional "EN:" / "hc:" label)
+EXAMPLE_PATTERN = re.compile(r'^\s*(?:[A-Za-z]{2}\s*:\s*)?[«"“]?\s*([^→«»"“”]+?)\s*[»"”]?\s*→')
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE sources (name TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL,
+                      mtime_ns INTEGER NOT NULL, hash TEXT NOT NULL);
+CREATE TABLE terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL, term_key TEXT NOT NULL,
+                    translation TEXT NOT NULL, notes TEXT NOT NULL, hash TEXT NOT NULL);
+CREATE INDEX terms_key ON terms (term_key);
+CREATE TABLE rules (id INTEGER PRIMARY KEY, number TEXT NOT NULL, category TEXT NOT NULL, rule TEXT NOT NULL,
+                    english TEXT NOT NULL, dos TEXT NOT NULL, donts TEXT NOT NULL, hash TEXT NOT NULL);
+CREATE INDEX rules_number ON rules (number);
+CREATE TABLE journal (id INTEGER PRIMARY KEY, title TEXT NOT NULL, category TEXT NOT NULL, date TEXT NOT NULL,
+                      decision TEXT NOT NULL, examples TEXT NOT NULL, notes TEXT NOT NULL,
+                      status TEXT NOT NULL, tags TEXT NOT NULL, hash TEXT NOT NULL);
+-- English phrases of journal examples, to find the decisions that apply to a source
+CREATE TABLE journal_patterns (pattern TEXT NOT NULL, journal_id INTEGER NOT NULL);
+-- Inverted index of the words of journal entries (title, decision, examples), for few-shot selection
+CREATE TABLE journal_tokens (token TEXT NOT NULL, journal_id INTEGER NOT NULL);
+"""
+
+
+def content_hash(data):
+    return blake2b(data, digest_size=8).hexdigest()
+
+
+def record_hash(record):
+    return content_hash(json.dumps(record, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+
+
+def term_key(text):
+    """Words of a term or text as matched against the glossary (case ignored)"""
+    return ' '.join(WORD_PATTERN.findall(text.casefold().replace('’', "'")))
+
+
+def example_tokens(text):
+    """Distinct indexed words of a text"""
+    return {word for word in term_key(text).split() if len(word) >= MIN_TOKEN_LENGTH}
+
+
+def source_paths():
+    """Source name -> path of its current file (None when missing)"""
+    paths = {}
+    for name, pattern in SOURCES.items():
+        matches = sorted(glob.glob(pattern))
+        paths[name] = matches[0] if matches else None
+    return paths
+
+
+def read_csv(path):
+    if not path:
+        return []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [{key: (value or '').strip() for key, value in row.items() if key} for row in csv.DictReader(f)]
+
+
+def example_patterns(examples):
+    patterns = set()
+    for line in re.split(r'[\n;]', examples):
+        match = EXAMPLE_PATTERN.match(line)
+        if match:
+            pattern = term_key(match.group(1))
+            if len(pattern) >= 3:
+                patterns.add(pattern)
+    return patterns
+
+
+def build_knowledge(path=KNOWLEDGE_PATH):
+    """Compile the sources into the artifact at `path` (replaced atomically) and return its version"""
+    paths = source_paths()
+    sources = []
+    for name, source_path in paths.items():
+        if source_path is None:
+            print(f"WARNING: Knowledge source '{name}' not found ({SOURCES[name]})")
+            continue
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        stat = os.stat(source_path)
+        sources.append((name, source_path, stat.st_size, stat.st_mtime_ns, content_hash(data)))
+    version = content_hash(json.dumps([FORMAT] + [(name, digest) for name, _, _, _, digest in sources]).encode())
+
+    instructions = ''
+    if paths['instructions']:
+        with open(paths['instructions'], 'r', encoding='utf-8') as f:
+            instructions = f.read()
+    terms = []
+    for row in read_csv(paths['glossary']):
+        record = {'term': row.get('Name', ''), 'translation': row.get('Terme français', ''),
+                  'notes': row.get('Notes', '')}
+        if record['term'] and record['translation']:
+            terms.append(record)
+    rules = [{'number': row.get('Rule N.', ''), 'category': row.get('Category', ''), 'rule': row.get('Rule', ''),
+              'english': row.get('English source (optional)', ''), 'dos': row.get('Dos', ''),
+              'donts': row.get("Don'ts", '')}
+             for row in read_csv(paths['rules']) if row.get('Rule')]
+    journal = [{'title': row.get('Apprentissage', ''), 'category': row.get('Catégorie', ''),
+                'date': row.get('Date session', ''), 'decision': row.get('Décision', ''),
+                'examples': row.get('Exemples', ''), 'notes': row.get('Notes', ''),
+                'status': row.get('Statut', ''), 'tags': row.get('Tags', '')}
+               for row in read_csv(paths['journal']) if row.get('Décision')]
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.knowledge-', suffix='.db', dir=directory)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)',
+                             [('format', FORMAT), ('version', version), ('instructions', instructions)])
+            conn.executemany('INSERT INTO sources (name, path, size, mtime_ns, hash) VALUES (?, ?, ?, ?, ?)', sources)
+            conn.executemany(
+                'INSERT INTO terms (term, term_key, translation, notes, hash) VALUES (?, ?, ?, ?, ?)',
+                [(t['term'], term_key(t['term']), t['translation'], t['notes'], record_hash(t)) for t in terms])
+            conn.executemany(
+                'INSERT INTO rules (number, category, rule, english, dos, donts, hash) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(r['number'], r['category'], r['rule'], r['english'], r['dos'], r['donts'], record_hash(r))
+                 for r in rules])
+            for entry in journal:
+                journal_id = conn.execute(
+                    'INSERT INTO journal (title, category, date, decision, examples, notes, status, tags, hash) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (entry['title'], entry['category'], entry['date'], entry['decision'], entry['examples'],
+                     entry['notes'], entry['status'], entry['tags'], record_hash(entry))).lastrowid
+                conn.executemany('INSERT INTO journal_patterns (pattern, journal_id) VALUES (?, ?)',
+                                 [(pattern, journal_id) for pattern in sorted(example_patterns(entry['examples']))])
+                tokens = example_tokens(' '.join((entry['title'], entry['decision'], entry['examples'])))
+                conn.executemany('INSERT INTO journal_tokens (token, journal_id) VALUES (?, ?)',
+                                 [(token, journal_id) for token in sorted(tokens)])
+        conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    print(f"Knowledge base {version}: {len(terms)} terms, {len(rules)} rules, {len(journal)} journal entries")
+    return version
+
+
+def open_artifact(path):
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+    return conn
+
+
+def is_stale(path=KNOWLEDGE_PATH):
+    """Whether the artifact is missing, of an older format, or a source file changed since it was built"""
+    if not os.path.exists(path):
+        return True
+    conn = open_artifact(path)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        if row is None or row['value'] != FORMAT:
+            return True
+        built = {row['name']: row for row in conn.execute('SELECT * FROM sources')}
+    except sqlite3.DatabaseError:
+        return True
+    finally:
+        conn.close()
+    for name, source_path in source_paths().items():
+        source = built.get(name)
+        if source_path is None or source is None:
+            if source_path is not None or source is not None:
+                return True
+            continue
+        stat = os.stat(source_path)
+        if (source['path'], source['size'], source['mtime_ns']) != (source_path, stat.st_size, stat.st_mtime_ns):
+            return True
+    return False
+
+
+class Knowledge:
+    """Loaded artifact: instructions, indexed glossary terms, rules and journal decisions"""
+
+    def __init__(self, path=KNOWLEDGE_PATH):
+        conn = open_artifact(path)
+        try:
+            meta = {row['key']: row['value'] for row in conn.execute('SELECT key, value FROM meta')}
+            self.version = meta['version']
+            self.instructions = meta['instructions']
+            self.terms = [dict(row) for row in conn.execute('SELECT * FROM terms ORDER BY id')]
+            self.rules = {row['number']: dict(row) for row in conn.execute('SELECT * FROM rules ORDER BY id')}
+            self.journal = {row['id']: dict(row) for row in conn.execute('SELECT * FROM journal ORDER BY id')}
+            self.journal_patterns = [(row['pattern'], row['journal_id']) for row in conn.execute(
+                'SELECT pattern, journal_id FROM journal_patterns ORDER BY journal_id')]
+            journal_tokens = conn.execute('SELECT token, journal_id FROM journal_tokens').fetchall()
+        finally:
+            conn.close()
+        # Word -> [(active journal id, weight)]: the word's idf, divided by the square root of
+        # the entry's word count so long entries do not win on length alone
+        active = {i for i, entry in self.journal.items() if entry['status'] == ACTIVE_STATUS}
+        postings = {}
+        lengths = {}
+        for row in journal_tokens:
+            if row['journal_id'] in active:
+                postings.setdefault(row['token'], []).append(row['journal_id'])
+                lengths[row['journal_id']] = lengths.get(row['journal_id'], 0) + 1
+        self.example_index = {
+            token: [(i, math.log(1 + len(active) / len(ids)) / math.sqrt(lengths[i])) for i in ids]
+            for token, ids in postings.items()
+        }
+        # First word -> [(all words, term)], longest terms first
+        self.term_index = {}
+        for term in sorted(self.terms, key=lambda t: -len(t['term_key'])):
+            words = tuple(term['term_key'].split())
+            if words:
+                self.term_index.setdefault(words[0], []).append((words, term))
+
+    def terms_in(self, text):
+        """Glossary terms occurring in a (source) text, in order of appearance"""
+        words = term_key(text).split()
+        found = {}
+        for i, word in enumerate(words):
+            for term_words, term in self.term_index.get(word, ()):
+                if tuple(words[i:i + len(term_words)]) == term_words:
+                    found.setdefault(term['id'], term)
+        return list(found.values())
+
+    def journal_for(self, text):
+        """Active learning journal decisions whose examples' English phrase occurs in the text"""
+        key = f' {term_key(text)} '
+        entries = {}
+        for pattern, journal_id in self.journal_patterns:
+            entry = self.journal[journal_id]
+            if entry['status'] == ACTIVE_STATUS and f' {pattern} ' in key:
+                entries.setdefault(journal_id, entry)
+        return list(entries.values())
+
+    def examples_for(self, source, target='', limit=FEW_SHOT_LIMIT):
+        """
+        The `limit` active journal corrections sharing the most (rare) words
+        with a segment, best first; corrections whose example phrase occurs in
+        the source come first
+        """
+        scores = {}
+        for token in example_tokens(f'{source} {target}'):
+            for journal_id, weight in self.example_index.get(token, ()):
+                scores[journal_id] = scores.get(journal_id, 0.0) + weight
+        for entry in self.journal_for(source):
+            scores[entry['id']] = scores.get(entry['id'], 0.0) + PHRASE_BONUS
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [self.journal[journal_id] for journal_id, _ in best]
+
+    def rule(self, number):
+        return self.rules.get(str(number))
+
+    def segment_context(self, source):
+        """Prompt block of the glossary terms that occur in a source ('' if none)"""
+        terms = self.terms_in(source)
+        if not terms:
+            return ''
+        lines = ['GLOSSARY TERMS IN THIS SOURCE (official fr_FR translations):']
+        lines += [f"- {t['term']} → {t['translation']}" + (f" ({t['notes']})" if t['notes'] else '')
+                  for t in terms]
+        return '\n'.join(lines)
+
+
+_loaded = None
+
+
+def load_knowledge(path=KNOWLEDGE_PATH):
+    """The current knowledge, rebuilt first if a source changed (loaded once per process and version)"""
+    global _loaded
+    if is_stale(path):
+        build_knowledge(path)
+    if _loaded is None or _loaded[0] != path or _loaded[1] != os.stat(path).st_mtime_ns:
+        _loaded = (path, os.stat(path).st_mtime_ns, Knowledge(path))
+    return _loaded[2]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("Usage: python3 knowledge.py build")
+        sys.exit(1)
+    build_knowledge()
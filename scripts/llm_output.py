@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+LLM output validation
+Schema of the reviewer's JSON answer (passed to the backend when it supports
+constrained generation), parsing of the raw text, and a strict check of the
+result: known error codes, a non-empty revision that keeps the target's tags
+in their order,
+codes only with an actual change. Problems are worded so they can be sent back
+to the model in a re-ask.
+"""
+import json
+import re
+
+from tag_integrity import tag_problem
+
+ERROR_CODES = ('TE-2', 'TE-0.5', 'TC-0.5', 'LQ-0.5', 'ST-0.5')
+
+# Gemini response_schema (OpenAPI subset)
+RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'revised_text': {'type': 'string'},
+        'error_codes': {'type': 'array', 'items': {'type': 'string', 'enum': list(ERROR_CODES)}},
+        'comment': {'type': 'string', 'nullable': True},
+        'confidence_score': {'type': 'integer'},
+    },
+    'required': ['revised_text', 'error_codes', 'comment', 'confidence_score'],
+}
+
+FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$', re.IGNORECASE)
+CODE_SPACING_PATTERN = re.compile(r'\s+')
+
+
+class InvalidOutput(ValueError):
+    """An answer that cannot be used, with the problems to report back to the model"""
+
+    def __init__(self, problems, text=''):
+        super().__init__('; '.join(problems))
+        self.problems = problems
+        self.text = text
+
+
+def parse_output(text):
+    """The JSON object of a raw answer (code fences and text around the object are tolerated)"""
+    text = FENCE_PATTERN.sub('', (text or '').strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find('{'), text.rfind('}')
+        try:
+            data = json.loads(text[start:end + 1]) if 0 <= start < end else None
+        except json.JSONDecodeError:
+            data = None
+    if not isinstance(data, dict):
+        raise InvalidOutput(['the answer is not a single JSON object'], text)
+    return data
+
+
+def normalize_code(code):
+    """'te-2', ' TE - 2 ' -> 'TE-2' (anything else is returned as given)"""
+    if not isinstance(code, str):
+        return code
+    compact = CODE_SPACING_PATTERN.sub('', code).upper()
+    return compact if compact in ERROR_CODES else code
+
+
+def validate_output(data, translation):
+    """
+    The reviewer's result dict from a parsed answer about `translation`,
+    or InvalidOutput listing every problem found
+    """
+    problems = []
+    revised = data.get('revised_text')
+    codes = data.get('error_codes')
+    comment = data.get('comment')
+    confidence = data.get('confidence_score')
+
+    if not isinstance(revised, str) or not revised.strip():
+        problems.append('"revised_text" must be the non-empty French text')
+        revised = None
+    if codes is None:
+        codes = []
+    if not isinstance(codes, list):
+        problems.append('"error_codes" must be an array')
+        codes = []
+    codes = [normalize_code(code) for code in codes]
+    unknown = [str(code) for code in codes if code not in ERROR_CODES]
+    if unknown:
+        problems.append(f"unknown error code(s) {', '.join(unknown)} (allowed: {', '.join(ERROR_CODES)})")
+    if comment is not None and not isinstance(comment, str):
+        problems.append('"comment" must be a string or null')
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 100:
+        problems.append('"confidence_score" must be a number from 0 to 100')
+
+    if revised is not None:
+        changed = revised.strip() != translation.strip()
+        tags = tag_problem(translation, revised)
+        if tags:
+            problems.append(f'"revised_text" must keep every tag of the translation exactly as it is, '
+                            f'in the same order ({tags[1]})')
+        if codes and not changed:
+            problems.append('error codes were given but "revised_text" is unchanged: '
+                            'correct the text, or return no codes if it is acceptable')
+        if changed and not codes:
+            problems.append('"revised_text" was changed without an error code: '
+                            'give the codes, or return the translation unchanged')
+        if codes and not (comment or '').strip():
+            problems.append('a "comment" explaining the errors is required when there are error codes')
+
+    if problems:
+        raise InvalidOutput(problems)
+    return {
+        'revised_text': revised,
+        'has_revision': bool(codes),
+        'error_codes': codes,
+        'comment': comment or None,
+        'confidence': confidence,
+    }
+
+
+def reask_prompt(problems):
+    """Follow-up message asking the model to correct an invalid answer"""
+    listed = '\n'.join(f'- {problem}' for problem in problems)
+    return (f"Your answer could not be used:\n{listed}\n\n"
+            "Answer again for the same segment with the corrected JSON object only, in the same format.")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+LLM usage accounting
+Prompt and response tokens of every model call, with the share of the prompt
+taken by the knowledge base and the estimated spend, added up per job, stage
+('review' for a segment's first ask, 'reask' for the follow-ups) and model in
+the catalog. Segments answered from the review cache or the translation memory
+are counted as saved calls, valued at the average cost of a review call.
+
+A job whose spend reaches its budget has its AI revision paused; the next
+revision resumes from the row it stopped at.
+"""
+import os
+import sys
+
+from catalog import transaction
+
+# USD per million tokens: (prompt, response). Cached prompt tokens cost CACHED_RATE of the prompt price
+PRICES = {
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-2.0-flash-lite': (0.075, 0.30),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-pro': (1.25, 5.00),
+}
+CACHED_RATE = 0.25
+
+# Prices for models not listed, or overriding the table when set
+PRICE_PROMPT = os.getenv('COOLERCAT_LLM_PRICE_PROMPT')
+PRICE_RESPONSE = os.getenv('COOLERCAT_LLM_PRICE_RESPONSE')
+
+# Spend limit of a job in USD unless it has its own (0: no limit)
+DEFAULT_BUDGET = float(os.getenv('COOLERCAT_JOB_BUDGET', 0))
+
+# Calls between two writes of a running meter to the catalog, so spend survives a run that dies
+FLUSH_EVERY = 20
+
+COUNTERS = ('calls', 'prompt_tokens', 'completion_tokens', 'cached_tokens', 'knowledge_tokens',
+            'cost', 'saved_calls', 'saved_cost')
+
+
+def model_prices(model):
+    prompt, response = PRICES.get(model, (0.0, 0.0))
+    if PRICE_PROMPT is not None:
+        prompt = float(PRICE_PROMPT)
+    if PRICE_RESPONSE is not None:
+        response = float(PRICE_RESPONSE)
+    return prompt, response
+
+
+def call_cost(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """Estimated USD cost of one call"""
+    prompt, response = model_prices(model)
+    billed = prompt_tokens - cached_tokens + cached_tokens * CACHED_RATE
+    return (billed * prompt + completion_tokens * response) / 1_000_000
+
+
+def empty_counters():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def summary(counters):
+    """Report figures of summed counters"""
+    result = {name: int(counters.get(name) or 0) for name in COUNTERS if name not in ('cost', 'saved_cost')}
+    result['tokens'] = result['prompt_tokens'] + result['completion_tokens']
+    result['cost'] = round(counters.get('cost') or 0, 6)
+    result['saved_cost'] = round(counters.get('saved_cost') or 0, 6)
+    return result
+
+
+def job_budget(job_id):
+    """The job's spend limit in USD, None if it has none"""
+    with transaction() as conn:
+        row = conn.execute('SELECT budget FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    budget = row['budget'] if row is not None and row['budget'] is not None else DEFAULT_BUDGET
+    return budget if budget > 0 else None
+
+
+def set_job_budget(job_id, budget):
+    """Set the job's limit (None: back to COOLERCAT_JOB_BUDGET, 0: no limit); False if the job is unknown"""
+    with transaction() as conn:
+        return conn.execute('UPDATE jobs SET budget = ? WHERE id = ?', (budget, job_id)).rowcount > 0
+
+
+def resume_point(job_id):
+    """Row a paused revision of the job resumes from (0 if none was paused)"""
+    with transaction() as conn:
+        row = conn.execute('SELECT resume_from FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return (row['resume_from'] or 0) if row is not None else 0
+
+
+def set_resume_point(job_id, row_index):
+    with transaction() as conn:
+        conn.execute('UPDATE jobs SET resume_from = ? WHERE id = ?', (row_index or None, job_id))
+
+
+def job_usage(job_id):
+    """Totals of a job, overall and per stage and model"""
+    with transaction() as conn:
+        rows = conn.execute('SELECT * FROM llm_usage WHERE job_id = ? ORDER BY model, stage', (job_id,)).fetchall()
+    total = empty_counters()
+    breakdown = []
+    for row in rows:
+        for name in COUNTERS:
+            total[name] += row[name]
+        breakdown.append(dict(summary(dict(row)), stage=row['stage'], model=row['model']))
+    return {'total': summary(total), 'budget': job_budget(job_id), 'resume_from': resume_point(job_id),
+            'breakdown': breakdown}
+
+
+def usage_by_job():
+    """{job_id: {'tokens', 'cost', 'saved_cost'}} of every job with usage, for job lists"""
+    with transaction() as conn:
+        rows = conn.execute(
+            'SELECT job_id, SUM(prompt_tokens + completion_tokens) AS tokens, SUM(cost) AS cost, '
+            'SUM(saved_cost) AS saved_cost FROM llm_usage GROUP BY job_id'
+        ).fetchall()
+    return {row['job_id']: {'tokens': row['tokens'], 'cost': round(row['cost'], 6),
+                            'saved_cost': round(row['saved_cost'], 6)} for row in rows}
+
+
+def forget_job_usage(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM llm_usage WHERE job_id = ?', (job_id,))
+
+
+class UsageMeter:
+    """
+    Usage of one revision run, on top of what the job had spent before it.
+    Without a job id nothing is read from or written to the catalog.
+    """
+
+    def __init__(self, job_id=None):
+        self.job_id = job_id
+        self.totals = {}
+        # What save() has already added to the catalog
+        self.saved = {}
+        self.unsaved_calls = 0
+        self.spent_before = 0.0
+        self.review_cost_before = None
+        self.budget = None
+        if job_id:
+            with transaction() as conn:
+                row = conn.execute(
+                    "SELECT SUM(cost) AS cost, SUM(CASE WHEN stage = 'review' THEN cost END) AS review_cost, "
+                    "SUM(CASE WHEN stage = 'review' THEN calls END) AS review_calls "
+                    "FROM llm_usage WHERE job_id = ?", (job_id,)
+                ).fetchone()
+            self.spent_before = row['cost'] or 0.0
+            if row['review_calls']:
+                self.review_cost_before = row['review_cost'] / row['review_calls']
+            self.budget = job_budget(job_id)
+
+    def _counters(self, stage, model):
+        return self.totals.setdefault((stage, model), empty_counters())
+
+    def record_call(self, stage, model, usage, knowledge_share=0.0):
+        """Add a call from its response's usage metadata (Gemini field names)"""
+        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or 0
+        completion_tokens = getattr(usage, 'candidates_token_count', 0) or 0
+        cached_tokens = getattr(usage, 'cached_content_token_count', 0) or 0
+        counters = self._counters(stage, model)
+        counters['calls'] += 1
+        counters['prompt_tokens'] += prompt_tokens
+        counters['completion_tokens'] += completion_tokens
+        counters['cached_tokens'] += cached_tokens
+        counters['knowledge_tokens'] += round(prompt_tokens * knowledge_share)
+        counters['cost'] += call_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        self.unsaved_calls += 1
+        if self.unsaved_calls >= FLUSH_EVERY:
+            self.save()
+
+    def record_saved(self, stage, model):
+        """A segment answered without calling the model ('cache' or 'memory')"""
+        self._counters(stage, model)['saved_calls'] += 1
+
+    def review_call_cost(self):
+        """Average cost of a review call, this run's if it made any"""
+        calls = sum(c['calls'] for (stage, _), c in self.totals.items() if stage == 'review')
+        if calls:
+            return sum(c['cost'] for (stage, _), c in self.totals.items() if stage == 'review') / calls
+        return self.review_cost_before or 0.0
+
+    def _valued(self):
+        """The totals with the saved calls valued"""
+        per_call = self.review_call_cost()
+        return {key: dict(counters, saved_cost=counters['saved_calls'] * per_call)
+                for key, counters in self.totals.items()}
+
+    @property
+    def spent(self):
+        return sum(counters['cost'] for counters in self.totals.values())
+
+    def over_budget(self):
+        return self.budget is not None and self.spent_before + self.spent >= self.budget
+
+    def snapshot(self):
+        """Figures of the run for progress reports"""
+        total = empty_counters()
+        for counters in self._valued().values():
+            for name in COUNTERS:
+                total[name] += counters[name]
+        result = summary(total)
+        result['job_cost'] = round(self.spent_before + total['cost'], 6)
+        result['budget'] = self.budget
+        return result
+
+    def save(self):
+        """Add what the run used since the last save to the job's totals"""
+        self.unsaved_calls = 0
+        if not self.job_id:
+            return
+        valued = self._valued()
+        with transaction() as conn:
+            for (stage, model), counters in valued.items():
+                saved = self.saved.get((stage, model), {})
+                values = [counters[name] - saved.get(name, 0) for name in COUNTERS]
+                if not any(values):
+                    continue
+                updated = conn.execute(
+                    'UPDATE llm_usage SET ' + ', '.join(f'{name} = {name} + ?' for name in COUNTERS) +
+                    ' WHERE job_id = ? AND stage = ? AND model = ?',
+                    values + [self.job_id, stage, model]
+                ).rowcount
+                if not updated:
+                    conn.execute(
+                        f"INSERT INTO llm_usage (job_id, stage, model, {', '.join(COUNTERS)}) "
+                        f"VALUES (?, ?, ?, {', '.join('?' * len(COUNTERS))})",
+                        [self.job_id, stage, model] + values
+                    )
+        self.saved = valued
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python3 llm_usage.py <job_id> [budget_usd|default]")
+        sys.exit(1)
+
+    if len(sys.argv) >= 3:
+        budget = None if sys.argv[2] == 'default' else float(sys.argv[2])
+        if not set_job_budget(sys.argv[1], budget):
+            print(f"Unknown job {sys.argv[1]}")
+            sys.exit(1)
+    usage = job_usage(sys.argv[1])
+    total = usage['total']
+    print(f"Calls: {total['calls']}, tokens: {total['prompt_tokens']} prompt "
+          f"({total['knowledge_tokens']} knowledge base, {total['cached_tokens']} cached) "
+          f"+ {total['completion_tokens']} response")
+    print(f"Spend: ${total['cost']:.4f} (saved ~${total['saved_cost']:.4f} in {total['saved_calls']} calls), "
+          f"budget: {'$' + format(usage['budget'], '.2f') if usage['budget'] else 'none'}")
+    for row in usage['breakdown']:
+        print(f"  {row['model']:<24} {row['stage']:<7} {row['calls']:>6} calls {row['tokens']:>10} tokens "
+              f"${row['cost']:.4f}")
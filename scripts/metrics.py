@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics
+Stage timings, LLM latency/tokens and cache counters recorded by the server
+workers and the task processes, exposed together on /metrics.
+
+Every process writes its samples to PROMETHEUS_MULTIPROC_DIR (jobs/.metrics by
+default) and the scrape aggregates them. Without prometheus_client installed
+the recording helpers do nothing.
+"""
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', os.path.join(PROJECT_ROOT, 'jobs', '.metrics'))
+
+# Must be set before prometheus_client is imported (task processes inherit it)
+os.environ['PROMETHEUS_MULTIPROC_DIR'] = METRICS_DIR
+os.makedirs(METRICS_DIR, exist_ok=True)
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram,
+                                   generate_latest, multiprocess)
+    from prometheus_client.core import GaugeMetricFamily
+    HAS_PROMETHEUS = True
+except ImportError:
+    HAS_PROMETHEUS = False
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+if HAS_PROMETHEUS:
+    STAGE_SECONDS = Histogram(
+        'coolercat_stage_seconds', 'Time spent in a pipeline step (parse, rules, render)',
+        ['stage'], buckets=STAGE_BUCKETS)
+    TASK_SECONDS = Histogram(
+        'coolercat_task_seconds', 'Run time of a scheduled task', ['stage', 'status'], buckets=STAGE_BUCKETS)
+    QUEUE_WAIT_SECONDS = Histogram(
+        'coolercat_queue_wait_seconds', 'Time a task waited in the queue before starting',
+        ['stage'], buckets=STAGE_BUCKETS)
+    LLM_CALL_SECONDS = Histogram(
+        'coolercat_llm_call_seconds', 'Latency of a single LLM API call', ['model', 'outcome'], buckets=LLM_BUCKETS)
+    LLM_SEGMENT_SECONDS = Histogram(
+        'coolercat_llm_segment_seconds', 'Time to review one segment (cache, rate limiting and call)',
+        ['model'], buckets=LLM_BUCKETS)
+    LLM_CACHE = Counter(
+        'coolercat_llm_cache_lookups_total', 'Segment review cache lookups', ['model', 'result'])
+    LLM_TOKENS = Counter(
+        'coolercat_llm_tokens_total', 'Tokens consumed by LLM calls', ['model', 'kind'])
+    RENDER_ROWS = Counter(
+        'coolercat_render_rows_total', 'HTML table rows rendered or reused from the fragment cache', ['result'])
+
+
+def observe_stage(stage, seconds):
+    if HAS_PROMETHEUS:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(stage):
+    """Time the enclosed block as a pipeline step"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def observe_render(rendered, reused):
+    if HAS_PROMETHEUS:
+        RENDER_ROWS.labels('rendered').inc(rendered)
+        RENDER_ROWS.labels('reused').inc(reused)
+
+
+def observe_task(stage, status, seconds):
+    if HAS_PROMETHEUS:
+        TASK_SECONDS.labels(stage, status).observe(seconds)
+
+
+def observe_queue_wait(stage, seconds):
+    if HAS_PROMETHEUS:
+        QUEUE_WAIT_SECONDS.labels(stage).observe(max(seconds, 0))
+
+
+def observe_llm_call(model, seconds, outcome='ok', prompt_tokens=0, completion_tokens=0):
+    if not HAS_PROMETHEUS:
+        return
+    LLM_CALL_SECONDS.labels(model, outcome).observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(model, 'prompt').inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(model, 'completion').inc(completion_tokens)
+
+
+def observe_segment(model, seconds, cached):
+    if not HAS_PROMETHEUS:
+        return
+    LLM_SEGMENT_SECONDS.labels(model).observe(seconds)
+    LLM_CACHE.labels(model, 'hit' if cached else 'miss').inc()
+
+
+class TaskQueueCollector:
+    """Queued/running task counts, read from the catalog at scrape time"""
+
+    def collect(self):
+        from catalog import transaction
+
+        gauge = GaugeMetricFamily('coolercat_tasks', 'Tasks currently queued or running',
+                                  labels=['stage', 'status'])
+        counts = {(stage, status): 0 for stage in ('process', 'revise') for status in ('queued', 'running')}
+        with transaction() as conn:
+            for row in conn.execute(
+                "SELECT stage, status, COUNT(*) AS n FROM tasks WHERE status IN ('queued', 'running') "
+                "GROUP BY stage, status"
+            ):
+                counts[(row['stage'], row['status'])] = row['n']
+        for (stage, status), n in sorted(counts.items()):
+            gauge.add_metric([stage, status], n)
+        yield gauge
+
+
+def render_metrics():
+    """Body and content type of a /metrics scrape, aggregated over all processes"""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(TaskQueueCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def reset_metrics():
+    """Clear samples left by a previous server run (call before workers start)"""
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
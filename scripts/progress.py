@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Job progress reporting
+Throttled, atomic writer for a job's progress.json and the reader used by the server
+"""
+import json
+import os
+import tempfile
+import time
+
+PROGRESS_FILE = 'progress.json'
+TERMINAL_STATUSES = ('completed', 'failed', 'paused')
+
+
+def progress_path(job_dir):
+    return os.path.join(job_dir, PROGRESS_FILE)
+
+
+def progress_mtime(job_dir):
+    """Modification time of progress.json (None if it doesn't exist yet)"""
+    try:
+        return os.stat(progress_path(job_dir)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_progress(job_dir):
+    """Return the last progress snapshot of a job, or None"""
+    try:
+        with open(progress_path(job_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_progress(job_dir, data):
+    """Replace progress.json atomically so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=job_dir, prefix='.progress-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, progress_path(job_dir))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ProgressReporter:
+    """
+    Accumulates progress for a running stage and flushes it to progress.json
+    at most once every `min_interval` seconds (first, last and forced updates
+    are always written).
+    """
+
+    def __init__(self, job_dir, total=0, stage='revise', run_id=None, min_interval=0.5):
+        self.job_dir = job_dir
+        self.min_interval = min_interval
+        self.started = time.time()
+        self._last_write = 0.0
+        self.state = {
+            'status': 'processing',
+            'stage': stage,
+            'run_id': run_id,
+            'pid': os.getpid(),
+            'current': 0,
+            'total': total,
+            'percentage': 0,
+            'message': 'Starting...',
+            'unique': 0,
+            'cache_hits': 0,
+            'errors': 0,
+            'eta_seconds': None,
+        }
+
+    def update(self, current=None, message=None, force=False, **fields):
+        """Record progress; written to disk only if the throttle allows it"""
+        if current is not None:
+            self.state['current'] = current
+        if message is not None:
+            self.state['message'] = message
+        self.state.update(fields)
+
+        now = time.time()
+        if not force and now - self._last_write < self.min_interval:
+            return False
+        self._flush(now)
+        return True
+
+    def finish(self, status='completed', message='Completed!', **fields):
+        """Write the final snapshot unconditionally"""
+        if status == 'completed':
+            self.state['current'] = self.state['total']
+        self.state.update(status=status, message=message, eta_seconds=0, **fields)
+        self._flush(time.time())
+
+    def _flush(self, now):
+        current, total = self.state['current'], self.state['total']
+        elapsed = now - self.started
+        if self.state['status'] == 'completed':
+            self.state['percentage'] = 100
+        else:
+            self.state['percentage'] = int((current / total) * 100) if total > 0 else 0
+        self.state['elapsed_seconds'] = round(elapsed, 1)
+        if self.state['status'] == 'processing' and current > 0 and total > current:
+            self.state['eta_seconds'] = round(elapsed / current * (total - current), 1)
+        self.state['updated_at'] = now
+        try:
+            write_progress(self.job_dir, self.state)
+            self._last_write = now
+        except Exception as e:
+            print(f"Error writing progress: {e}")
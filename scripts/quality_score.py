@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Quality scores
+Quality Framework penalty points per 1000 words, for each job and for each
+file and translator within it. Every error code carries its weight in its
+name (TE-2: 2 points, LQ-0.5: 0.5 points). Word counts come from the XLF
+(x-matecat-raw). Points and words are totalled while the revision table is
+written and kept in the catalog, and rewritten rows adjust them, so scores
+are read without going back to the rows.
+"""
+import csv
+import os
+import re
+
+from catalog import transaction
+
+# Penalty points per 1000 words up to which a job, file or translator passes
+PASS_THRESHOLD = float(os.getenv('COOLERCAT_QUALITY_THRESHOLD', 10))
+
+CODE_PATTERN = re.compile(r'\b[A-Z]{2}-(\d+(?:\.\d+)?)\b')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def code_points(code):
+    """Penalty points of a Code cell, e.g. 'TE-2, LQ-0.5' -> 2.5"""
+    return sum(float(weight) for weight in CODE_PATTERN.findall(code or ''))
+
+
+def segment_words(row):
+    """Word count of a row: the XLF's count, or the source's words for older CSVs"""
+    try:
+        return float(row.get('Words') or '')
+    except ValueError:
+        return float(len(WORD_PATTERN.findall(TAG_PATTERN.sub(' ', row.get('Source') or ''))))
+
+
+def row_groups(row):
+    return (('job', ''), ('file', row.get('File') or ''), ('translator', row.get('Translator') or ''))
+
+
+def add_row(totals, row, sign=1):
+    """Add a revision table row (CSV column names) to {(dimension, key): [words, points]}"""
+    points = code_points(row.get('Code'))
+    count = segment_words(row)
+    for group in row_groups(row):
+        total = totals.setdefault(group, [0.0, 0.0])
+        total[0] += sign * count
+        total[1] += sign * points
+    return totals
+
+
+def count_csv_quality(csv_path):
+    totals = {}
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            add_row(totals, row)
+    return totals
+
+
+def save_job_quality(job_id, totals):
+    with transaction() as conn:
+        conn.execute('DELETE FROM quality WHERE job_id = ?', (job_id,))
+        conn.executemany(
+            'INSERT INTO quality (job_id, dimension, key, words, points) VALUES (?, ?, ?, ?, ?)',
+            [(job_id, dimension, key, words, points) for (dimension, key), (words, points) in totals.items()]
+        )
+
+
+def adjust_job_quality(job_id, changes):
+    """Apply the point changes of rewritten rows"""
+    with transaction() as conn:
+        conn.executemany(
+            'UPDATE quality SET words = words + ?, points = points + ? WHERE job_id = ? AND dimension = ? AND key = ?',
+            [(words, points, job_id, dimension, key) for (dimension, key), (words, points) in changes.items()
+             if words or points]
+        )
+
+
+def forget_job_quality(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM quality WHERE job_id = ?', (job_id,))
+
+
+def score(words, points):
+    per_1000 = points * 1000 / words if words else 0.0
+    return {
+        'words': round(words, 2),
+        'points': round(points, 2),
+        'per_1000_words': round(per_1000, 2),
+        'passed': per_1000 <= PASS_THRESHOLD,
+    }
+
+
+def job_quality(job_id, csv_path):
+    """
+    Scores of a job: {'job': score, 'file': {name: score}, 'translator': {name: score}}
+    (jobs processed before scores were stored are counted from their CSV once)
+    """
+    with transaction() as conn:
+        rows = conn.execute('SELECT dimension, key, words, points FROM quality WHERE job_id = ?',
+                            (job_id,)).fetchall()
+    if not rows:
+        totals = count_csv_quality(csv_path)
+        save_job_quality(job_id, totals)
+        rows = [{'dimension': dimension, 'key': key, 'words': words, 'points': points}
+                for (dimension, key), (words, points) in totals.items()]
+
+    result = {'job': score(0, 0), 'file': {}, 'translator': {}, 'threshold': PASS_THRESHOLD}
+    for row in rows:
+        if row['dimension'] == 'job':
+            result['job'] = score(row['words'], row['points'])
+        else:
+            result[row['dimension']][row['key']] = score(row['words'], row['points'])
+    return result
+
+
+def translator_quality():
+    """Scores of each translator over every job"""
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT key, SUM(words) AS words, SUM(points) AS points, COUNT(*) AS jobs FROM quality "
+            "WHERE dimension = 'translator' GROUP BY key ORDER BY key"
+        ).fetchall()
+    return {row['key']: dict(score(row['words'], row['points']), jobs=row['jobs']) for row in rows}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Translator and reviewer rollups
+Segments, words, penalty points, revisions and error counts by code of each
+translator and reviewer, kept per job in the catalog under the week the job
+was created. Totals are counted while the revision table is written and
+adjusted as AI revisions rewrite rows, so vendor reports are a GROUP BY over
+a few rows per job instead of a pass over every CSV.
+"""
+import csv
+import os
+import re
+import threading
+from datetime import datetime
+
+from catalog import JOBS_DIR, transaction
+from quality_score import code_points, score, segment_words
+
+ROLES = ('translator', 'reviewer')
+ERROR_CODE_PATTERN = re.compile(r'\b[A-Z]{2}-\d+(?:\.\d+)?\b')
+WEEK_PATTERN = re.compile(r'^\d{4}-W\d{2}$')
+# How reports name the segments nobody is attributed to (stored as '')
+UNASSIGNED = '(unassigned)'
+
+_backfill_started = False
+_backfill_lock = threading.Lock()
+
+
+def add_row(totals, row, sign=1):
+    """Add a revision table row (CSV column names) to {(role, person, metric): value}"""
+    code = row.get('Code') or ''
+    values = {
+        'segments': 1,
+        'words': segment_words(row),
+        'points': code_points(code),
+        'revised': int(bool((row.get('New target') or '').strip() or (row.get('AI Revision') or '').strip())),
+    }
+    for error_code in ERROR_CODE_PATTERN.findall(code):
+        values['code:' + error_code] = values.get('code:' + error_code, 0) + 1
+    for role in ROLES:
+        person = (row.get(role.capitalize()) or '').strip()
+        for metric, value in values.items():
+            key = (role, person, metric)
+            totals[key] = totals.get(key, 0) + sign * value
+    return totals
+
+
+def count_csv_rollups(csv_path):
+    totals = {}
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            add_row(totals, row)
+    return totals
+
+
+def job_week(conn, job_id):
+    """ISO week ('2025-W07') of the job's creation, the current week if it is unknown"""
+    row = conn.execute('SELECT created FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    try:
+        created = datetime.fromisoformat(row['created'])
+    except (TypeError, ValueError):
+        created = datetime.now()
+    year, week, _ = created.isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+def save_job_rollups(job_id, totals):
+    with transaction() as conn:
+        week = job_week(conn, job_id)
+        conn.execute('DELETE FROM rollups WHERE job_id = ?', (job_id,))
+        conn.executemany(
+            'INSERT INTO rollups (job_id, week, role, person, metric, value) VALUES (?, ?, ?, ?, ?, ?)',
+            [(job_id, week, role, person, metric, value) for (role, person, metric), value in totals.items()
+             if value]
+        )
+
+
+def adjust_job_rollups(job_id, changes):
+    """Apply the changes of rewritten rows (error codes new to the job get their row)"""
+    with transaction() as conn:
+        week = job_week(conn, job_id)
+        for (role, person, metric), value in changes.items():
+            if not value:
+                continue
+            updated = conn.execute(
+                'UPDATE rollups SET value = value + ? WHERE job_id = ? AND role = ? AND person = ? AND metric = ?',
+                (value, job_id, role, person, metric)
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    'INSERT INTO rollups (job_id, week, role, person, metric, value) VALUES (?, ?, ?, ?, ?, ?)',
+                    (job_id, week, role, person, metric, value)
+                )
+
+
+def forget_job_rollups(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM rollups WHERE job_id = ?', (job_id,))
+
+
+def backfill_rollups():
+    """Count the jobs processed before rollups were kept"""
+    with transaction() as conn:
+        missing = [row['id'] for row in conn.execute(
+            'SELECT id FROM jobs WHERE id NOT IN (SELECT DISTINCT job_id FROM rollups)')]
+    for job_id in missing:
+        csv_path = os.path.join(JOBS_DIR, job_id, 'revision_table.csv')
+        if os.path.exists(csv_path):
+            save_job_rollups(job_id, count_csv_rollups(csv_path))
+
+
+def _backfill_once():
+    try:
+        backfill_rollups()
+    except Exception as e:
+        print(f"Rollup backfill failed: {e}")
+
+
+def start_backfill():
+    """Run backfill_rollups in a daemon thread of this process (once), so reports never count CSVs"""
+    global _backfill_started
+    with _backfill_lock:
+        if _backfill_started:
+            return
+        _backfill_started = True
+    threading.Thread(target=_backfill_once, name='coolercat-rollup-backfill', daemon=True).start()
+
+
+def summary(metrics):
+    """Report figures of {metric: value}"""
+    segments = metrics.get('segments', 0)
+    result = score(metrics.get('words', 0), metrics.get('points', 0))
+    result.update({
+        'segments': int(segments),
+        'revised': int(metrics.get('revised', 0)),
+        'revision_rate': round(metrics.get('revised', 0) / segments, 4) if segments else 0.0,
+        'errors': {metric[5:]: int(value) for metric, value in sorted(metrics.items())
+                   if metric.startswith('code:') and value},
+    })
+    return result
+
+
+def people_report(role='translator', since=None, until=None):
+    """
+    Figures of each person in `role`, overall and per week, for jobs created
+    in the weeks from `since` to `until` ('2025-W07', both optional and included)
+    """
+    sql = 'SELECT person, week, metric, SUM(value) AS value FROM rollups WHERE role = ?'
+    params = [role]
+    if since:
+        sql += ' AND week >= ?'
+        params.append(since)
+    if until:
+        sql += ' AND week <= ?'
+        params.append(until)
+    sql += ' GROUP BY person, week, metric'
+    with transaction() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    people = {}
+    for row in rows:
+        person = people.setdefault(row['person'], {'total': {}, 'weeks': {}})
+        week = person['weeks'].setdefault(row['week'], {})
+        week[row['metric']] = row['value']
+        person['total'][row['metric']] = person['total'].get(row['metric'], 0) + row['value']
+    return [
+        {
+            'person': name or UNASSIGNED,
+            'total': summary(person['total']),
+            'weeks': {week: summary(metrics) for week, metrics in sorted(person['weeks'].items())},
+        }
+        for name, person in sorted(people.items())
+    ]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Job scheduler
+Job stages are queued in the catalog and run as separate tasks.py processes,
+so several jobs are parsed/rendered in parallel across cores. Every server
+worker runs a dispatcher thread; claiming a task is a catalog transaction,
+so the concurrency caps hold across all workers.
+
+Fairness: queued tasks are ordered by input size with aging (small jobs go
+first, a waiting large job gains priority over time), and large tasks never
+take the last free slot of a stage.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from catalog import connect, transaction
+from metrics import observe_queue_wait
+from progress import write_progress
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+JOBS_DIR = os.path.join(PROJECT_ROOT, 'jobs')
+
+# Concurrent tasks per stage (revisions are bound by the LLM rate limit, not by cores)
+MAX_CONCURRENCY = {
+    'process': int(os.getenv('COOLERCAT_MAX_CONCURRENCY', os.cpu_count() or 2)),
+    'revise': int(os.getenv('COOLERCAT_MAX_REVISIONS', 2)),
+}
+# Wall-clock ceiling per stage, in seconds
+TIME_LIMITS = {
+    'process': int(os.getenv('COOLERCAT_PROCESS_TIMEOUT', 300)),
+    'revise': int(os.getenv('COOLERCAT_REVISE_TIMEOUT', 1800)),
+}
+# Resident memory ceiling per stage, in MB (0: none; enforced by tasks.py).
+# Revisions also hold the Gemini client, so they get more room
+MEMORY_LIMITS = {
+    'process': int(os.getenv('COOLERCAT_PROCESS_MEMORY_MB', os.getenv('COOLERCAT_TASK_MEMORY_MB', 2048))),
+    'revise': int(os.getenv('COOLERCAT_REVISE_MEMORY_MB', 3072)),
+}
+
+# Inputs at least this big count as "large" for slot reservation
+LARGE_TASK_BYTES = int(os.getenv('COOLERCAT_LARGE_TASK_MB', 20)) * 1024 * 1024
+# Queue priority gained per second of waiting, expressed in bytes of input
+AGING_BYTES_PER_SECOND = 100 * 1024
+
+ACTIVE_STATUSES = ('queued', 'running')
+DISPATCH_INTERVAL = 0.5
+
+_dispatcher_started = False
+_dispatcher_lock = threading.Lock()
+
+
+def enqueue(job_id, stage, cost=0, message='Queued...'):
+    """Queue a stage for a job and return its run id"""
+    run_id = uuid.uuid4().hex[:12]
+    now = time.time()
+    with transaction() as conn:
+        conn.execute(
+            'INSERT INTO tasks (id, job_id, stage, status, cost, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (run_id, job_id, stage, 'queued', cost, now)
+        )
+    write_progress(os.path.join(JOBS_DIR, job_id), {
+        'status': 'queued', 'stage': stage, 'run_id': run_id, 'current': 0, 'total': 0,
+        'percentage': 0, 'message': message, 'updated_at': now
+    })
+    dispatch()
+    return run_id
+
+
+def active_task(job_id):
+    """The queued or running task of a job, or None"""
+    with transaction() as conn:
+        return conn.execute(
+            'SELECT * FROM tasks WHERE job_id = ? AND status IN (?, ?) ORDER BY enqueued_at LIMIT 1',
+            (job_id, *ACTIVE_STATUSES)
+        ).fetchone()
+
+
+def mark_finished(run_id, status, error=None):
+    """Called by the task process itself when it ends"""
+    with transaction() as conn:
+        conn.execute(
+            'UPDATE tasks SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+            (status, error, time.time(), run_id)
+        )
+
+
+def forget_job(job_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM tasks WHERE job_id = ?', (job_id,))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _recover_dead_tasks():
+    """Fail running tasks whose process is gone (killed by a limit, crashed, host restart)"""
+    with transaction() as conn:
+        running = conn.execute(
+            "SELECT id, job_id, stage, pid, started_at FROM tasks WHERE status = 'running'"
+        ).fetchall()
+    for task in running:
+        if task['pid'] is None:
+            # Claimed but not spawned yet; give the claiming worker a moment
+            if time.time() - (task['started_at'] or 0) < 30:
+                continue
+        elif _pid_alive(task['pid']):
+            continue
+        error = 'Task process exited unexpectedly (time or memory limit exceeded?)'
+        with transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (error, time.time(), task['id'])
+            ).rowcount
+        if updated:
+            print(f"[{task['job_id']}] {task['stage']} task {task['id']} lost: {error}")
+            job_dir = os.path.join(JOBS_DIR, task['job_id'])
+            if os.path.isdir(job_dir):
+                write_progress(job_dir, {'status': 'failed', 'stage': task['stage'], 'run_id': task['id'],
+                                         'percentage': 0, 'message': error, 'updated_at': time.time()})
+
+
+def _claim_next():
+    """Atomically move the next eligible queued task to running; None if nothing can start"""
+    conn = connect()
+    conn.isolation_level = None
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        running = {}
+        running_large = {}
+        for row in conn.execute("SELECT stage, cost FROM tasks WHERE status = 'running'"):
+            running[row['stage']] = running.get(row['stage'], 0) + 1
+            if row['cost'] >= LARGE_TASK_BYTES:
+                running_large[row['stage']] = running_large.get(row['stage'], 0) + 1
+
+        now = time.time()
+        queued = conn.execute(
+            "SELECT * FROM tasks WHERE status = 'queued' ORDER BY cost - (? - enqueued_at) * ?, enqueued_at",
+            (now, AGING_BYTES_PER_SECOND)
+        ).fetchall()
+        for task in queued:
+            limit = MAX_CONCURRENCY.get(task['stage'], 1)
+            if running.get(task['stage'], 0) >= limit:
+                continue
+            # Keep a slot free for small jobs when large ones would fill the stage
+            if task['cost'] >= LARGE_TASK_BYTES and running_large.get(task['stage'], 0) >= max(1, limit - 1):
+                continue
+            conn.execute("UPDATE tasks SET status = 'running', started_at = ? WHERE id = ?", (now, task['id']))
+            conn.execute('COMMIT')
+            observe_queue_wait(task['stage'], now - task['enqueued_at'])
+            return task
+        conn.execute('COMMIT')
+        return None
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+
+def _spawn(task):
+    job_dir = os.path.join(JOBS_DIR, task['job_id'])
+    env = dict(os.environ,
+               COOLERCAT_TASK_TIME_LIMIT=str(TIME_LIMITS.get(task['stage'], 300)),
+               COOLERCAT_TASK_MEMORY_MB=str(MEMORY_LIMITS.get(task['stage'], 0)))
+    try:
+        log_file = open(os.path.join(job_dir, f"{task['stage']}.log"), 'ab')
+        # Own session: tasks survive worker restarts and graceful reloads
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, 'tasks.py'), task['stage'], task['job_id'], task['id']],
+            cwd=SCRIPTS_DIR,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        log_file.close()
+    except Exception as e:
+        mark_finished(task['id'], 'failed', str(e))
+        print(f"[{task['job_id']}] Could not start {task['stage']} task: {e}")
+        return
+    # Reap the child when it exits so it doesn't linger as a zombie
+    threading.Thread(target=proc.wait, daemon=True).start()
+    with transaction() as conn:
+        conn.execute('UPDATE tasks SET pid = ? WHERE id = ?', (proc.pid, task['id']))
+    print(f"[{task['job_id']}] Started {task['stage']} task {task['id']} (pid {proc.pid})")
+
+
+def dispatch():
+    """Start as many queued tasks as the concurrency caps allow"""
+    _recover_dead_tasks()
+    while True:
+        task = _claim_next()
+        if task is None:
+            return
+        _spawn(task)
+
+
+def _dispatch_loop():
+    while True:
+        try:
+            dispatch()
+        except Exception as e:
+            print(f"Scheduler error: {e}")
+        time.sleep(DISPATCH_INTERVAL)
+
+
+def start_dispatcher():
+    """Run the dispatch loop in a daemon thread of this process (once)"""
+    global _dispatcher_started
+    with _dispatcher_lock:
+        if _dispatcher_started:
+            return
+        _dispatcher_started = True
+    threading.Thread(target=_dispatch_loop, name='coolercat-scheduler', daemon=True).start()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Segment search
+Full-text index of the segments of every job (source, target, revisions,
+comment, code and state) in jobs/search.db, for finding how a term was
+translated across past jobs. The index is kept by the paths that change
+segments: a job is re-indexed whenever its revision CSV is rewritten, saved
+reviewer edits update their segments, and a deleted job is dropped. Searches
+only read it.
+
+Usage: python3 segment_search.py benchmark [segments]
+"""
+import csv
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from edits import job_edits
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR = os.path.join(PROJECT_ROOT, 'jobs')
+SEARCH_PATH = os.getenv('COOLERCAT_SEARCH_PATH', os.path.join(JOBS_DIR, 'search.db'))
+
+MAX_LIMIT = 200
+# bm25 weights of the indexed columns (code and state only filter)
+COLUMN_WEIGHTS = (2.0, 2.0, 1.5, 1.5, 0.5, 0.0, 0.0)
+# Searches whose every term is in more segments than this are not ranked
+# (scoring all their matches takes too long) and list the newest hits first
+MAX_RANKED_MATCHES = 20000
+
+# Quoted phrases, or single terms (a trailing * makes a prefix search)
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+TOKEN_PATTERN = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    matecat_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    ai_revision TEXT NOT NULL,
+    comment TEXT NOT NULL,
+    code TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+DROP INDEX IF EXISTS segments_job;
+CREATE INDEX IF NOT EXISTS segments_job_segment ON segments (job_id, matecat_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    source, target, revision, ai_revision, comment, code, state,
+    content='segments', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+-- Number of segments containing each term
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_vocab USING fts5vocab(segments_fts, 'row');
+
+CREATE TRIGGER IF NOT EXISTS segments_insert AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts (rowid, source, target, revision, ai_revision, comment, code, state)
+    VALUES (new.id, new.source, new.target, new.revision, new.ai_revision, new.comment, new.code, new.state);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_delete AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts (segments_fts, rowid, source, target, revision, ai_revision, comment, code, state)
+    VALUES ('delete', old.id, old.source, old.target, old.revision, old.ai_revision, old.comment, old.code, old.state);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_update AFTER UPDATE ON segments BEGIN
+    INSERT INTO segments_fts (segments_fts, rowid, source, target, revision, ai_revision, comment, code, state)
+    VALUES ('delete', old.id, old.source, old.target, old.revision, old.ai_revision, old.comment, old.code, old.state);
+    INSERT INTO segments_fts (rowid, source, target, revision, ai_revision, comment, code, state)
+    VALUES (new.id, new.source, new.target, new.revision, new.ai_revision, new.comment, new.code, new.state);
+END;
+
+-- Jobs in the index, with the CSV version they were indexed from
+CREATE TABLE IF NOT EXISTS indexed_jobs (
+    job_id TEXT PRIMARY KEY,
+    csv_mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+# Revision columns of the index that reviewer edits replace, by segment key suffix
+EDITED_COLUMNS = {'xlf': 'revision', 'ai': 'ai_revision'}
+
+_refresh_started = False
+_refresh_lock = threading.Lock()
+
+
+def connect(path=None):
+    path = path or SEARCH_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _index_rows(conn, job_id, rows):
+    conn.execute('DELETE FROM segments WHERE job_id = ?', (job_id,))
+    conn.executemany(
+        'INSERT INTO segments (job_id, matecat_id, source, target, revision, ai_revision, comment, code, state) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        ((job_id, row.get('ID Matecat') or '', row.get('Source') or '', row.get('Target') or '',
+          row.get('New target') or '', row.get('AI Revision') or '', row.get('Comment') or '',
+          row.get('Code') or '', (row.get('State') or '').lower()) for row in rows)
+    )
+
+
+def with_edits(rows, edits):
+    """CSV rows with the reviewer edits of their revisions merged in (as the export does)"""
+    for row in rows:
+        matecat_id = row.get('ID Matecat') or ''
+        for column, suffix in (('New target', 'xlf'), ('AI Revision', 'ai')):
+            edit = edits.get(f'{matecat_id}-{suffix}')
+            if row.get(column) and edit:
+                row[column] = edit['text']
+        yield row
+
+
+def index_job(job_id, csv_path, conn=None):
+    """(Re-)index a job's segments from its revision CSV and its reviewer edits"""
+    own = conn is None
+    conn = conn or connect()
+    try:
+        mtime_ns = os.stat(csv_path).st_mtime_ns
+        edits = job_edits(job_id)
+        with conn, open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            _index_rows(conn, job_id, with_edits(csv.DictReader(f), edits))
+            conn.execute('INSERT OR REPLACE INTO indexed_jobs (job_id, csv_mtime_ns) VALUES (?, ?)',
+                         (job_id, mtime_ns))
+    finally:
+        if own:
+            conn.close()
+
+
+def index_edits(job_id, texts):
+    """Put saved reviewer edits ({segment key: text}) into the revisions they replace"""
+    updates = []
+    for segment, text in texts.items():
+        matecat_id, _, suffix = segment.rpartition('-')
+        if suffix in EDITED_COLUMNS:
+            updates.append((EDITED_COLUMNS[suffix], text, matecat_id))
+    conn = connect()
+    try:
+        with conn:
+            for column, text, matecat_id in updates:
+                # (segments without that revision are not exported with the edit either)
+                conn.execute(
+                    f"UPDATE segments SET {column} = ? WHERE job_id = ? AND matecat_id = ? AND {column} != ''",
+                    (text, job_id, matecat_id)
+                )
+    finally:
+        conn.close()
+
+
+def job_segments(job_id, csv_path, matecat_ids, path=None):
+    """
+    Index rows (source, code, comment...) of the given segments of a job, read
+    by key instead of from the CSV; a job whose CSV changed is re-indexed first
+    """
+    matecat_ids = list(matecat_ids)
+    conn = connect(path)
+    try:
+        indexed = conn.execute('SELECT csv_mtime_ns FROM indexed_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if indexed is None or indexed['csv_mtime_ns'] != os.stat(csv_path).st_mtime_ns:
+            index_job(job_id, csv_path, conn)
+        return conn.execute(
+            f"SELECT * FROM segments WHERE job_id = ? AND matecat_id IN ({', '.join('?' * len(matecat_ids))})",
+            [job_id] + matecat_ids
+        ).fetchall() if matecat_ids else []
+    finally:
+        conn.close()
+
+
+def forget_job_segments(job_id):
+    conn = connect()
+    try:
+        with conn:
+            conn.execute('DELETE FROM segments WHERE job_id = ?', (job_id,))
+            conn.execute('DELETE FROM indexed_jobs WHERE job_id = ?', (job_id,))
+    finally:
+        conn.close()
+
+
+def refresh_index(conn, jobs_dir=JOBS_DIR):
+    """Index jobs whose CSV is new or changed since it was indexed (e.g. processed before the index existed)"""
+    if not os.path.isdir(jobs_dir):
+        return
+    indexed = {row['job_id']: row['csv_mtime_ns'] for row in conn.execute('SELECT * FROM indexed_jobs')}
+    present = set()
+    for job_id in os.listdir(jobs_dir):
+        csv_path = os.path.join(jobs_dir, job_id, 'revision_table.csv')
+        try:
+            mtime_ns = os.stat(csv_path).st_mtime_ns
+        except OSError:
+            continue
+        present.add(job_id)
+        if indexed.get(job_id) != mtime_ns:
+            index_job(job_id, csv_path, conn)
+    for job_id in indexed.keys() - present:
+        with conn:
+            conn.execute('DELETE FROM segments WHERE job_id = ?', (job_id,))
+            conn.execute('DELETE FROM indexed_jobs WHERE job_id = ?', (job_id,))
+
+
+def _refresh_once():
+    started = time.perf_counter()
+    try:
+        conn = connect()
+        try:
+            refresh_index(conn)
+        finally:
+            conn.close()
+        print(f"Search index up to date ({time.perf_counter() - started:.1f}s)")
+    except Exception as e:
+        print(f"Search index refresh failed: {e}")
+
+
+def start_index_refresh():
+    """
+    Bring the index up to date once, in a daemon thread of this process: jobs
+    processed before the index existed, or whose CSV was replaced by hand
+    """
+    global _refresh_started
+    with _refresh_lock:
+        if _refresh_started:
+            return
+        _refresh_started = True
+    threading.Thread(target=_refresh_once, name='coolercat-search-index', daemon=True).start()
+
+
+def fts_phrase(text, prefix=False):
+    """FTS5 phrase of the words of `text` (punctuation and query operators are dropped)"""
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    return '"' + ' '.join(tokens) + '"' + ('*' if prefix else '')
+
+
+def build_query(q='', code='', state=''):
+    """
+    FTS5 MATCH expression of a search: all terms must match, "quoted text"
+    is a phrase and term* a prefix; code and state restrict those columns
+    """
+    parts = []
+    for phrase, term in QUERY_PATTERN.findall(q or ''):
+        part = fts_phrase(phrase) if phrase else fts_phrase(term, prefix=term.endswith('*'))
+        if part:
+            parts.append(part)
+    if code:
+        part = fts_phrase(code)
+        if part:
+            parts.append(f'code : {part}')
+    if state:
+        part = fts_phrase(state)
+        if part:
+            parts.append(f'state : {part}')
+    return ' AND '.join(parts)
+
+
+def is_ranked(conn, q):
+    """
+    Whether hits of a search are ranked: not when it has no words (code and
+    state filters only) or every word is in more than MAX_RANKED_MATCHES segments
+    """
+    words = {word.casefold() for word in TOKEN_PATTERN.findall(q or '')}
+    if not words:
+        return False
+    if '*' in q:
+        return True
+    for word in words:
+        row = conn.execute('SELECT doc FROM segments_vocab WHERE term = ?', (word,)).fetchone()
+        if row is None or row['doc'] <= MAX_RANKED_MATCHES:
+            return True
+    return False
+
+
+def search(q='', code='', state='', job_id=None, limit=50, offset=0, path=None):
+    """
+    Best matching segments across all jobs, as dicts with their bm25 'score'
+    (lower is better; None for filter-only or very common word searches,
+    which list the newest hits first)
+    """
+    match = build_query(q, code, state)
+    if not match:
+        return []
+    limit = min(max(limit, 1), MAX_LIMIT)
+    conn = connect(path)
+    try:
+        ranked = is_ranked(conn, q)
+        score = f'bm25(segments_fts, {", ".join(map(str, COLUMN_WEIGHTS))})' if ranked else 'NULL'
+        sql = (f'SELECT segments.*, {score} AS score '
+               'FROM segments_fts JOIN segments ON segments.id = segments_fts.rowid '
+               'WHERE segments_fts MATCH ?')
+        params = [match]
+        if job_id:
+            sql += ' AND segments.job_id = ?'
+            params.append(job_id)
+        sql += ' ORDER BY score' if ranked else ' ORDER BY segments_fts.rowid DESC'
+        sql += ' LIMIT ? OFFSET ?'
+        params += [limit, max(offset, 0)]
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def benchmark(segments=1_000_000, queries=200):
+    """Index synthetic segments into a scratch database and time searches"""
+    import itertools
+    import tempfile
+
+    rng = random.Random(7)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+             for _ in range(30000)]
+    # Zipf-like word frequencies, as in real text
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    codes = ['', '', '', 'TE-2', 'TE-0.5', 'TC-0.5', 'LQ-0.5', 'ST-0.5']
+
+    def sentence():
+        return ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 14)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'search.db')
+        conn = connect(path)
+        started = time.perf_counter()
+        per_job = 10000
+        for job in range(segments // per_job):
+            rows = ({'ID Matecat': str(job * per_job + i), 'Source': sentence(), 'Target': sentence(),
+                     'New target': sentence() if rng.random() < 0.2 else '', 'Code': rng.choice(codes),
+                     'State': rng.choice(['translated', 'reviewed', 'final'])} for i in range(per_job))
+            with conn:
+                _index_rows(conn, f'job-{job}', rows)
+        conn.close()
+        print(f"Indexed {segments} segments in {time.perf_counter() - started:.1f}s")
+
+        cases = {
+            'rare term': lambda: {'q': rng.choice(words[5000:])},
+            'two terms': lambda: {'q': f'{rng.choice(words[100:3000])} {rng.choice(words[100:3000])}'},
+            'phrase': lambda: {'q': f'"{rng.choice(words[50:500])} {rng.choice(words[50:500])}"'},
+            'prefix': lambda: {'q': rng.choice(words[1000:])[:4] + '*'},
+            'term + code': lambda: {'q': rng.choice(words[200:2000]), 'code': 'TE-2'},
+            'common term': lambda: {'q': rng.choice(words[:20])},
+            'code only': lambda: {'code': rng.choice(codes[3:])},
+        }
+        for name, make in cases.items():
+            timings = []
+            for _ in range(queries):
+                started = time.perf_counter()
+                search(path=path, limit=50, **make())
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            print(f"{name:12} median {timings[len(timings) // 2] * 1000:6.1f} ms   "
+                  f"p95 {timings[int(len(timings) * 0.95)] * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'benchmark':
+        print("Usage: python3 segment_search.py benchmark [segments]")
+        sys.exit(1)
+    benchmark(*(int(arg) for arg in sys.argv[2:3]))
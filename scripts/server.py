@@ -3,48 +3,83 @@
 CoolerCat Translation Server
 Flask backend for job management, file uploads, and AI revision processing
 """
+import csv
 import os
-import sys
 import json
+import re
 import shutil
-import subprocess
+import time
 import uuid
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from itertools import islice
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 
-app = Flask(__name__)
-CORS(app)
+from attribution import add_rule, delete_rule, load_rules, validate_rule
+from catalog import (find_job_by_hash, known_job_ids, last_opened_job, load_dashboard, mark_job_opened,
+                     register_job, remove_job, save_dashboard)
+from edits import apply_edits, forget_job_edits, job_edits, validate_changes
+from job_export import FORMATS, RowFilter, stream_export
+from job_stats import job_stats
+from llm_usage import forget_job_usage, job_usage, resume_point, set_job_budget, set_resume_point, usage_by_job
+from metrics import HAS_PROMETHEUS, render_metrics, reset_metrics
+from progress import TERMINAL_STATUSES, progress_mtime, read_progress
+from quality_score import forget_job_quality, job_quality, translator_quality
+from rollups import ROLES, WEEK_PATTERN, forget_job_rollups, people_report, start_backfill
+from scheduler import active_task, enqueue, forget_job, start_dispatcher
+from segment_search import forget_job_segments, index_edits, job_segments, search, start_index_refresh
+from text_diff import diff_ops, encode_ops
+from translation_memory import TranslationMemory
+from uploads import XlfUploadRequest, cleanup_stale_uploads, hash_file, is_xlf_filename
 
 # Paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 JOBS_DIR = os.path.join(PROJECT_ROOT, 'jobs')
 SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
+
+# Rows of the last opened job sent with the dashboard, enough to paint the table at once
+DASHBOARD_PAGE_SIZE = 200
+
+# Assets go through Flask's static file handler (conditional requests, cache headers,
+# and sendfile when the WSGI server provides wsgi.file_wrapper)
+app = Flask(__name__, static_folder=ASSETS_DIR, static_url_path='/assets')
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.getenv('COOLERCAT_STATIC_MAX_AGE', 600))
+# Uploads larger than this are refused with 413 before their body is read
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('COOLERCAT_MAX_UPLOAD_MB', 100)) * 1024 * 1024
+app.request_class = XlfUploadRequest
+CORS(app)
+
+# Progress streams end after this many seconds and EventSource reconnects after
+# STREAM_RETRY_MS, so a forgotten tab doesn't hold a worker for good
+STREAM_MAX_SECONDS = int(os.getenv('COOLERCAT_STREAM_MAX_SECONDS', 300))
+STREAM_RETRY_MS = 3000
+# Seconds between two checks that a streamed job still has a task queued or running
+STREAM_TASK_CHECK_SECONDS = 5
 
 os.makedirs(JOBS_DIR, exist_ok=True)
+start_dispatcher()
+start_index_refresh()
+start_backfill()
 
 
-def run_script(script_name: str, args: list, timeout: int = 300) -> tuple:
-    """Run a Python script and return (success, output/error)"""
-    script_path = os.path.join(SCRIPTS_DIR, script_name)
-    if not os.path.exists(script_path):
-        return False, f"Script not found: {script_path}"
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, script_path] + args,
-            capture_output=True,
-            text=True,
-            cwd=SCRIPTS_DIR,
-            timeout=timeout
-        )
-        if result.returncode != 0:
-            return False, result.stderr or result.stdout or 'Unknown error'
-        return True, result.stdout
-    except subprocess.TimeoutExpired:
-        return False, f'Script timed out after {timeout} seconds'
-    except Exception as e:
-        return False, str(e)
+def find_xlf_file(job_dir):
+    """Name of the job's XLF file, or None"""
+    if not os.path.isdir(job_dir):
+        return None
+    xlf_files = [f for f in os.listdir(job_dir) if f.endswith('.xlf') or f.endswith('.xlf.xlf')]
+    return xlf_files[0] if xlf_files else None
+
+
+def queue_processing(job_id):
+    """Run id of the job's pending task, queueing XLF processing if nothing is pending"""
+    task = active_task(job_id)
+    if task is not None:
+        return task['id']
+    xlf_file = find_xlf_file(os.path.join(JOBS_DIR, job_id))
+    cost = os.path.getsize(os.path.join(JOBS_DIR, job_id, xlf_file))
+    return enqueue(job_id, 'process', cost, 'Queued for processing...')
+
 
 def get_jobs():
     """Get list of all jobs"""
@@ -52,6 +87,8 @@ def get_jobs():
     if not os.path.exists(JOBS_DIR):
         return jobs
     
+    cataloged = known_job_ids()
+    usage = usage_by_job()
     for job_id in os.listdir(JOBS_DIR):
         job_path = os.path.join(JOBS_DIR, job_id)
         if os.path.isdir(job_path):
@@ -61,18 +98,47 @@ def get_jobs():
                 xlf_file = xlf_files[0]
                 xlf_path = os.path.join(job_path, xlf_file)
                 stat = os.stat(xlf_path)
+                created = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                
+                # Jobs created before the catalog existed are hashed once so re-uploads dedupe
+                if job_id not in cataloged:
+                    register_job(job_id, xlf_file, hash_file(xlf_path), stat.st_size, created)
                 
                 jobs.append({
                     'id': job_id,
                     'name': xlf_file,
-                    'created': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'size': stat.st_size
+                    'created': created,
+                    'size': stat.st_size,
+                    # LLM tokens and estimated spend (None until the job is revised)
+                    'usage': usage.get(job_id)
                 })
     
     # Sort by creation time (newest first)
     jobs.sort(key=lambda x: x['created'], reverse=True)
     return jobs
 
+@app.after_request
+def cache_fingerprinted_assets(response):
+    """Assets requested with a content fingerprint (?v=) never change: cache them for a year"""
+    if request.path.startswith('/assets/') and 'v' in request.args and response.status_code in (200, 304):
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File too large. The maximum upload size is {limit_mb} MB.'}), 413
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (stage timings, LLM latency/tokens, queue state)"""
+    if not HAS_PROMETHEUS:
+        return jsonify({'error': 'prometheus_client is not installed'}), 501
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     """List all jobs"""
@@ -81,6 +147,8 @@ def list_jobs():
 @app.route('/api/jobs', methods=['POST'])
 def create_job():
     """Create a new job from uploaded XLF file"""
+    cleanup_stale_uploads()
+    
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
     
@@ -88,138 +156,156 @@ def create_job():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if not (file.filename.endswith('.xlf') or file.filename.endswith('.xlf.xlf')):
+    if not is_xlf_filename(file.filename):
         return jsonify({'error': 'Invalid file type. Please upload an XLF file.'}), 400
     
+    # The upload was streamed to disk, hashed and checked while it was received
+    upload = file.stream
+    if not upload.finish():
+        upload.discard()
+        return jsonify({'error': upload.error}), 400
+    
+    # Identical file already uploaded: reuse that job instead of processing it again
+    existing = find_job_by_hash(upload.sha256)
+    if existing is not None and os.path.isdir(os.path.join(JOBS_DIR, existing['id'])):
+        upload.discard()
+        print(f"[{existing['id']}] Duplicate upload of {existing['name']}, reusing job")
+        return jsonify({
+            'job_id': existing['id'],
+            'name': existing['name'],
+            'deduplicated': True,
+            'message': 'This file was already uploaded, opening the existing job'
+        })
+    
     # Create job ID
     job_id = str(uuid.uuid4())
     job_dir = os.path.join(JOBS_DIR, job_id)
     os.makedirs(job_dir, exist_ok=True)
     
     # Save file
-    filename = file.filename
+    filename = os.path.basename(file.filename)
     file_path = os.path.join(job_dir, filename)
-    file.save(file_path)
-    
-    # Process the job
-    try:
-        result = process_job(job_id)
-        if result['success']:
-            return jsonify({
-                'job_id': job_id,
-                'name': filename,
-                'message': 'Job created and processed successfully',
-                'stats': result.get('stats', {})
-            })
-        else:
-            return jsonify({'error': result.get('error', 'Processing failed')}), 500
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-def process_job(job_id):
-    """Process a job: generate CSV and HTML from XLF file"""
-    import csv as csv_module
+    upload.save(file_path)
+    register_job(job_id, filename, upload.sha256, upload.size, datetime.now().isoformat())
     
-    job_dir = os.path.join(JOBS_DIR, job_id)
-    xlf_files = [f for f in os.listdir(job_dir) if f.endswith('.xlf') or f.endswith('.xlf.xlf')]
-    
-    if not xlf_files:
-        return {'success': False, 'error': 'No XLF file found in job'}
-    
-    xlf_path = os.path.join(job_dir, xlf_files[0])
-    csv_path = os.path.join(job_dir, 'revision_table.csv')
-    html_path = os.path.join(job_dir, 'revision_table.html')
-    
-    print(f"[{job_id}] Processing XLF → CSV...")
-    
-    # Step 1: Generate CSV from XLF
-    success, output = run_script('create_revision_table.py', [xlf_path, csv_path])
-    if not success:
-        return {'success': False, 'error': f'CSV generation failed: {output}'}
-    
-    if not os.path.exists(csv_path):
-        return {'success': False, 'error': 'CSV file was not created'}
-    
-    # Count rows for stats
-    row_count, with_revisions = 0, 0
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            for row in csv_module.DictReader(f):
-                row_count += 1
-                if row.get('New target', '').strip():
-                    with_revisions += 1
-    except Exception as e:
-        print(f"[{job_id}] Warning: Could not count rows: {e}")
-    
-    print(f"[{job_id}] CSV: {row_count} rows, {with_revisions} with revisions")
-    
-    # Step 2: Generate HTML from CSV
-    success, output = run_script('create_html_table.py', [csv_path, html_path, job_id])
-    if not success:
-        return {'success': False, 'error': f'HTML generation failed: {output}'}
-    
-    return {'success': True, 'stats': {'total': row_count, 'with_revisions': with_revisions}}
+    # Parse and render in the background; the client follows the run's progress
+    run_id = enqueue(job_id, 'process', upload.size, 'Queued for processing...')
+    return jsonify({
+        'job_id': job_id,
+        'name': filename,
+        'run_id': run_id,
+        'message': 'Job created and queued for processing'
+    }), 202
 
 @app.route('/api/jobs/<job_id>/process', methods=['POST'])
 def reprocess_job(job_id):
     """Reprocess an existing job"""
-    result = process_job(job_id)
-    if result['success']:
-        return jsonify({
-            'message': 'Job reprocessed successfully',
-            'stats': result.get('stats', {})
-        })
-    else:
-        return jsonify({'error': result.get('error', 'Processing failed')}), 500
+    if find_xlf_file(os.path.join(JOBS_DIR, job_id)) is None:
+        return jsonify({'error': 'No XLF file found in job'}), 404
+    if active_task(job_id) is not None:
+        return jsonify({'error': 'This job is already queued or running'}), 409
+    
+    run_id = queue_processing(job_id)
+    return jsonify({'message': 'Job queued for reprocessing', 'run_id': run_id}), 202
 
 @app.route('/api/jobs/<job_id>/revise', methods=['POST'])
 def revise_job(job_id):
-    """AI-powered revision of all translations in a job"""
+    """Queue AI-powered revision of all translations in a job (runs in the background)"""
     job_dir = os.path.join(JOBS_DIR, job_id)
     csv_path = os.path.join(job_dir, 'revision_table.csv')
-    html_path = os.path.join(job_dir, 'revision_table.html')
     
     if not os.path.exists(csv_path):
         return jsonify({'error': 'CSV file not found. Please process the job first.'}), 404
     
-    print(f"[{job_id}] Starting AI revision...")
-    
-    # Run AI revision (30 min timeout for large jobs)
-    success, output = run_script('ai_revision.py', [csv_path, csv_path], timeout=1800)
-    if not success:
-        return jsonify({'error': f'AI revision failed: {output}'}), 500
+    if active_task(job_id) is not None:
+        return jsonify({'error': 'This job is already queued or running'}), 409
     
-    # Parse stats from output
-    stats = {}
-    for line in output.split('\n'):
-        if 'Total segments:' in line:
-            try: stats['total'] = int(line.split(':')[-1].strip())
-            except: pass
-        elif 'Revised:' in line:
-            try: stats['revised'] = int(line.split(':')[-1].strip())
-            except: pass
+    # A run paused by the job's budget is resumed unless a restart is asked for
+    if (request.get_json(silent=True) or {}).get('restart') or request.args.get('restart') == '1':
+        set_resume_point(job_id, None)
+    resume_from = resume_point(job_id)
     
-    # Regenerate HTML with AI results
-    run_script('create_html_table.py', [csv_path, html_path, job_id])
-    
-    print(f"[{job_id}] AI revision complete: {stats.get('revised', 0)} revised")
-    return jsonify({'message': 'AI revision completed successfully', 'stats': stats})
+    print(f"[{job_id}] Queueing AI revision..." + (f" (resuming at row {resume_from + 1})" if resume_from else ''))
+    run_id = enqueue(job_id, 'revise', os.path.getsize(csv_path), 'Queued for AI revision...')
+    return jsonify({'message': 'AI revision queued', 'run_id': run_id, 'resume_from': resume_from}), 202
 
 @app.route('/api/jobs/<job_id>/progress', methods=['GET'])
 def get_job_progress(job_id):
     job_dir = os.path.join(JOBS_DIR, job_id)
-    progress_file = os.path.join(job_dir, 'progress.json')
-    
-    if os.path.exists(progress_file):
-        try:
-            with open(progress_file, 'r') as f:
-                data = json.load(f)
-            return jsonify(data)
-        except Exception:
-            pass
-            
+    data = read_progress(job_dir)
+    if data is not None:
+        return jsonify(data)
     return jsonify({'status': 'unknown', 'percentage': 0, 'message': 'Waiting to start...'})
 
+@app.route('/api/jobs/<job_id>/usage', methods=['GET'])
+def get_job_usage(job_id):
+    """LLM tokens and estimated spend of a job, overall and per stage and model, with its budget"""
+    if not os.path.isdir(os.path.join(JOBS_DIR, job_id)):
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_usage(job_id))
+
+@app.route('/api/jobs/<job_id>/budget', methods=['POST'])
+def set_budget(job_id):
+    """
+    Set the job's LLM spend limit in USD: {"budget": 2.5}; 0 means no limit
+    and null goes back to COOLERCAT_JOB_BUDGET
+    """
+    budget = (request.get_json(silent=True) or {}).get('budget')
+    if budget is not None and (isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget < 0):
+        return jsonify({'error': 'budget must be a non-negative number or null'}), 400
+    if not set_job_budget(job_id, budget):
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_usage(job_id))
+
+@app.route('/api/jobs/<job_id>/progress/stream', methods=['GET'])
+def stream_job_progress(job_id):
+    """Server-sent events: push every new progress snapshot of a running job"""
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    if not os.path.isdir(job_dir):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    run_id = request.args.get('run')
+    
+    def events():
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        last_mtime = progress_mtime(job_dir)
+        initial = read_progress(job_dir)
+        started = last_sent = last_checked = time.time()
+        if initial is not None:
+            if run_id and initial.get('run_id') == run_id:
+                yield f"event: progress\ndata: {json.dumps(initial)}\n\n"
+                if initial.get('status') in TERMINAL_STATUSES:
+                    return
+            elif not run_id and initial.get('status') not in TERMINAL_STATUSES:
+                # A finished snapshot left over from a previous run must not end the stream
+                yield f"event: progress\ndata: {json.dumps(initial)}\n\n"
+        
+        while time.time() - started < STREAM_MAX_SECONDS:
+            time.sleep(0.25)
+            mtime = progress_mtime(job_dir)
+            if mtime != last_mtime:
+                last_mtime = mtime
+                data = read_progress(job_dir)
+                if data is None or (run_id and data.get('run_id') != run_id):
+                    continue
+                yield f"event: progress\ndata: {json.dumps(data)}\n\n"
+                last_sent = time.time()
+                if data.get('status') in TERMINAL_STATUSES:
+                    return
+            elif time.time() - last_checked > STREAM_TASK_CHECK_SECONDS:
+                last_checked = time.time()
+                # (tasks write their last snapshot before leaving the queue)
+                if active_task(job_id) is None and progress_mtime(job_dir) == last_mtime:
+                    # Nothing left to report: tell the client to stop instead of reconnecting
+                    yield "event: idle\ndata: {}\n\n"
+                    return
+            elif time.time() - last_sent > 15:
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 def get_job(job_id):
     """Get job details"""
@@ -243,31 +329,269 @@ def get_job(job_id):
         'has_html': os.path.exists(html_path)
     })
 
+def ai_diff(new_target, target, ai_revision):
+    """Edit ops of an AI revision against the translation it checked"""
+    if not ai_revision:
+        return ''
+    return encode_ops(diff_ops(new_target.strip() or target, ai_revision))
+
+def add_ai_diffs(columns, rows):
+    """Fill in the AI Diff column of compact rows from CSVs revised before it existed"""
+    index = {name: i for i, name in enumerate(columns)}
+
+    def cell(row, name):
+        i = index.get(name)
+        return row[i] if i is not None and i < len(row) else ''
+
+    for row in rows:
+        row.append(ai_diff(cell(row, 'New target'), cell(row, 'Target'), cell(row, 'AI Revision')))
+    columns.append('AI Diff')
+
+def read_job_rows(csv_path, offset=0, limit=None):
+    """Column names and rows (as lists) of a job's CSV, optionally one page of them"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        rows = list(islice(reader, offset, None if limit is None else offset + limit))
+    if 'AI Revision' in columns and 'AI Diff' not in columns:
+        add_ai_diffs(columns, rows)
+    return columns, rows
+
 @app.route('/api/jobs/<job_id>/data', methods=['GET'])
 def get_job_data(job_id):
     """Get job CSV data as JSON - auto-process if needed"""
-    import csv
-    
     job_dir = os.path.join(JOBS_DIR, job_id)
     csv_path = os.path.join(job_dir, 'revision_table.csv')
     
-    # If CSV doesn't exist, process the job first
+    # If CSV doesn't exist, process the job first (the client waits for the run)
     if not os.path.exists(csv_path):
-        result = process_job(job_id)
-        if not result['success']:
-            return jsonify({'error': result.get('error', 'Processing failed')}), 500
+        if find_xlf_file(job_dir) is None:
+            return jsonify({'error': 'No XLF file found'}), 404
+        return jsonify({'status': 'processing', 'run_id': queue_processing(job_id)}), 202
     
     # Read CSV and return as JSON
-    rows = []
+    # (?format=compact sends the column names once and one array per row;
+    # offset/limit return a single page of rows)
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append(row)
-        return jsonify({'data': rows, 'job_id': job_id})
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = request.args.get('limit', type=int)
+        if offset == 0:
+            mark_job_opened(job_id)
+        if request.args.get('format') == 'compact':
+            columns, rows = read_job_rows(csv_path, offset, limit)
+            return jsonify({'columns': columns, 'rows': rows, 'offset': offset,
+                            'edits': job_edits(job_id), 'job_id': job_id})
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        if rows and 'AI Revision' in rows[0] and 'AI Diff' not in rows[0]:
+            for row in rows:
+                row['AI Diff'] = ai_diff(row.get('New target', ''), row.get('Target', ''), row['AI Revision'])
+        return jsonify({'data': rows, 'edits': job_edits(job_id), 'job_id': job_id})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def dashboard_jobs():
+    """
+    The jobs with their stat counts, from the catalog's dashboard row. It is
+    built here once and dropped whenever a job is added, removed or rewritten
+    (or a job directory appears outside the server)
+    """
+    job_dirs = [entry.name for entry in os.scandir(JOBS_DIR) if entry.is_dir()] if os.path.exists(JOBS_DIR) else []
+    generation, jobs, built_dirs = load_dashboard()
+    if jobs is not None and built_dirs == sorted(job_dirs):
+        return jobs
+
+    jobs = get_jobs()
+    for job in jobs:
+        csv_path = os.path.join(JOBS_DIR, job['id'], 'revision_table.csv')
+        processed = os.path.exists(csv_path)
+        job['stats'] = job_stats(job['id'], csv_path) if processed else None
+        job['quality'] = job_quality(job['id'], csv_path)['job'] if processed else None
+    save_dashboard(generation, jobs, job_dirs)
+    return jobs
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """
+    Everything the start page needs in one request: the jobs with their stat
+    counts, and the first page of rows of the job opened last
+    """
+    jobs = dashboard_jobs()
+
+    last_job = None
+    last = last_opened_job()
+    job = next((job for job in jobs if last and job['id'] == last['id']), None)
+    if job and job['stats']:
+        columns, rows = read_job_rows(os.path.join(JOBS_DIR, job['id'], 'revision_table.csv'),
+                                      limit=DASHBOARD_PAGE_SIZE)
+        last_job = {'id': job['id'], 'name': job['name'], 'stats': job['stats'],
+                    'columns': columns, 'rows': rows, 'edits': job_edits(job['id'])}
+    return jsonify({'jobs': jobs, 'last_job': last_job})
+
+@app.route('/api/jobs/<job_id>/quality', methods=['GET'])
+def get_job_quality(job_id):
+    """
+    Quality Framework score of a job, and of each file and translator in it:
+    penalty points per 1000 words and whether they pass the threshold
+    """
+    csv_path = os.path.join(JOBS_DIR, job_id, 'revision_table.csv')
+    if not os.path.exists(csv_path):
+        return jsonify({'error': 'Job has not been processed yet'}), 404
+    return jsonify(job_quality(job_id, csv_path))
+
+@app.route('/api/quality/translators', methods=['GET'])
+def get_translator_quality():
+    """Quality Framework score of each translator across all jobs"""
+    return jsonify({'translators': translator_quality()})
+
+@app.route('/api/reports/people', methods=['GET'])
+def get_people_report():
+    """
+    Segments, words, penalty points per 1000 words, revision rate and errors by
+    code of each translator (?role=reviewer for reviewers), overall and per
+    week, optionally for the weeks ?since= to ?until= (e.g. 2025-W07)
+    """
+    role = request.args.get('role', 'translator')
+    if role not in ROLES:
+        return jsonify({'error': f"role must be one of {', '.join(ROLES)}"}), 400
+    since = request.args.get('since') or None
+    until = request.args.get('until') or None
+    if any(week and not WEEK_PATTERN.match(week) for week in (since, until)):
+        return jsonify({'error': 'since and until are ISO weeks, e.g. 2025-W07'}), 400
+    return jsonify({'role': role, 'people': people_report(role, since, until)})
+
+@app.route('/api/attribution/rules', methods=['GET'])
+def get_attribution_rules():
+    """Segment range and metadata rules attributing segments to translators and reviewers"""
+    return jsonify({'rules': load_rules()})
+
+@app.route('/api/attribution/rules', methods=['POST'])
+def create_attribution_rule():
+    """
+    Add a rule: {"role": "translator"|"reviewer", "person", "kind": "range",
+    "min_id", "max_id"} or {..., "kind": "meta", "pattern"}; it applies to
+    jobs processed from now on
+    """
+    rule = request.get_json(silent=True)
+    error = validate_rule(rule)
+    if error:
+        return jsonify({'error': error}), 400
+    return jsonify(add_rule(rule)), 201
+
+@app.route('/api/attribution/rules/<int:rule_id>', methods=['DELETE'])
+def delete_attribution_rule(rule_id):
+    if not delete_rule(rule_id):
+        return jsonify({'error': 'Rule not found'}), 404
+    return jsonify({'message': 'Rule deleted'})
+
+@app.route('/api/jobs/<job_id>/edits', methods=['GET'])
+def get_job_edits(job_id):
+    """Reviewer edits of a job with their versions"""
+    if not os.path.isdir(os.path.join(JOBS_DIR, job_id)):
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'edits': job_edits(job_id), 'job_id': job_id})
+
+@app.route('/api/jobs/<job_id>/edits', methods=['PATCH'])
+def patch_job_edits(job_id):
+    """
+    Save a batch of reviewer edits: {"edits": [{"segment", "text", "version"}]}
+    Segments changed by another reviewer since `version` come back as conflicts
+    with their current text and are left untouched.
+    """
+    if not os.path.isdir(os.path.join(JOBS_DIR, job_id)):
+        return jsonify({'error': 'Job not found'}), 404
+
+    payload = request.get_json(silent=True) or {}
+    changes = payload.get('edits')
+    error = validate_changes(changes)
+    if error:
+        return jsonify({'error': error}), 400
+
+    applied, conflicts = apply_edits(job_id, changes)
+    if applied:
+        texts = {change['segment']: change['text'] for change in changes}
+        saved = {item['segment']: texts[item['segment']] for item in applied}
+        remember_edits(job_id, saved)
+        index_edits(job_id, saved)
+    return jsonify({'applied': applied, 'conflicts': conflicts})
+
+def remember_edits(job_id, saved):
+    """Add saved reviewer edits ({segment: text}) to the translation memory, under their segment's source"""
+    csv_path = os.path.join(JOBS_DIR, job_id, 'revision_table.csv')
+    if not os.path.exists(csv_path):
+        return
+    # Segment keys are "<Matecat id>-ai" / "<Matecat id>-xlf"
+    edited = {segment.rsplit('-', 1)[0]: text for segment, text in saved.items()}
+    # (sources are looked up in the search index, keyed by segment, not read from the whole CSV)
+    entries = [{'source': row['source'], 'target': edited[row['matecat_id']], 'codes': row['code'],
+                'comment': row['comment'], 'origin': 'reviewer', 'job_id': job_id}
+               for row in job_segments(job_id, csv_path, edited)]
+    memory = TranslationMemory()
+    try:
+        memory.remember(entries)
+    finally:
+        memory.close()
+
+@app.route('/api/memory', methods=['GET'])
+def lookup_memory():
+    """Translation memory matches for ?source= (85% similar or better, best first)"""
+    source = request.args.get('source', '')
+    if not source.strip():
+        return jsonify({'error': 'Missing source'}), 400
+    limit = min(max(request.args.get('limit', 3, type=int), 1), 20)
+    memory = TranslationMemory()
+    try:
+        return jsonify({'matches': memory.lookup(source, limit=limit)})
+    finally:
+        memory.close()
+
+@app.route('/api/search', methods=['GET'])
+def search_segments():
+    """
+    Segments of every job matching ?q= (all terms; "quoted phrase", prefix*),
+    optionally narrowed by ?code=, ?state= and ?job=, best ranked first
+    """
+    q = request.args.get('q', '')
+    code = request.args.get('code', '')
+    state = request.args.get('state', '')
+    if not (q.strip() or code.strip() or state.strip()):
+        return jsonify({'error': 'Missing search (q, code or state)'}), 400
+    started = time.perf_counter()
+    hits = search(q, code, state, job_id=request.args.get('job') or None,
+                  limit=request.args.get('limit', 50, type=int), offset=request.args.get('offset', 0, type=int))
+    names = {}
+    for hit in hits:
+        if hit['job_id'] not in names:
+            names[hit['job_id']] = find_xlf_file(os.path.join(JOBS_DIR, hit['job_id']))
+        hit['job_name'] = names[hit['job_id']]
+    return jsonify({'hits': hits, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+
+@app.route('/api/jobs/<job_id>/export', methods=['GET'])
+def export_job(job_id):
+    """
+    Download the job's rows with reviewer edits merged in, streamed as it is
+    written: ?format=csv|xlsx|jsonl plus the table filters (search, code,
+    state, min_id, max_id, stat)
+    """
+    csv_path = os.path.join(JOBS_DIR, job_id, 'revision_table.csv')
+    if not os.path.exists(csv_path):
+        return jsonify({'error': 'Job has not been processed yet'}), 404
+
+    export_format = request.args.get('format', 'csv')
+    if export_format not in FORMATS:
+        return jsonify({'error': f"Unknown format (use {', '.join(FORMATS)})"}), 400
+    try:
+        row_filter = RowFilter.from_args(request.args)
+    except ValueError:
+        return jsonify({'error': 'min_id and max_id must be integers'}), 400
+
+    filename = f"{re.sub(r'[^A-Za-z0-9]', '_', job_id)}_{datetime.now():%Y-%m-%d}.{export_format}"
+    return Response(
+        stream_export(csv_path, job_id, export_format, row_filter),
+        content_type=FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 @app.route('/api/jobs/<job_id>/html', methods=['GET'])
 def get_job_html(job_id):
     """Get HTML file for a job - auto-process if needed"""
@@ -276,40 +600,33 @@ def get_job_html(job_id):
     
     # If HTML doesn't exist, process the job first
     if not os.path.exists(html_path):
-        result = process_job(job_id)
-        if not result['success']:
-            # Return an error page instead of JSON
-            error_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Error</title></head>
-            <body style="font-family: Arial; padding: 40px; text-align: center;">
-                <h1>Job Not Processed</h1>
-                <p>This job needs to be processed first.</p>
-                <p>Error: {result.get('error', 'Unknown error')}</p>
-                <p><a href="/">← Back to Jobs</a></p>
-            </body>
-            </html>
-            """
-            return error_html, 404
-    
-    return send_from_directory(job_dir, 'revision_table.html')
+        if find_xlf_file(job_dir) is None:
+            return jsonify({'error': 'No XLF file found'}), 404
+        queue_processing(job_id)
+        processing_html = """
+        <!DOCTYPE html>
+        <html>
+        <head><title>Processing</title><meta http-equiv="refresh" content="3"></head>
+        <body style="font-family: Arial; padding: 40px; text-align: center;">
+            <h1>Job Being Processed</h1>
+            <p>This page will refresh automatically when the table is ready.</p>
+            <p><a href="/">← Back to Jobs</a></p>
+        </body>
+        </html>
+        """
+        return processing_html, 202
+    
+    return send_from_directory(job_dir, 'revision_table.html', max_age=0)
 
 @app.route('/')
 def index():
     """Serve the main index.html"""
     index_path = os.path.join(PROJECT_ROOT, 'index.html')
     if os.path.exists(index_path):
-        return send_from_directory(PROJECT_ROOT, 'index.html')
+        return send_from_directory(PROJECT_ROOT, 'index.html', max_age=0)
     else:
         return "index.html not found", 404
 
-@app.route('/assets/<path:filename>')
-def serve_assets(filename):
-    """Serve static assets"""
-    assets_dir = os.path.join(PROJECT_ROOT, 'assets')
-    return send_from_directory(assets_dir, filename)
-
 @app.route('/api/jobs/<job_id>', methods=['DELETE'])
 def delete_job(job_id):
     """Delete a job"""
@@ -319,6 +636,13 @@ def delete_job(job_id):
     
     try:
         shutil.rmtree(job_dir)
+        remove_job(job_id)
+        forget_job(job_id)
+        forget_job_edits(job_id)
+        forget_job_quality(job_id)
+        forget_job_rollups(job_id)
+        forget_job_segments(job_id)
+        forget_job_usage(job_id)
         return jsonify({'message': 'Job deleted successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -329,5 +653,7 @@ if __name__ == '__main__':
     print(f"🌐 Server running at http://localhost:5001")
     print(f"🏠 Network access at http://10.0.0.146:5001")
     print("\nPress Ctrl+C to stop the server")
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    print("For production use: gunicorn -c gunicorn.conf.py")
+    reset_metrics()
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=5001, threaded=True)
 
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Inline tag integrity
+The ph/pc/bpt/ept elements of a segment are flattened into its text as
+literal tags; export back to Matecat needs every revision to keep the same
+tags in the same order. The check compares tag sequences (a regex scan and a
+list comparison per text, counts only when they differ) so it can run on every
+segment while the XLF is parsed and on every AI revision.
+"""
+import re
+from collections import Counter
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Quality Framework "Tag Issues": missing or extra tags break the export (Major),
+# tags in another order usually only the layout (Minor)
+TAG_CODE_MAJOR = 'TG-2'
+TAG_CODE_MINOR = 'TG-0.5'
+TAG_CODES = (TAG_CODE_MAJOR, TAG_CODE_MINOR)
+
+
+def tag_sequence(text):
+    return TAG_PATTERN.findall(text or '')
+
+
+def tag_problem(expected, text):
+    """
+    None if `text` has the tags of `expected` in the same order, otherwise
+    (code, description) of the difference
+    """
+    wanted = tag_sequence(expected)
+    found = tag_sequence(text)
+    if wanted == found:
+        return None
+    wanted_counts, found_counts = Counter(wanted), Counter(found)
+    if wanted_counts == found_counts:
+        return TAG_CODE_MINOR, 'tags in a different order'
+    parts = []
+    missing = wanted_counts - found_counts
+    extra = found_counts - wanted_counts
+    if missing:
+        parts.append('missing ' + ' '.join(sorted(missing.elements())))
+    if extra:
+        parts.append('extra ' + ' '.join(sorted(extra.elements())))
+    return TAG_CODE_MAJOR, ', '.join(parts)
+
+
+def check_segment(source, target, revision=''):
+    """
+    Tag checks of a parsed segment: returns (revision, code, comment) where the
+    revision is dropped ('') if it changes the target's tags, and code/comment
+    report a target whose tags differ from the source ('' when it is fine)
+    """
+    comments = []
+    code = ''
+    if revision:
+        problem = tag_problem(target, revision)
+        if problem:
+            comments.append(f'Tag Issue: rule revision discarded ({problem[1]})')
+            revision = ''
+    if target:
+        problem = tag_problem(source, target)
+        if problem:
+            code = problem[0]
+            severity = 'Major' if code == TAG_CODE_MAJOR else 'Minor'
+            comments.append(f'Tag Issue {severity}: target has {problem[1]} compared to the source')
+    return revision, code, ' | '.join(comments)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Background job tasks
+Runs job stages in a separate process started by the scheduler, so web
+workers can be restarted or reloaded without interrupting them
+"""
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+
+from catalog import invalidate_dashboard
+from job_stats import adjust_job_stats, job_stats, save_job_stats
+from llm_usage import UsageMeter, resume_point, set_resume_point
+from metrics import observe_render, observe_task, stage_timer
+from progress import ProgressReporter
+from quality_score import adjust_job_quality, save_job_quality
+from rollups import adjust_job_rollups, save_job_rollups
+from segment_search import index_job
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+JOBS_DIR = os.path.join(PROJECT_ROOT, 'jobs')
+
+# Seconds between two reads of a task's resident memory
+MEMORY_CHECK_INTERVAL = 1.0
+# Seconds a task over its memory ceiling gets to fail cleanly before it is killed
+MEMORY_GRACE = 30
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+class TaskMemoryExceeded(Exception):
+    pass
+
+
+def resident_mb():
+    """Resident memory of this process in MB (its peak where there is no /proc)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # (bytes on macOS, KB elsewhere)
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def watch_memory(limit_mb, stop):
+    """
+    Watchdog thread: once the task's resident memory passes `limit_mb`, raise
+    TaskMemoryExceeded in the main thread (through SIGUSR1), and kill the task
+    if it is still over the limit MEMORY_GRACE seconds later
+    """
+    signalled_at = None
+    while not stop.wait(MEMORY_CHECK_INTERVAL):
+        if resident_mb() <= limit_mb:
+            signalled_at = None
+        elif signalled_at is None:
+            signalled_at = time.monotonic()
+            os.kill(os.getpid(), signal.SIGUSR1)
+        elif time.monotonic() - signalled_at > MEMORY_GRACE:
+            print(f"Still over the memory limit of {limit_mb} MB, killing the task")
+            os.kill(os.getpid(), signal.SIGKILL)
+
+
+def apply_limits():
+    """
+    Apply the memory and wall-clock ceilings the scheduler passed in the
+    environment; returns the event that stops the memory watchdog.
+    Memory is the resident set, checked by a watchdog thread: an address-space
+    limit (RLIMIT_AS) also counts what threaded native libraries (the Gemini
+    client's gRPC) only reserve, and makes them fail at random.
+    """
+    stop = threading.Event()
+    memory_mb = int(os.getenv('COOLERCAT_TASK_MEMORY_MB', 0))
+    if memory_mb > 0:
+        def on_memory(signum, frame):
+            raise TaskMemoryExceeded(f'Memory limit of {memory_mb} MB exceeded')
+        signal.signal(signal.SIGUSR1, on_memory)
+        threading.Thread(target=watch_memory, args=(memory_mb, stop), name='memory-watchdog', daemon=True).start()
+
+    time_limit = int(os.getenv('COOLERCAT_TASK_TIME_LIMIT', 0))
+    if time_limit > 0:
+        def on_timeout(signum, frame):
+            raise TaskTimeout(f'Time limit of {time_limit} seconds exceeded')
+        signal.signal(signal.SIGALRM, on_timeout)
+        signal.alarm(time_limit)
+    return stop
+
+
+def run_process(job_id, run_id=None):
+    """Parse the job's XLF into the revision CSV and render the HTML table"""
+    from create_revision_table import parse_xlf_file, write_revision_table
+    from create_html_table import create_html_table
+
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    xlf_files = [f for f in os.listdir(job_dir) if f.endswith('.xlf') or f.endswith('.xlf.xlf')]
+    if not xlf_files:
+        raise FileNotFoundError('No XLF file found in job')
+
+    xlf_path = os.path.join(job_dir, xlf_files[0])
+    csv_path = os.path.join(job_dir, 'revision_table.csv')
+    html_path = os.path.join(job_dir, 'revision_table.html')
+
+    progress = ProgressReporter(job_dir, stage='process', run_id=run_id)
+    progress.update(message='Parsing XLF...', force=True)
+    print(f"[{job_id}] Processing XLF → CSV...")
+    translations = parse_xlf_file(xlf_path)
+    stats, quality, rollups = write_revision_table(translations, csv_path)
+    save_job_stats(job_id, stats)
+    save_job_quality(job_id, quality)
+    save_job_rollups(job_id, rollups)
+    # A fresh table has no AI revision left to resume
+    set_resume_point(job_id, None)
+    index_job(job_id, csv_path)
+    print(f"[{job_id}] CSV: {stats['total']} rows, {stats['with_revisions']} with revisions")
+
+    progress.update(message='Generating HTML...', force=True)
+    with stage_timer('render'):
+        render = create_html_table(csv_path, html_path, job_id, stats)
+    observe_render(render['rendered'], render['reused'])
+    return progress, stats
+
+
+def run_revise(job_id, run_id=None):
+    """AI revision of a job's CSV followed by HTML regeneration"""
+    from ai_revision import revise_csv_with_ai
+    from create_html_table import create_html_table
+
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    csv_path = os.path.join(job_dir, 'revision_table.csv')
+    html_path = os.path.join(job_dir, 'revision_table.html')
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError('CSV file not found. Please process the job first.')
+
+    progress = ProgressReporter(job_dir, stage='revise', run_id=run_id)
+    # Token spend goes on the job's account; a run paused by its budget is picked up where it stopped
+    # (saved however the run ends, so failed or timed out runs still count against the budget)
+    usage = UsageMeter(job_id)
+    try:
+        stats = revise_csv_with_ai(csv_path, csv_path, progress=progress, usage=usage, start=resume_point(job_id))
+    finally:
+        usage.save()
+    set_resume_point(job_id, stats['paused_at'])
+    adjust_job_stats(job_id, stats.pop('stat_changes'))
+    adjust_job_quality(job_id, stats.pop('quality_changes'))
+    adjust_job_rollups(job_id, stats.pop('rollup_changes'))
+    index_job(job_id, csv_path)
+    progress.update(message='Regenerating HTML...', force=True)
+    with stage_timer('render'):
+        render = create_html_table(csv_path, html_path, job_id, job_stats(job_id, csv_path))
+    observe_render(render['rendered'], render['reused'])
+    if stats['paused_at'] is not None:
+        print(f"[{job_id}] AI revision paused at row {stats['paused_at'] + 1}: budget reached")
+    else:
+        print(f"[{job_id}] AI revision complete: {stats.get('revised', 0)} revised")
+    return progress, stats
+
+
+TASKS = {
+    'process': (run_process, 'Processing complete!'),
+    'revise': (run_revise, 'Revision Complete!'),
+}
+
+
+def run_task(stage, job_id, run_id=None):
+    """Run a stage and record its outcome in progress.json and the scheduler queue"""
+    import scheduler
+
+    task, done_message = TASKS[stage]
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    stop_watchdog = apply_limits()
+    started = time.perf_counter()
+    try:
+        progress, stats = task(job_id, run_id)
+    except Exception as e:
+        print(f"[{job_id}] {stage} failed: {e}")
+        observe_task(stage, 'failed', time.perf_counter() - started)
+        ProgressReporter(job_dir, stage=stage, run_id=run_id).finish('failed', f'{stage.capitalize()} failed: {e}')
+        if run_id:
+            scheduler.mark_finished(run_id, 'failed', str(e))
+        return False
+    finally:
+        signal.alarm(0)
+        stop_watchdog.set()
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        # (the revision table may have been rewritten, whatever the outcome)
+        invalidate_dashboard()
+
+    observe_task(stage, 'completed', time.perf_counter() - started)
+    if stats.get('paused_at') is not None:
+        budget = stats['usage']['budget']
+        progress.finish('paused', f'Paused: the budget of ${budget:.2f} is spent. Raise it and revise again to resume.',
+                        stats=stats)
+        if run_id:
+            scheduler.mark_finished(run_id, 'paused')
+        return True
+    progress.finish('completed', done_message, stats=stats)
+    if run_id:
+        scheduler.mark_finished(run_id, 'completed')
+    return True
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3 or sys.argv[1] not in TASKS:
+        print(f"Usage: python3 tasks.py <{'|'.join(TASKS)}> <job_id> [run_id]")
+        sys.exit(1)
+
+    run_id = sys.argv[3] if len(sys.argv) >= 4 else None
+    sys.exit(0 if run_task(sys.argv[1], sys.argv[2], run_id) else 1)
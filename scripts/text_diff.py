@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Text diff for revisions
+Myers diff over word/whitespace/punctuation tokens (tags are kept whole), encoded
+as compact edit ops so clients only have to paint spans
+"""
+import re
+
+# Tags, whitespace runs, words, and any other single character (punctuation,
+# typographic quotes...), so every character of the text belongs to a token
+TOKEN_PATTERN = re.compile(r'<[^>]+>|\s+|\w+|[^\w\s]')
+OPS_PATTERN = re.compile(r'([=+-])(\d+)')
+
+# Above this many tokens per side the texts are reported as fully replaced
+MAX_TOKENS = 4000
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text or '')
+
+
+def _myers(a, b):
+    """Shortest edit script between token lists, as (op, token) pairs"""
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for d in range(n + m + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, a, b)
+    return []
+
+
+def _backtrack(trace, a, b):
+    x, y = len(a), len(b)
+    edits = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            edits.append(('=', a[x - 1]))
+            x -= 1
+            y -= 1
+        if d > 0:
+            if x == prev_x:
+                edits.append(('+', b[y - 1]))
+            else:
+                edits.append(('-', a[x - 1]))
+        x, y = prev_x, prev_y
+    edits.reverse()
+    return edits
+
+
+def diff_ops(original, revised):
+    """
+    Edit ops turning `original` into `revised` as [op, length] runs, where op
+    is '=' (kept), '+' (inserted, in revised) or '-' (deleted, in original)
+    and length counts characters
+    """
+    a, b = tokenize(original), tokenize(revised)
+
+    # Common prefix/suffix don't need the O(ND) search
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < len(a) - prefix and suffix < len(b) - prefix
+           and a[len(a) - 1 - suffix] == b[len(b) - 1 - suffix]):
+        suffix += 1
+    middle_a = a[prefix:len(a) - suffix]
+    middle_b = b[prefix:len(b) - suffix]
+
+    if len(middle_a) > MAX_TOKENS or len(middle_b) > MAX_TOKENS:
+        edits = [('-', t) for t in middle_a] + [('+', t) for t in middle_b]
+    else:
+        edits = _myers(middle_a, middle_b)
+    edits = [('=', t) for t in a[:prefix]] + edits + [('=', t) for t in a[len(a) - suffix:]]
+
+    ops = []
+    for op, token in edits:
+        if ops and ops[-1][0] == op:
+            ops[-1][1] += len(token)
+        else:
+            ops.append([op, len(token)])
+    return ops
+
+
+def encode_ops(ops):
+    """Compact string form of diff ops, e.g. '=12+5-3=20'"""
+    return ''.join(f'{op}{length}' for op, length in ops)
+
+
+def decode_ops(encoded):
+    return [[op, int(length)] for op, length in OPS_PATTERN.findall(encoded or '')]
+
+
+def revised_segments(revised, ops):
+    """Split the revised text into (text, inserted) runs following the ops"""
+    segments = []
+    position = 0
+    for op, length in ops:
+        if op == '-':
+            continue
+        segments.append((revised[position:position + length], op == '+'))
+        position += length
+    if position < len(revised):
+        segments.append((revised[position:], False))
+    return segments
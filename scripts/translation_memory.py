@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Translation memory
+Translations approved by reviewers (their saved edits) kept across jobs in
+jobs/memory.db, so later jobs reuse them instead of starting cold.
+
+Fuzzy lookup goes through a MinHash index: each source is reduced to a
+signature of character trigram hashes (one-permutation hashing, so one hash
+per trigram), cut into bands; sources sharing a band land in the same bucket.
+Only entries sharing a bucket with the query are scored, with the similarity
+ratio CAT tools use for fuzzy matches.
+
+Usage: python3 translation_memory.py benchmark [entries] [queries]
+"""
+import os
+import random
+import re
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from difflib import SequenceMatcher
+from hashlib import blake2b
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMORY_PATH = os.getenv('COOLERCAT_MEMORY_PATH', os.path.join(PROJECT_ROOT, 'jobs', 'memory.db'))
+
+# Matches below this similarity are not returned
+FUZZY_THRESHOLD = 0.85
+
+# Signature of BANDS * ROWS values. With 10 bands of 3, sources whose trigram
+# sets overlap by 60% share a bucket 91% of the time, by 70% 98% of the time
+BANDS = 10
+ROWS = 3
+SIGNATURE_SIZE = BANDS * ROWS
+SHINGLE_SIZE = 3
+# Most bucket-sharing entries scored per lookup
+MAX_CANDIDATES = 50
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    source_hash BLOB NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    codes TEXT NOT NULL DEFAULT '',
+    comment TEXT NOT NULL DEFAULT '',
+    origin TEXT NOT NULL,
+    job_id TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, entry_id)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text):
+    return WHITESPACE_PATTERN.sub(' ', text or '').strip()
+
+
+def source_hash(source):
+    return blake2b(normalize(source).encode('utf-8'), digest_size=16).digest()
+
+
+def signature(source):
+    """MinHash signature of the source's character trigrams (None for very short sources)"""
+    text = normalize(source).casefold()
+    if len(text) < SHINGLE_SIZE:
+        return None
+    mins = [None] * SIGNATURE_SIZE
+    for k in range(len(text) - SHINGLE_SIZE + 1):
+        h = zlib.crc32(text[k:k + SHINGLE_SIZE].encode('utf-8'))
+        slot, value = h % SIGNATURE_SIZE, h // SIGNATURE_SIZE
+        if mins[slot] is None or value < mins[slot]:
+            mins[slot] = value
+    # Slots no trigram fell into borrow from the next filled slot (densification)
+    filled = [i for i, value in enumerate(mins) if value is not None]
+    for i, value in enumerate(mins):
+        if value is None:
+            nearest = next((j for j in filled if j > i), filled[0])
+            mins[i] = mins[nearest] + ((nearest - i) % SIGNATURE_SIZE) * 0x100000000
+    return mins
+
+
+def buckets(source):
+    """One bucket key per band of the signature"""
+    mins = signature(source)
+    if mins is None:
+        return []
+    keys = []
+    for band in range(BANDS):
+        packed = struct.pack(f'<{ROWS}Q', *mins[band * ROWS:(band + 1) * ROWS])
+        keys.append((band << 32) | zlib.crc32(packed))
+    return keys
+
+
+def similarity(a, b, threshold=FUZZY_THRESHOLD):
+    """Fuzzy match score of two sources, 0 to 1 (0 when clearly below `threshold`)"""
+    a, b = normalize(a), normalize(b)
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # Cheap upper bounds first: most candidates are ruled out without the full match
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+def as_match(row, score):
+    match = {key: row[key] for key in row.keys() if key != 'source_hash'}
+    match['score'] = round(score, 4)
+    return match
+
+
+class TranslationMemory:
+    """Connection to the memory; keep one open for a whole run of lookups"""
+
+    def __init__(self, path=None):
+        path = path or MEMORY_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def remember(self, entries):
+        """
+        Add {'source', 'target', 'codes', 'comment', 'origin', 'job_id'} entries;
+        a source already in the memory gets the newer translation
+        """
+        now = time.time()
+        with self.conn:
+            for entry in entries:
+                if not normalize(entry['source']) or not normalize(entry['target']):
+                    continue
+                key = source_hash(entry['source'])
+                values = (entry['target'], entry.get('codes') or '', entry.get('comment') or '',
+                          entry['origin'], entry.get('job_id'), now)
+                row = self.conn.execute('SELECT id FROM entries WHERE source_hash = ?', (key,)).fetchone()
+                if row:
+                    self.conn.execute(
+                        'UPDATE entries SET target = ?, codes = ?, comment = ?, origin = ?, job_id = ?, '
+                        'updated_at = ? WHERE id = ?', values + (row['id'],))
+                    continue
+                entry_id = self.conn.execute(
+                    'INSERT INTO entries (source_hash, source, target, codes, comment, origin, job_id, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (key, entry['source']) + values).lastrowid
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO buckets (bucket, entry_id) VALUES (?, ?)',
+                    [(bucket, entry_id) for bucket in buckets(entry['source'])])
+
+    def lookup(self, source, threshold=FUZZY_THRESHOLD, limit=3):
+        """Entries whose source is at least `threshold` similar, best first, with their 'score'"""
+        exact = self.conn.execute('SELECT * FROM entries WHERE source_hash = ?', (source_hash(source),)).fetchone()
+        if exact:
+            matches = [as_match(exact, 1.0)]
+            if limit == 1:
+                return matches
+        else:
+            matches = []
+
+        keys = buckets(source)
+        if not keys:
+            return matches
+        candidates = self.conn.execute(
+            f'SELECT entry_id, COUNT(*) AS shared FROM buckets WHERE bucket IN ({",".join("?" * len(keys))}) '
+            'GROUP BY entry_id ORDER BY shared DESC LIMIT ?', keys + [MAX_CANDIDATES]).fetchall()
+        ids = [row['entry_id'] for row in candidates if not exact or row['entry_id'] != exact['id']]
+        if ids:
+            for row in self.conn.execute(
+                    f'SELECT * FROM entries WHERE id IN ({",".join("?" * len(ids))})', ids):
+                score = similarity(source, row['source'], threshold)
+                if score >= threshold:
+                    matches.append(as_match(row, score))
+        matches.sort(key=lambda match: match['score'], reverse=True)
+        return matches[:limit]
+
+    def best_match(self, source, threshold=FUZZY_THRESHOLD):
+        matches = self.lookup(source, threshold, limit=1)
+        return matches[0] if matches else None
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+def benchmark(entries=1_000_000, queries=1000):
+    """Fill a scratch memory with synthetic sentences and time fuzzy lookups of edited copies"""
+    import tempfile
+
+    rng = random.Random(42)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10)))
+             for _ in range(20000)]
+    sentences = [' '.join(rng.choice(words) for _ in range(rng.randint(5, 16))) for _ in range(entries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TranslationMemory(os.path.join(tmp, 'memory.db'))
+        started = time.perf_counter()
+        batch = 10000
+        for i in range(0, entries, batch):
+            memory.remember({'source': s, 'target': s.upper(), 'origin': 'benchmark'}
+                            for s in sentences[i:i + batch])
+        build_seconds = time.perf_counter() - started
+        print(f"Built {memory.count()} entries in {build_seconds:.1f}s "
+              f"({entries / build_seconds:.0f} entries/s)")
+
+        # Queries: stored sentences with about 5% of their characters changed
+        originals = rng.sample(sentences, min(queries, entries))
+        probes = []
+        for sentence in originals:
+            chars = list(sentence)
+            for _ in range(max(1, len(chars) // 20)):
+                chars[rng.randrange(len(chars))] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+            probes.append(''.join(chars))
+
+        found = 0
+        timings = []
+        for original, probe in zip(originals, probes):
+            started = time.perf_counter()
+            match = memory.best_match(probe)
+            timings.append(time.perf_counter() - started)
+            found += bool(match and match['source'] == original)
+        timings.sort()
+        total = sum(timings)
+        print(f"{len(probes)} fuzzy lookups: {len(probes) / total:.0f} lookups/s, "
+              f"median {timings[len(timings) // 2] * 1000:.2f} ms, "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1000:.2f} ms, "
+              f"recall {found / len(probes):.1%}")
+        memory.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'benchmark':
+        print("Usage: python3 translation_memory.py benchmark [entries] [queries]")
+        sys.exit(1)
+    benchmark(*(int(arg) for arg in sys.argv[2:4]))
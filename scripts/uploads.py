@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming XLF uploads
+File parts are written to disk in chunks as werkzeug parses the multipart body,
+while their SHA-256 is computed and expat checks that the XML is well-formed
+XLIFF 2.0, so bad files are rejected without a second pass over the data
+"""
+import hashlib
+import os
+import tempfile
+import time
+from xml.parsers import expat
+
+from flask import Request
+
+XLIFF_NAMESPACE = 'urn:oasis:names:tc:xliff:document:2.0'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(PROJECT_ROOT, 'jobs', '.uploads')
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def is_xlf_filename(filename):
+    return bool(filename) and (filename.endswith('.xlf') or filename.endswith('.xlf.xlf'))
+
+
+def hash_file(path):
+    """SHA-256 of a file on disk, read in chunks"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class XlfUploadSink:
+    """
+    Writable file handed to the multipart parser for an uploaded XLF file.
+    Once the content turns out not to be XLIFF, further chunks are dropped.
+    """
+
+    def __init__(self, upload_dir=UPLOAD_DIR):
+        os.makedirs(upload_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=upload_dir, prefix='upload-', suffix='.part')
+        self._file = os.fdopen(fd, 'w+b')
+        self._sha = hashlib.sha256()
+        self._parser = expat.ParserCreate(namespace_separator=' ')
+        self._parser.StartElementHandler = self._check_root
+        self._finished = False
+        self.size = 0
+        self.error = None
+
+    def _check_root(self, name, attrs):
+        namespace, _, local_name = name.rpartition(' ')
+        if local_name != 'xliff' or namespace != XLIFF_NAMESPACE:
+            raise ValueError(f'Root element is not an XLIFF 2.0 <xliff> element ({local_name})')
+        # Only the root matters, skip the callback for every other element
+        self._parser.StartElementHandler = None
+
+    def write(self, data):
+        if self.error is None:
+            try:
+                self._parser.Parse(data, False)
+            except (expat.ExpatError, ValueError) as e:
+                self._reject(e)
+            else:
+                self._sha.update(data)
+                self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def _reject(self, error):
+        self.error = f'Invalid XLF file: {error}'
+        self._file.truncate(0)
+
+    def finish(self):
+        """Complete the well-formedness check once the whole part was received"""
+        if self._finished:
+            return self.error is None
+        self._finished = True
+        if self.error is None:
+            if self.size == 0:
+                self.error = 'Uploaded file is empty'
+            else:
+                try:
+                    self._parser.Parse(b'', True)
+                except (expat.ExpatError, ValueError) as e:
+                    self._reject(e)
+        self._file.flush()
+        return self.error is None
+
+    @property
+    def sha256(self):
+        return self._sha.hexdigest()
+
+    def save(self, destination):
+        """Move the received file into place (same filesystem, no copy)"""
+        self._file.close()
+        os.replace(self.path, destination)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    # File protocol used by werkzeug/FileStorage
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+class XlfUploadRequest(Request):
+    """Request class that streams XLF file parts into an XlfUploadSink"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if is_xlf_filename(filename):
+            return XlfUploadSink()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
+def cleanup_stale_uploads(max_age=3600):
+    """Remove partial uploads left behind by aborted requests"""
+    if not os.path.isdir(UPLOAD_DIR):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(UPLOAD_DIR):
+        path = os.path.join(UPLOAD_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except OSError:
+            pass
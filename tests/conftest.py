@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+
+SAMPLE_XLF = os.path.join(PROJECT_ROOT, 'jobs', '09f7dd11-9a2f-4a5a-a71d-a7bafaf26cfa', 'test.xlf')
+
+
+@pytest.fixture
+def catalog_db(tmp_path, monkeypatch):
+    """A fresh catalog instead of jobs/catalog.db"""
+    import catalog
+
+    monkeypatch.setattr(catalog, 'CATALOG_PATH', str(tmp_path / 'catalog.db'))
+    monkeypatch.setattr(catalog, '_schema_ready', False)
+    return catalog
+
+
+@pytest.fixture
+def memory_db(tmp_path, monkeypatch):
+    """A fresh translation memory instead of jobs/memory.db"""
+    import translation_memory
+
+    monkeypatch.setattr(translation_memory, 'MEMORY_PATH', str(tmp_path / 'memory.db'))
+    memory = translation_memory.TranslationMemory()
+    yield memory
+    memory.close()
+
+
+@pytest.fixture
+def search_db(tmp_path, monkeypatch):
+    """A fresh segment search index instead of jobs/search.db"""
+    import segment_search
+
+    monkeypatch.setattr(segment_search, 'SEARCH_PATH', str(tmp_path / 'search.db'))
+    return segment_search
+
+
+@pytest.fixture
+def mock_reviser(monkeypatch, memory_db):
+    """AI revisions run with the mock reviser (no API key) and a fresh translation memory"""
+    import ai_revision
+
+    monkeypatch.setenv('GEMINI_API_KEY', '')
+    monkeypatch.setattr(ai_revision.time, 'sleep', lambda seconds: None)
+    return ai_revision
@@ -0,0 +1,46 @@
+import json
+import types
+
+
+class FakeModel:
+    """Gives the queued answers in turn"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def generate_content(self, contents):
+        self.calls.append(list(contents))
+        return types.SimpleNamespace(text=json.dumps(self.answers.pop(0)), usage_metadata=None)
+
+
+def reviser_with(mock_reviser, model):
+    reviser = mock_reviser.LLMReviser()
+    reviser.model = model
+    reviser.model_name = 'fake'
+    return reviser
+
+
+INVALID = {'revised_text': 'Texte', 'error_codes': ['XX-9'], 'comment': 'c', 'confidence_score': 80}
+VALID = {'revised_text': 'Le texte', 'error_codes': ['LQ-0.5'], 'comment': 'Article', 'confidence_score': 80}
+
+
+def test_invalid_answer_is_asked_again(mock_reviser):
+    model = FakeModel(INVALID, VALID)
+    result = reviser_with(mock_reviser, model).revise('The text', 'Texte', '1')
+    assert len(model.calls) == 2
+    assert result['revised_text'] == 'Le texte'
+    assert 'error' not in result
+    # The re-ask carries the rejected answer and what is wrong with it
+    _, rejected, reask = model.calls[1]
+    assert rejected == {'role': 'model', 'parts': [json.dumps(INVALID)]}
+    assert 'unknown error code(s) XX-9' in reask['parts'][0]
+
+
+def test_no_reasks_gives_a_failed_result(mock_reviser, monkeypatch):
+    monkeypatch.setattr(mock_reviser, 'MAX_REASKS', 0)
+    model = FakeModel(INVALID)
+    result = reviser_with(mock_reviser, model).revise('The text', 'Texte', '1')
+    assert len(model.calls) == 1
+    assert 'unknown error code' in result['error']
+    assert result['revised_text'] == 'Texte'
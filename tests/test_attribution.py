@@ -0,0 +1,43 @@
+from conftest import SAMPLE_XLF
+
+
+def test_rules_are_validated():
+    from attribution import validate_rule
+
+    assert validate_rule({'role': 'translator', 'kind': 'range', 'person': 'Ana', 'min_id': 1, 'max_id': 9}) is None
+    assert validate_rule({'role': 'reviewer', 'kind': 'meta', 'person': 'Ben', 'pattern': 'vendor-b'}) is None
+    assert validate_rule({'role': 'owner', 'kind': 'range', 'person': 'Ana'}).startswith('role must be')
+    assert validate_rule({'role': 'translator', 'kind': 'range', 'person': 'Ana', 'min_id': 9, 'max_id': 1}) == \
+        'min_id is greater than max_id'
+    assert validate_rule({'role': 'translator', 'kind': 'range', 'person': 'Ana', 'min_id': True, 'max_id': 1}) == \
+        'A range rule needs integer min_id and max_id'
+    assert validate_rule({'role': 'translator', 'kind': 'meta', 'person': ' '}) == 'Invalid person'
+
+
+def test_first_matching_rule_of_each_role_wins(catalog_db):
+    from attribution import add_rule, attribute, delete_rule, load_rules
+
+    first = add_rule({'role': 'translator', 'kind': 'range', 'person': ' Ana ', 'min_id': 100, 'max_id': 200})
+    add_rule({'role': 'translator', 'kind': 'meta', 'person': 'Chloé', 'pattern': 'Vendor-C'})
+    add_rule({'role': 'reviewer', 'kind': 'meta', 'person': 'Ben', 'pattern': 'vendor-c'})
+    rules = load_rules()
+    assert first['person'] == 'Ana'
+
+    assert attribute(rules, '150', ['job for VENDOR-C']) == {'translator': 'Ana', 'reviewer': 'Ben'}
+    assert attribute(rules, '250', ['job for vendor-c']) == {'translator': 'Chloé', 'reviewer': 'Ben'}
+    assert attribute(rules, '12-1', []) == {}
+
+    assert delete_rule(first['id'])
+    assert not delete_rule(first['id'])
+    assert attribute(load_rules(), '150', []) == {}
+
+
+def test_rules_only_fill_in_segments_the_xlf_leaves_unattributed(catalog_db):
+    from attribution import add_rule
+    from create_revision_table import parse_xlf_file
+
+    add_rule({'role': 'translator', 'kind': 'range', 'person': 'Ana', 'min_id': 4778127242, 'max_id': 4778127243})
+    translations = {t['matecat_id']: t for t in parse_xlf_file(SAMPLE_XLF)}
+    assert translations['4778127242']['translator'] == 'Ana'
+    assert translations['4778127243']['translator'] == 'Ana'
+    assert translations['4778127244']['translator'] == ''
@@ -0,0 +1,57 @@
+def segment(matecat_id, source, target, new_target='', code='', comment=''):
+    return {'matecat_id': matecat_id, 'source': source, 'target': target, 'new_target': new_target,
+            'code': code, 'comment': comment}
+
+
+def test_minority_translations_of_a_source_are_flagged():
+    from consistency import CONSISTENCY_CODE, flag_inconsistencies
+
+    translations = [
+        segment('1', 'Save changes', 'Enregistrer les modifications'),
+        segment('2', 'save  CHANGES', 'Sauver les modifications', code='ST-0.5'),
+        segment('3', 'Save changes', 'Enregistrer les  Modifications'),
+        # (a rule revision counts as the delivered translation)
+        segment('4', 'Save changes', 'Sauver', new_target='Enregistrer les modifications'),
+    ]
+    assert flag_inconsistencies(translations) == 1
+
+    assert [t['code'] for t in translations] == ['', f'ST-0.5, {CONSISTENCY_CODE}', '', '']
+    assert translations[1]['comment'] == ('Terminology Minor: Inconsistent translation - the same source is '
+                                          'translated "Enregistrer les modifications" in 3 other segment(s) '
+                                          '(1, 3, 4)')
+
+
+def test_ties_go_to_the_translation_seen_first():
+    from consistency import CONSISTENCY_CODE, flag_inconsistencies
+
+    translations = [
+        segment('1', 'Open', 'Ouvrir'),
+        segment('2', 'Open', 'Ouvrez'),
+        segment('3', 'Open', 'Ouvrez'),
+        segment('4', 'Open', 'Ouvrir'),
+    ]
+    flag_inconsistencies(translations)
+    assert [bool(t['code']) for t in translations] == [False, True, True, False]
+    assert all(t['code'] == CONSISTENCY_CODE for t in translations[1:3])
+    assert '"Ouvrir" in 2 other segment(s) (1, 4)' in translations[1]['comment']
+
+
+def test_a_translation_shared_by_sources_gets_a_comment_only():
+    from consistency import flag_inconsistencies
+
+    translations = [
+        segment('1', 'Close', 'Fermer'),
+        segment('2', 'Shut', 'Fermer'),
+        segment('3', 'Shut', 'Fermer', comment='Checked'),
+        # Sources without letters (numbers, placeholders) are left alone
+        segment('4', '42', '42'),
+        segment('5', '{1}', '42'),
+    ]
+    assert flag_inconsistencies(translations) == 3
+
+    assert [t['code'] for t in translations] == [''] * 5
+    assert translations[0]['comment'] == ('Consistency: the same translation is used for a different source in '
+                                          'segment(s) 2, 3')
+    assert translations[2]['comment'] == ('Checked | Consistency: the same translation is used for a different '
+                                          'source in segment(s) 1')
+    assert translations[3]['comment'] == translations[4]['comment'] == ''
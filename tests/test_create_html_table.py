@@ -0,0 +1,57 @@
+import csv
+
+from conftest import SAMPLE_XLF
+
+
+def process(tmp_path):
+    from create_html_table import create_html_table
+    from create_revision_table import parse_xlf_file, write_revision_table
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    html_path = str(tmp_path / 'revision_table.html')
+    write_revision_table(parse_xlf_file(SAMPLE_XLF), csv_path)
+    return csv_path, html_path, create_html_table(csv_path, html_path, 'job')
+
+
+def read_rows(csv_path):
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def write_rows(csv_path, fieldnames, rows):
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_revise_after_process_reuses_unchanged_rows(tmp_path, catalog_db, mock_reviser):
+    from create_html_table import create_html_table
+
+    csv_path, html_path, first = process(tmp_path)
+    assert first['reused'] == 0
+
+    stats = mock_reviser.revise_csv_with_ai(csv_path, csv_path)
+    _, rows = read_rows(csv_path)
+    second = create_html_table(csv_path, html_path, 'job')
+
+    # Only rows the revision wrote to are rendered again
+    assert second['rendered'] == stats['revised']
+    assert second['reused'] == len(rows) - stats['revised']
+
+
+def test_inserted_row_keeps_later_fragments(tmp_path, catalog_db):
+    from create_html_table import create_html_table
+
+    csv_path, html_path, _ = process(tmp_path)
+    fieldnames, rows = read_rows(csv_path)
+    inserted = dict(rows[0], **{'ID Matecat': 'new-segment', 'Target': 'Texte ajouté'})
+    write_rows(csv_path, fieldnames, [inserted] + rows)
+
+    result = create_html_table(csv_path, html_path, 'job')
+    assert result == {'rendered': 1, 'reused': len(rows)}
+
+    with open(html_path, 'r', encoding='utf-8') as f:
+        page = f.read()
+    assert page.count('Texte ajouté') == 1
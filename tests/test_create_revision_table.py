@@ -0,0 +1,27 @@
+import csv
+
+import pytest
+
+from conftest import SAMPLE_XLF
+
+
+def test_interrupted_write_leaves_the_previous_table(tmp_path, catalog_db, monkeypatch):
+    import tasks
+    from create_revision_table import parse_xlf_file, write_revision_table
+
+    translations = parse_xlf_file(SAMPLE_XLF)
+    csv_path = tmp_path / 'revision_table.csv'
+    write_revision_table(translations, str(csv_path))
+    before = csv_path.read_bytes()
+
+    written = []
+
+    def writerow(self, row):
+        written.append(row)
+        if len(written) == 10:
+            raise tasks.TaskTimeout('Time limit of 300 seconds exceeded')
+
+    monkeypatch.setattr(csv.DictWriter, 'writerow', writerow)
+    with pytest.raises(tasks.TaskTimeout):
+        write_revision_table(translations, str(csv_path))
+    assert csv_path.read_bytes() == before
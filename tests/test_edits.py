@@ -0,0 +1,31 @@
+def test_stale_version_comes_back_as_a_conflict(catalog_db):
+    from edits import apply_edits, job_edits
+
+    applied, conflicts = apply_edits('job', [{'segment': '12-ai', 'text': 'Première', 'version': 0}])
+    assert applied == [{'segment': '12-ai', 'version': 1}] and conflicts == []
+
+    # Two reviewers both edited version 1: the second one loses
+    applied, _ = apply_edits('job', [{'segment': '12-ai', 'text': 'Deuxième', 'version': 1}])
+    assert applied == [{'segment': '12-ai', 'version': 2}]
+    applied, conflicts = apply_edits('job', [{'segment': '12-ai', 'text': 'Troisième', 'version': 1},
+                                             {'segment': '13-xlf', 'text': 'Autre', 'version': 0}])
+    assert applied == [{'segment': '13-xlf', 'version': 1}]
+    assert conflicts == [{'segment': '12-ai', 'text': 'Deuxième', 'version': 2}]
+
+    # A first edit racing another first edit conflicts too
+    _, conflicts = apply_edits('job', [{'segment': '13-xlf', 'text': 'Encore', 'version': 0}])
+    assert conflicts == [{'segment': '13-xlf', 'text': 'Autre', 'version': 1}]
+    assert job_edits('job') == {'12-ai': {'text': 'Deuxième', 'version': 2},
+                                '13-xlf': {'text': 'Autre', 'version': 1}}
+    assert job_edits('other-job') == {}
+
+
+def test_malformed_batches_are_rejected():
+    from edits import MAX_BATCH, validate_changes
+
+    assert validate_changes([{'segment': '1-ai', 'text': '', 'version': 0}]) is None
+    assert validate_changes([]) == 'Expected a non-empty list of edits'
+    assert validate_changes([{'segment': '1-ai', 'text': 'x', 'version': 0}] * (MAX_BATCH + 1)) == \
+        f'At most {MAX_BATCH} edits per request'
+    assert validate_changes([{'segment': '1-ai', 'text': 'x', 'version': True}]) == 'Invalid version for segment 1-ai'
+    assert validate_changes([{'segment': '1-ai', 'text': None, 'version': 1}]) == 'Invalid text for segment 1-ai'
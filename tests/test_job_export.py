@@ -0,0 +1,79 @@
+import csv
+import html
+import io
+import json
+import re
+import zipfile
+
+# Columns of the export the table built in the browser before the server export
+BROWSER_EXPORT_COLUMNS = ['ID Matecat', 'State', 'Source', 'Target', 'XLF Revision', 'AI Revision', 'Error Code',
+                          'Comment']
+
+ROWS = [
+    {'ID Matecat': '101', 'State': 'Translated', 'Source': 'Open the <ph id="1"/> menu',
+     'Target': 'Ouvrez le menu <ph id="1"/>', 'New target': 'Ouvrez le <ph id="1"/> menu', 'AI Revision': '',
+     'Code': 'TE-1,ST-0.5', 'Comment': 'Word order &amp; tags'},
+    {'ID Matecat': '102', 'State': 'FINAL', 'Source': 'Save', 'Target': 'Sauver', 'New target': '',
+     'AI Revision': 'Enregistrer', 'Code': 'TE-2', 'Comment': ''},
+    {'ID Matecat': '103', 'State': 'Translated', 'Source': 'Share', 'Target': 'Partager', 'New target': '',
+     'AI Revision': '', 'Code': '', 'Comment': ''},
+]
+
+
+def write_job(tmp_path):
+    csv_path = str(tmp_path / 'revision_table.csv')
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+    return csv_path
+
+
+def export(csv_path, export_format, **filters):
+    from job_export import RowFilter, stream_export
+
+    return b''.join(stream_export(csv_path, 'job', export_format, RowFilter(**filters)))
+
+
+def xlsx_rows(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    return [[html.unescape(cell) for cell in re.findall(r'<t xml:space="preserve">(.*?)</t>', row)]
+            for row in re.findall(r'<row>(.*?)</row>', sheet)]
+
+
+def test_every_format_has_the_browser_export_columns_and_rows(tmp_path, catalog_db):
+    from edits import apply_edits
+
+    csv_path = write_job(tmp_path)
+    apply_edits('job', [{'segment': '102-ai', 'text': 'Enregistrez', 'version': 0},
+                        # (no AI revision on this row: the edit is not exported)
+                        {'segment': '103-ai', 'text': 'Ignoré', 'version': 0}])
+
+    rows = list(csv.reader(io.StringIO(export(csv_path, 'csv').decode('utf-8-sig'))))
+    assert rows[0] == BROWSER_EXPORT_COLUMNS
+    assert rows[1:] == [
+        ['101', 'translated', 'Open the  menu', 'Ouvrez le menu ', 'Ouvrez le  menu', '', 'TE-1, ST-0.5',
+         'Word order & tags'],
+        ['102', 'final', 'Save', 'Sauver', '', 'Enregistrez', 'TE-2', ''],
+        ['103', 'translated', 'Share', 'Partager', '', '', '', ''],
+    ]
+
+    lines = export(csv_path, 'jsonl').decode('utf-8').splitlines()
+    assert [list(json.loads(line)) for line in lines] == [BROWSER_EXPORT_COLUMNS] * 3
+    assert [list(json.loads(line).values()) for line in lines] == rows[1:]
+
+    assert xlsx_rows(export(csv_path, 'xlsx')) == rows
+
+
+def test_export_applies_the_table_filters(tmp_path, catalog_db):
+    csv_path = write_job(tmp_path)
+
+    def ids(**filters):
+        return [row[0] for row in csv.reader(io.StringIO(export(csv_path, 'csv', **filters).decode('utf-8-sig')))][1:]
+
+    assert ids(stat='error-codes') == ['101', '102']
+    assert ids(code='TE-2') == ['102']
+    assert ids(state='translated', min_id=102) == ['103']
+    assert ids(search='ENREGISTRER') == ['102']
+    assert ids(stat='xlf-revisions', max_id=101) == ['101']
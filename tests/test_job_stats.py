@@ -0,0 +1,45 @@
+from conftest import SAMPLE_XLF
+
+
+def test_stats_follow_process_and_revise_without_rescanning(tmp_path, catalog_db, mock_reviser, monkeypatch):
+    from create_revision_table import parse_xlf_file, write_revision_table
+    from job_stats import adjust_job_stats, count_csv_stats, job_stats, load_job_stats, save_job_stats
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    catalog_db.register_job('job', 'test.xlf', 'sha', 1, '2026-01-01T00:00:00')
+    stats, _, _ = write_revision_table(parse_xlf_file(SAMPLE_XLF), csv_path)
+    assert stats == count_csv_stats(csv_path)
+    assert stats['total'] > 0 and stats['ai_revised'] == 0
+
+    assert load_job_stats('job') is None
+    save_job_stats('job', stats)
+
+    def revise(self, source, target):
+        # Every segment with an "e" gets a major error
+        revised = 'e' in target
+        return {'revised_text': target + ' (revu)' if revised else target, 'has_revision': revised,
+                'error_codes': ['TE-2'] if revised else [], 'comment': None, 'confidence': 50}
+
+    monkeypatch.setattr(mock_reviser.LLMReviser, '_mock_revision', revise)
+    result = mock_reviser.revise_csv_with_ai(csv_path, csv_path)
+    adjust_job_stats('job', result['stat_changes'])
+    assert load_job_stats('job') == count_csv_stats(csv_path)
+    assert load_job_stats('job')['ai_revised'] == result['revised'] > 0
+    assert load_job_stats('job')['major_errors'] > stats['major_errors']
+    assert job_stats('job', csv_path) == load_job_stats('job')
+
+
+def test_jobs_processed_before_stored_stats_are_counted_once(tmp_path, catalog_db, monkeypatch):
+    import job_stats
+    from create_revision_table import parse_xlf_file, write_revision_table
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    catalog_db.register_job('job', 'test.xlf', 'sha', 1, '2026-01-01T00:00:00')
+    stats, _, _ = write_revision_table(parse_xlf_file(SAMPLE_XLF), csv_path)
+
+    assert job_stats.job_stats('job', csv_path) == stats
+    monkeypatch.setattr(job_stats, 'count_csv_stats', lambda path: None)
+    assert job_stats.job_stats('job', csv_path) == stats
+    # (no-op on jobs whose counts were never stored)
+    job_stats.adjust_job_stats('unknown', stats)
+    assert job_stats.load_job_stats('unknown') is None
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+GLOSSARY = """Name,Terme français,Notes
+Workspace,Espace de travail,
+Trusted files,Fichiers de confiance,Pas « fiables »
+Files,Fichiers,
+"""
+JOURNAL = """Apprentissage,Catégorie,Date session,Décision,Exemples,Notes,Statut,Tags
+Confiance,Terminologie,2025-01-10,Traduire trusted par de confiance,EN: Trusted source → source de confiance,,Actif,
+Ancien,Style,2024-06-01,Ne plus utiliser,Sign in → se connecter,,Obsolète,
+"""
+RULES = """Rule N.,Category,Rule,English source (optional),Dos,Don'ts
+1,Punctuation,Espace insécable avant les deux-points,,Nom :,Nom:
+"""
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Knowledge sources in tmp_path (the artifact goes to tmp_path/knowledge.db)"""
+    import knowledge
+
+    files = {
+        'instructions': ('knowledge_base.txt', 'Review the French translation.'),
+        'glossary': ('Notion Glossaire abc.csv', GLOSSARY),
+        'rules': ('Enterprise Style Guide fr - General Rules.csv', RULES),
+        'journal': ("Notion Journal d'apprentissages abc.csv", JOURNAL),
+    }
+    for name, (filename, content) in files.items():
+        (tmp_path / filename).write_text(content, encoding='utf-8')
+    monkeypatch.setattr(knowledge, 'SOURCES', {name: str(tmp_path / filename)
+                                               for name, (filename, _) in files.items()})
+    monkeypatch.setattr(knowledge, '_loaded', None)
+    return tmp_path
+
+
+def test_the_artifact_indexes_the_sources(sources):
+    from knowledge import load_knowledge
+
+    knowledge = load_knowledge(str(sources / 'knowledge.db'))
+    assert knowledge.instructions == 'Review the French translation.'
+    assert knowledge.rule(1)['donts'] == 'Nom:'
+
+    # Longest terms win over the words they contain, case and apostrophes ignored
+    terms = knowledge.terms_in('Move TRUSTED files to the workspace')
+    assert [t['term'] for t in terms] == ['Trusted files', 'Files', 'Workspace']
+    assert knowledge.terms_in('Nothing to see') == []
+
+    # Only active decisions, matched on the English side of their examples
+    assert [e['title'] for e in knowledge.journal_for('Add a trusted source')] == ['Confiance']
+    assert knowledge.journal_for('Sign in to continue') == []
+
+    context = knowledge.segment_context('Add a trusted source to the workspace')
+    assert context.splitlines() == [
+        'GLOSSARY TERMS IN THIS SOURCE (official fr_FR translations):',
+        '- Workspace → Espace de travail',
+    ]
+    assert knowledge.segment_context('Nothing to see') == ''
+
+
+def test_examples_are_the_active_corrections_sharing_rare_words(sources):
+    from knowledge import load_knowledge
+
+    (sources / "Notion Journal d'apprentissages abc.csv").write_text(JOURNAL + (
+        'Workspace,Terminologie,2025-02-01,Workspace se traduit espace de travail,'
+        'Open the workspace → Ouvrir l’espace de travail,,Actif,\n'
+        'Bouton,Style,2025-02-02,Verbe à l’infinitif sur les boutons,Save → Enregistrer,,Actif,\n'
+    ), encoding='utf-8')
+    knowledge = load_knowledge(str(sources / 'knowledge.db'))
+
+    examples = knowledge.examples_for('Share the workspace', 'Partager l’espace de travail')
+    assert [e['title'] for e in examples] == ['Workspace']
+    # An example phrase found in the source ranks first; inactive entries are never picked
+    examples = knowledge.examples_for('Add a trusted source to the workspace')
+    assert [e['title'] for e in examples] == ['Confiance', 'Workspace']
+    assert knowledge.examples_for('Sign in') == []
+    assert len(knowledge.examples_for('trusted workspace save', limit=1)) == 1
+
+
+def test_a_changed_source_rebuilds_with_a_new_version(sources):
+    from knowledge import is_stale, load_knowledge
+
+    path = str(sources / 'knowledge.db')
+    first = load_knowledge(path)
+    assert not is_stale(path)
+    assert load_knowledge(path) is first
+
+    glossary = sources / 'Notion Glossaire abc.csv'
+    glossary.write_text(GLOSSARY + 'Sign in,Se connecter,\n', encoding='utf-8')
+    stat = os.stat(glossary)
+    os.utime(glossary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert is_stale(path)
+
+    second = load_knowledge(path)
+    assert second.version != first.version
+    assert [t['translation'] for t in second.terms_in('Sign in')] == ['Se connecter']
+
+
+def test_the_version_depends_on_the_content_only(sources):
+    from knowledge import build_knowledge
+
+    first = build_knowledge(str(sources / 'a.db'))
+    assert build_knowledge(str(sources / 'b.db')) == first
+
+    (sources / 'knowledge_base.txt').write_text('Review it again.', encoding='utf-8')
+    assert build_knowledge(str(sources / 'c.db')) != first
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+TRANSLATION = 'Cliquez sur <b>Sauver</b>.'
+
+
+def answer(revised_text='Cliquez sur <b>Enregistrer</b>.', error_codes=('TE-2',), comment='Glossary term',
+           confidence_score=90):
+    return {'revised_text': revised_text, 'error_codes': list(error_codes), 'comment': comment,
+            'confidence_score': confidence_score}
+
+
+def problems(data):
+    from llm_output import InvalidOutput, validate_output
+
+    with pytest.raises(InvalidOutput) as e:
+        validate_output(data, TRANSLATION)
+    return e.value.problems
+
+
+def test_fenced_or_wrapped_answers_are_parsed():
+    from llm_output import InvalidOutput, parse_output
+
+    text = json.dumps(answer())
+    assert parse_output(f'```json\n{text}\n```') == answer()
+    assert parse_output(f'Here is the review: {text} Hope it helps.') == answer()
+    for text in ('', 'No errors.', '[1, 2]', '{"revised_text": '):
+        with pytest.raises(InvalidOutput):
+            parse_output(text)
+
+
+def test_a_valid_answer_becomes_a_result():
+    from llm_output import validate_output
+
+    result = validate_output(answer(error_codes=[' te - 2 ', 'ST-0.5']), TRANSLATION)
+    assert result == {'revised_text': 'Cliquez sur <b>Enregistrer</b>.', 'has_revision': True,
+                      'error_codes': ['TE-2', 'ST-0.5'], 'comment': 'Glossary term', 'confidence': 90}
+
+    # No errors: the translation comes back unchanged, without codes or comment
+    result = validate_output(answer(revised_text=TRANSLATION, error_codes=(), comment=None), TRANSLATION)
+    assert result['has_revision'] is False and result['comment'] is None
+
+
+def test_every_problem_is_listed():
+    assert problems(answer(error_codes=['TE-1'], confidence_score=150)) == [
+        'unknown error code(s) TE-1 (allowed: TE-2, TE-0.5, TC-0.5, LQ-0.5, ST-0.5)',
+        '"confidence_score" must be a number from 0 to 100',
+    ]
+    assert problems(answer(revised_text='Cliquez sur Enregistrer.', comment='')) == [
+        '"revised_text" must keep every tag of the translation exactly as it is, in the same order '
+        '(missing </b> <b>)',
+        'a "comment" explaining the errors is required when there are error codes',
+    ]
+    assert problems(answer(revised_text=TRANSLATION))[0].startswith('error codes were given but')
+    assert problems(answer(error_codes=()))[0].startswith('"revised_text" was changed without an error code')
+    assert problems(answer(revised_text=' ', confidence_score=True)) == [
+        '"revised_text" must be the non-empty French text',
+        '"confidence_score" must be a number from 0 to 100',
+    ]
@@ -0,0 +1,82 @@
+import types
+
+import pytest
+
+USAGE = types.SimpleNamespace(prompt_token_count=4000, candidates_token_count=100, cached_content_token_count=0)
+
+
+def test_failed_revise_run_keeps_its_spend(tmp_path, catalog_db, monkeypatch):
+    import ai_revision
+    import tasks
+    from llm_usage import job_usage
+
+    (tmp_path / 'job').mkdir()
+    (tmp_path / 'job' / 'revision_table.csv').write_text('ID Matecat,Source,Target\n', encoding='utf-8')
+    monkeypatch.setattr(tasks, 'JOBS_DIR', str(tmp_path))
+
+    def failing_revise(csv_path, output_path, usage=None, **kwargs):
+        for _ in range(3):
+            usage.record_call('review', 'gemini-2.0-flash', USAGE)
+        raise tasks.TaskTimeout('Time limit of 1 seconds exceeded')
+
+    monkeypatch.setattr(ai_revision, 'revise_csv_with_ai', failing_revise)
+    with pytest.raises(tasks.TaskTimeout):
+        tasks.run_revise('job')
+
+    total = job_usage('job')['total']
+    assert total['calls'] == 3
+    assert total['prompt_tokens'] == 12000
+    assert total['cost'] > 0
+
+
+def test_running_meter_is_flushed_and_saved_once(catalog_db):
+    from llm_usage import FLUSH_EVERY, UsageMeter, job_usage
+
+    meter = UsageMeter('job')
+    for _ in range(FLUSH_EVERY):
+        meter.record_call('review', 'gemini-2.0-flash', USAGE)
+    # Written without waiting for the end of the run
+    assert job_usage('job')['total']['calls'] == FLUSH_EVERY
+
+    meter.record_call('reask', 'gemini-2.0-flash', USAGE)
+    meter.save()
+    meter.save()
+    usage = job_usage('job')
+    assert usage['total']['calls'] == FLUSH_EVERY + 1
+    assert usage['total']['cost'] == pytest.approx(meter.snapshot()['cost'])
+
+
+def test_a_run_pauses_at_the_budget_and_resumes_there(tmp_path, catalog_db, mock_reviser, monkeypatch):
+    import csv
+    import json
+
+    from llm_usage import UsageMeter
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ID Matecat', 'Source', 'Target', 'New target', 'Code', 'Comment'])
+        writer.writerows([[str(i), f'Segment {i}', f'Segment {i} traduit', '', '', ''] for i in range(1, 4)])
+
+    calls = []
+
+    def generate_content(contents):
+        calls.append(contents)
+        answer = {'revised_text': 'Révisé', 'error_codes': ['TE-2'], 'comment': 'Fixed', 'confidence_score': 90}
+        return types.SimpleNamespace(text=json.dumps(answer), usage_metadata=USAGE)
+
+    reviser = mock_reviser.LLMReviser()
+    reviser.model, reviser.model_name = types.SimpleNamespace(generate_content=generate_content), 'gemini-2.0-flash'
+    monkeypatch.setattr(mock_reviser, 'LLMReviser', lambda: reviser)
+
+    # One call spends the budget: the second row is where the run stops
+    usage = UsageMeter('job')
+    usage.budget = 0.0001
+    stats = mock_reviser.revise_csv_with_ai(csv_path, csv_path, usage=usage)
+    assert stats['paused_at'] == 1 and len(calls) == 1
+    assert stats['usage']['calls'] == 1
+
+    stats = mock_reviser.revise_csv_with_ai(csv_path, csv_path, usage=UsageMeter('job'), start=stats['paused_at'])
+    assert stats['paused_at'] is None and len(calls) == 3
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        assert [row['AI Revision'] for row in csv.DictReader(f)] == ['Révisé'] * 3
@@ -0,0 +1,76 @@
+import csv
+
+import pytest
+
+from conftest import SAMPLE_XLF
+
+FIELDS = ['ID Matecat', 'Source', 'Code', 'File', 'Translator', 'Words']
+
+
+def write_rows(csv_path, rows):
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(dict(zip(FIELDS, row)) for row in rows)
+
+
+def test_points_come_from_the_code_names():
+    from quality_score import code_points, segment_words
+
+    assert code_points('TE-2, LQ-0.5,ST-1') == 3.5
+    assert code_points('Terminology (TE) - see comment') == 0
+    assert code_points('') == 0
+    assert segment_words({'Words': '12', 'Source': 'Two words'}) == 12
+    # Older CSVs without a word count: the source's words, tags left out
+    assert segment_words({'Source': 'Open the <ph id="1"/> menu'}) == 3
+
+
+def test_scores_per_job_file_and_translator(tmp_path, catalog_db, monkeypatch):
+    import quality_score
+
+    monkeypatch.setattr(quality_score, 'PASS_THRESHOLD', 10)
+    first = str(tmp_path / 'first.csv')
+    write_rows(first, [
+        ('1', 'a', 'TE-2', 'ui.json', 'Ana', '100'),
+        ('2', 'b', '', 'ui.json', 'Ben', '300'),
+        ('3', 'c', 'LQ-0.5, ST-1', 'help.md', 'Ana', '100'),
+    ])
+    second = str(tmp_path / 'second.csv')
+    write_rows(second, [('1', 'a', 'TE-2, TE-2', 'ui.json', 'Ana', '100')])
+
+    scores = quality_score.job_quality('first', first)
+    assert scores['job'] == {'words': 500, 'points': 3.5, 'per_1000_words': 7.0, 'passed': True}
+    assert scores['file']['help.md'] == {'words': 100, 'points': 1.5, 'per_1000_words': 15.0, 'passed': False}
+    assert scores['translator']['Ben']['per_1000_words'] == 0
+
+    quality_score.job_quality('second', second)
+    translators = quality_score.translator_quality()
+    assert translators['Ana'] == {'words': 300, 'points': 7.5, 'per_1000_words': 25.0, 'passed': False, 'jobs': 2}
+
+    quality_score.forget_job_quality('second')
+    assert quality_score.translator_quality()['Ana']['jobs'] == 1
+
+
+def test_totals_follow_process_and_revise_without_rescanning(tmp_path, catalog_db, mock_reviser, monkeypatch):
+    import quality_score
+    from create_revision_table import parse_xlf_file, write_revision_table
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    _, quality, _ = write_revision_table(parse_xlf_file(SAMPLE_XLF), csv_path)
+    assert quality == quality_score.count_csv_quality(csv_path)
+    quality_score.save_job_quality('job', quality)
+
+    def revise(self, source, target):
+        revised = 'e' in target
+        return {'revised_text': target + ' (revu)' if revised else target, 'has_revision': revised,
+                'error_codes': ['TE-2'] if revised else [], 'comment': None, 'confidence': 50}
+
+    monkeypatch.setattr(mock_reviser.LLMReviser, '_mock_revision', revise)
+    result = mock_reviser.revise_csv_with_ai(csv_path, csv_path)
+    quality_score.adjust_job_quality('job', result['quality_changes'])
+
+    recount = quality_score.count_csv_quality(csv_path)
+    stored = quality_score.job_quality('job', csv_path)
+    assert stored['job']['points'] == pytest.approx(recount[('job', '')][1])
+    assert stored['job']['points'] > quality[('job', '')][1]
+    assert stored['job']['words'] == pytest.approx(quality[('job', '')][0])
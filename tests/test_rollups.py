@@ -0,0 +1,67 @@
+import csv
+
+import pytest
+
+FIELDS = ['ID Matecat', 'Source', 'New target', 'AI Revision', 'Code', 'Translator', 'Reviewer', 'Words']
+
+
+def write_rows(csv_path, rows):
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(dict(zip(FIELDS, row)) for row in rows)
+
+
+@pytest.fixture
+def jobs(tmp_path, catalog_db, monkeypatch):
+    """Two jobs of different weeks; the second has no rollups yet"""
+    import rollups
+
+    monkeypatch.setattr(rollups, 'JOBS_DIR', str(tmp_path))
+    catalog_db.register_job('first', 'first.xlf', 'a', 1, '2025-02-11T10:00:00')
+    catalog_db.register_job('second', 'second.xlf', 'b', 1, '2025-02-18T10:00:00')
+    for job_id, rows in (
+        ('first', [('1', 'a', 'Nouveau', '', 'TE-2', 'Ana', 'Ben', '100'),
+                   ('2', 'b', '', '', '', 'Ana', '', '300')]),
+        ('second', [('1', 'a', '', 'Révisé', 'TE-2, LQ-0.5', 'Ana', 'Ben', '100'),
+                    ('2', 'b', '', '', '', '', '', '100')]),
+    ):
+        (tmp_path / job_id).mkdir()
+        write_rows(str(tmp_path / job_id / 'revision_table.csv'), rows)
+    rollups.save_job_rollups('first', rollups.count_csv_rollups(str(tmp_path / 'first' / 'revision_table.csv')))
+    return rollups
+
+
+def test_reports_read_stored_rollups_only(jobs):
+    report = {person['person']: person for person in jobs.people_report('translator')}
+    assert list(report) == ['Ana']
+    assert report['Ana']['total'] == {'words': 400, 'points': 2, 'per_1000_words': 5.0, 'passed': True,
+                                      'segments': 2, 'revised': 1, 'revision_rate': 0.5, 'errors': {'TE-2': 1}}
+
+    # Jobs processed before rollups existed are counted by the backfill, not by reports
+    jobs.backfill_rollups()
+    report = {person['person']: person for person in jobs.people_report('translator')}
+    assert list(report) == ['(unassigned)', 'Ana']
+    assert list(report['Ana']['weeks']) == ['2025-W07', '2025-W08']
+    assert report['Ana']['weeks']['2025-W08']['errors'] == {'LQ-0.5': 1, 'TE-2': 1}
+    assert report['(unassigned)']['total']['segments'] == 1
+
+    reviewers = jobs.people_report('reviewer', since='2025-W08')
+    assert [(person['person'], person['total']['segments']) for person in reviewers] == \
+        [('(unassigned)', 1), ('Ben', 1)]
+
+
+def test_rewritten_rows_adjust_the_rollups(jobs):
+    before = {'Code': '', 'Translator': 'Ana', 'Reviewer': '', 'Words': '300'}
+    after = dict(before, **{'Code': 'ST-1', 'AI Revision': 'Révisé'})
+    changes = jobs.add_row(jobs.add_row({}, before, -1), after)
+    jobs.adjust_job_rollups('first', changes)
+
+    ana = jobs.people_report('translator')[0]
+    assert ana['person'] == 'Ana'
+    assert ana['total']['errors'] == {'ST-1': 1, 'TE-2': 1}
+    assert ana['total']['revised'] == 2
+    assert ana['total']['points'] == 3
+
+    jobs.forget_job_rollups('first')
+    assert jobs.people_report('translator') == []
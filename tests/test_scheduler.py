@@ -0,0 +1,41 @@
+import types
+
+import pytest
+
+
+@pytest.mark.parametrize('stage', ['process', 'revise'])
+def test_task_gets_its_stage_memory_limit(stage, tmp_path, catalog_db, monkeypatch):
+    import scheduler
+
+    (tmp_path / 'job').mkdir()
+    monkeypatch.setattr(scheduler, 'JOBS_DIR', str(tmp_path))
+    monkeypatch.setattr(scheduler, 'MEMORY_LIMITS', {'process': 2048, 'revise': 3072})
+    started = {}
+
+    def popen(args, env=None, **kwargs):
+        started['env'] = env
+        return types.SimpleNamespace(pid=1, wait=lambda: None)
+
+    monkeypatch.setattr(scheduler.subprocess, 'Popen', popen)
+    scheduler._spawn({'job_id': 'job', 'stage': stage, 'id': 'run'})
+    assert started['env']['COOLERCAT_TASK_MEMORY_MB'] == ('2048' if stage == 'process' else '3072')
+
+
+def test_task_over_its_memory_limit_fails(monkeypatch):
+    import signal
+    import time
+
+    import tasks
+
+    monkeypatch.setenv('COOLERCAT_TASK_MEMORY_MB', '100')
+    monkeypatch.setenv('COOLERCAT_TASK_TIME_LIMIT', '0')
+    monkeypatch.setattr(tasks, 'MEMORY_CHECK_INTERVAL', 0.01)
+    monkeypatch.setattr(tasks, 'resident_mb', lambda: 150)
+    previous = signal.getsignal(signal.SIGUSR1)
+    stop_watchdog = tasks.apply_limits()
+    try:
+        with pytest.raises(tasks.TaskMemoryExceeded, match='Memory limit of 100 MB exceeded'):
+            time.sleep(5)
+    finally:
+        stop_watchdog.set()
+        signal.signal(signal.SIGUSR1, previous)
@@ -0,0 +1,90 @@
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import PROJECT_ROOT, SAMPLE_XLF
+
+WORKER = os.path.join(PROJECT_ROOT, 'assets', 'js', 'search_worker.js')
+
+# Loads the worker in a sandbox, builds the index and answers every query
+HARNESS = """
+const fs = require('fs');
+const vm = require('vm');
+const input = JSON.parse(fs.readFileSync(0, 'utf-8'));
+const answers = [];
+const self = { postMessage: message => answers.push(Array.from(message.ids)) };
+vm.runInNewContext(fs.readFileSync(process.argv[1], 'utf-8'), { self, performance, Uint32Array, Float64Array });
+self.onmessage({ data: { type: 'build', rows: input.rows } });
+input.queries.forEach((query, seq) => self.onmessage({ data: { type: 'query', seq, query } }));
+process.stdout.write(JSON.stringify(answers));
+"""
+
+
+def scan(rows, query):
+    """The row-by-row filter the index replaces"""
+    matches = []
+    for i, (source, target, new_target, ai_revision, code, state, matecat_id) in enumerate(rows):
+        text = '\n'.join((t or '').lower() for t in (source, target, new_target, ai_revision))
+        digits = re.search(r'\d+', matecat_id or '')
+        if query['minId'] is not None or query['maxId'] is not None:
+            if not digits:
+                continue
+            if query['minId'] is not None and int(digits.group()) < query['minId']:
+                continue
+            if query['maxId'] is not None and int(digits.group()) > query['maxId']:
+                continue
+        if query['code'] and query['code'] not in code:
+            continue
+        if query['state'] and (state or '').lower() != query['state']:
+            continue
+        if query['stat'] == 'ai-revisions' and not ai_revision:
+            continue
+        if query['stat'] == 'xlf-revisions' and not new_target:
+            continue
+        if query['stat'] == 'error-codes' and not code.strip():
+            continue
+        if query['stat'] == 'major-errors' and 'TE-2' not in code:
+            continue
+        if query['search'] and query['search'] not in text:
+            continue
+        matches.append(i)
+    return matches
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs Node.js')
+def test_index_answers_like_a_row_scan():
+    from create_revision_table import parse_xlf_file
+
+    rng = random.Random(3)
+    rows = [[t['source'], t['target'], t['new_target'], t['target'].upper() if rng.random() < 0.2 else '',
+             rng.choice(['', 'TE-2', 'TE-1, ST-0.5', 'TG-2']), rng.choice(['Translated', 'Final', '']),
+             t['matecat_id'] if rng.random() < 0.9 else '']
+            for t in parse_xlf_file(SAMPLE_XLF)]
+    words = ' '.join(row[0] for row in rows).lower().split()
+    queries = []
+    for _ in range(60):
+        search = ''
+        if rng.random() < 0.7:
+            start = rng.randrange(len(words))
+            search = ' '.join(words[start:start + rng.randint(1, 3)])
+            if rng.random() < 0.3:
+                search = search[:rng.randint(1, len(search))]
+        queries.append({
+            'search': search,
+            'code': rng.choice(['', '', 'TE', 'TE-2']),
+            'state': rng.choice(['', '', 'translated', 'final']),
+            'minId': rng.choice([None, None, 0, 5000]),
+            'maxId': rng.choice([None, None, 10 ** 9]),
+            'stat': rng.choice(['', '', 'ai-revisions', 'xlf-revisions', 'error-codes', 'major-errors']),
+        })
+
+    result = subprocess.run(['node', '-e', HARNESS, WORKER], input=json.dumps({'rows': rows, 'queries': queries}),
+                            capture_output=True, text=True, check=True)
+    answers = json.loads(result.stdout)
+    for query, answer in zip(queries, answers):
+        assert answer == scan(rows, query), query
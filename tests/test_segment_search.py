@@ -0,0 +1,83 @@
+import csv
+import os
+
+FIELDS = ['ID Matecat', 'State', 'Source', 'Target', 'New target', 'AI Revision', 'Code', 'Comment']
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_job_segments_reads_sources_by_segment(tmp_path, catalog_db, search_db):
+    from segment_search import job_segments
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    write_csv(csv_path, [{'ID Matecat': str(i), 'Source': f'Source {i}', 'Target': f'Cible {i}'} for i in range(100)])
+
+    rows = job_segments('job', csv_path, ['3', '42', 'missing'])
+    assert sorted((row['matecat_id'], row['source']) for row in rows) == [('3', 'Source 3'), ('42', 'Source 42')]
+
+    # A rewritten CSV is indexed again before it is read
+    write_csv(csv_path, [{'ID Matecat': '3', 'Source': 'Changed', 'Code': 'TE-2'}])
+    os.utime(csv_path, ns=(1, 1))
+    rows = job_segments('job', csv_path, ['3'])
+    assert [(row['source'], row['code']) for row in rows] == [('Changed', 'TE-2')]
+
+
+def test_search_phrases_prefixes_and_filters(tmp_path, catalog_db, search_db):
+    from segment_search import index_job, search
+
+    csv_path = str(tmp_path / 'revision_table.csv')
+    write_csv(csv_path, [
+        {'ID Matecat': '1', 'State': 'Translated', 'Source': 'Share the page', 'Target': 'Partager la page'},
+        {'ID Matecat': '2', 'State': 'Final', 'Source': 'Page shared with you', 'Target': 'Page partagée',
+         'Code': 'TE-2'},
+        {'ID Matecat': '3', 'State': 'Translated', 'Source': 'The page is shared', 'Target': 'La page est partagée'},
+    ])
+    index_job('job', csv_path)
+
+    def ids(**query):
+        return sorted(hit['matecat_id'] for hit in search(**query))
+
+    assert ids(q='"la page"') == ['1', '3']
+    assert ids(q='partag*') == ['1', '2', '3']
+    # Accents are ignored
+    assert ids(q='partagee') == ['2', '3']
+    assert ids(q='page', code='TE-2') == ['2']
+    assert ids(state='final') == ['2']
+    assert ids(q='page', job_id='other') == []
+    assert all(hit['score'] is not None for hit in search(q='page'))
+    assert search(code='TE-2')[0]['score'] is None
+
+
+def test_index_is_kept_by_writes_and_edits_not_by_searches(tmp_path, catalog_db, search_db):
+    from edits import apply_edits
+    from segment_search import connect, index_edits, index_job, refresh_index, search
+
+    job_dir = tmp_path / 'jobs' / 'job'
+    job_dir.mkdir(parents=True)
+    csv_path = str(job_dir / 'revision_table.csv')
+    write_csv(csv_path, [{'ID Matecat': '1', 'Source': 'Save', 'Target': 'Sauver', 'AI Revision': 'Enregistrer'},
+                         {'ID Matecat': '2', 'Source': 'Open', 'Target': 'Ouvrir'}])
+    # Not indexed yet: searches do not scan the jobs
+    assert search(q='sauver') == []
+
+    conn = connect()
+    refresh_index(conn, str(tmp_path / 'jobs'))
+    conn.close()
+    assert [hit['matecat_id'] for hit in search(q='sauver')] == ['1']
+
+    edits = {'1-ai': 'Sauvegarder', '2-ai': 'Ouvrez'}
+    apply_edits('job', [{'segment': segment, 'text': text, 'version': 0} for segment, text in edits.items()])
+    index_edits('job', edits)
+    assert [hit['ai_revision'] for hit in search(q='sauvegarder')] == ['Sauvegarder']
+    assert search(q='enregistrer') == []
+    # (segment 2 has no AI revision for the edit to replace)
+    assert search(q='ouvrez') == []
+
+    # Re-indexing the CSV keeps the edits
+    index_job('job', csv_path)
+    assert [hit['matecat_id'] for hit in search(q='sauvegarder')] == ['1']
@@ -0,0 +1,102 @@
+import pytest
+
+
+@pytest.fixture
+def client(tmp_path, catalog_db, memory_db, search_db, monkeypatch):
+    import rollups
+    import scheduler
+
+    # (no dispatcher, index refresh or backfill thread in tests)
+    monkeypatch.setattr(scheduler, 'start_dispatcher', lambda: None)
+    monkeypatch.setattr(search_db, 'start_index_refresh', lambda: None)
+    monkeypatch.setattr(rollups, 'start_backfill', lambda: None)
+    import server
+
+    (tmp_path / 'job').mkdir()
+    monkeypatch.setattr(server, 'JOBS_DIR', str(tmp_path))
+    monkeypatch.setattr(server.time, 'sleep', lambda seconds: None)
+    return server.app.test_client()
+
+
+def test_progress_stream_closes_on_a_job_with_nothing_running(tmp_path, client, monkeypatch):
+    import server
+    from progress import write_progress
+
+    write_progress(str(tmp_path / 'job'), {'status': 'completed', 'percentage': 100})
+    monkeypatch.setattr(server, 'STREAM_TASK_CHECK_SECONDS', 0)
+    body = client.get('/api/jobs/job/progress/stream').get_data(as_text=True)
+    assert body.startswith(f'retry: {server.STREAM_RETRY_MS}\n\n')
+    # The finished snapshot of the previous run is not replayed
+    assert 'event: progress' not in body
+    assert body.endswith('event: idle\ndata: {}\n\n')
+
+
+def test_progress_stream_ends_at_its_maximum_lifetime(tmp_path, client, monkeypatch):
+    import server
+    from progress import write_progress
+
+    write_progress(str(tmp_path / 'job'), {'status': 'processing', 'percentage': 40})
+    monkeypatch.setattr(server, 'STREAM_MAX_SECONDS', 0)
+    body = client.get('/api/jobs/job/progress/stream').get_data(as_text=True)
+    # The client reconnects: no idle event
+    assert body == (f'retry: {server.STREAM_RETRY_MS}\n\n'
+                    'event: progress\ndata: {"status": "processing", "percentage": 40}\n\n')
+
+
+def test_progress_stream_stays_open_while_a_task_is_queued(tmp_path, client, catalog_db, monkeypatch):
+    import server
+
+    with catalog_db.transaction() as conn:
+        conn.execute("INSERT INTO tasks (id, job_id, stage, status, cost, enqueued_at) "
+                     "VALUES ('run', 'job', 'revise', 'queued', 0, 0)")
+    monkeypatch.setattr(server, 'STREAM_TASK_CHECK_SECONDS', 0)
+    monkeypatch.setattr(server, 'STREAM_MAX_SECONDS', 0.05)
+    body = client.get('/api/jobs/job/progress/stream').get_data(as_text=True)
+    assert body == f'retry: {server.STREAM_RETRY_MS}\n\n'
+
+
+def test_edit_conflicts_are_reported_with_the_current_text(client):
+    first = client.patch('/api/jobs/job/edits', json={'edits': [{'segment': '7-ai', 'text': 'A', 'version': 0}]})
+    assert first.get_json() == {'applied': [{'segment': '7-ai', 'version': 1}], 'conflicts': []}
+    stale = client.patch('/api/jobs/job/edits', json={'edits': [{'segment': '7-ai', 'text': 'B', 'version': 0}]})
+    assert stale.get_json() == {'applied': [], 'conflicts': [{'segment': '7-ai', 'text': 'A', 'version': 1}]}
+    assert client.patch('/api/jobs/job/edits', json={'edits': []}).status_code == 400
+    assert client.patch('/api/jobs/missing/edits', json={'edits': []}).status_code == 404
+
+
+def test_dashboard_job_list_is_built_once_until_a_job_changes(tmp_path, client, catalog_db, monkeypatch):
+    import server
+
+    (tmp_path / 'job' / 'test.xlf').write_text('<xliff/>')
+    (tmp_path / 'job' / 'revision_table.csv').write_text('ID Matecat,New target,AI Revision,Code\n'
+                                                         '1,Nouveau,,TE-2\n2,,Révisé,\n')
+    catalog_db.register_job('job', 'test.xlf', 'sha', 8, '2026-01-01T00:00:00')
+    counted = []
+    monkeypatch.setattr(server, 'job_stats', lambda job_id, csv_path: counted.append(csv_path) or {'total': 2})
+
+    def job_ids():
+        return [job['id'] for job in client.get('/api/dashboard').get_json()['jobs']]
+
+    assert job_ids() == ['job']
+    assert job_ids() == ['job']
+    assert len(counted) == 1
+
+    # A task rewrote the job's table
+    catalog_db.invalidate_dashboard()
+    assert job_ids() == ['job']
+    assert len(counted) == 2
+
+    # A job directory copied in by hand
+    (tmp_path / 'other').mkdir()
+    (tmp_path / 'other' / 'other.xlf').write_text('<xliff/>')
+    assert sorted(job_ids()) == ['job', 'other']
+    # (cataloging the new job drops the list once more)
+    assert sorted(job_ids()) == ['job', 'other']
+    assert len(counted) == 4
+    assert job_ids() and len(counted) == 4
+
+    # A build that raced with a change is not kept
+    generation, jobs, job_dirs = catalog_db.load_dashboard()
+    catalog_db.remove_job('other')
+    catalog_db.save_dashboard(generation, jobs, job_dirs)
+    assert catalog_db.load_dashboard()[1] is None
@@ -0,0 +1,32 @@
+def test_missing_or_extra_tags_are_major_and_reordered_tags_minor():
+    from tag_integrity import TAG_CODE_MAJOR, TAG_CODE_MINOR, tag_problem
+
+    source = 'Click <ph id="1"/> then <g1>Save</g1>'
+    assert tag_problem(source, 'Cliquez sur <ph id="1"/> puis <g1>Enregistrer</g1>') is None
+    assert tag_problem('No tags', 'Pas de balises') is None
+
+    assert tag_problem(source, '<g1>Enregistrer</g1> après <ph id="1"/>') == (
+        TAG_CODE_MINOR, 'tags in a different order')
+    assert tag_problem(source, 'Cliquez puis <g1>Enregistrer</g1>') == (TAG_CODE_MAJOR, 'missing <ph id="1"/>')
+    assert tag_problem(source, 'Cliquez <ph id="1"/> <ph id="1"/> puis <g1>Enregistrer') == (
+        TAG_CODE_MAJOR, 'missing </g1>, extra <ph id="1"/>')
+
+
+def test_segment_check_drops_revisions_and_flags_targets():
+    from tag_integrity import check_segment
+
+    source = 'Open <b>Settings</b>'
+    # A rule revision that keeps the target's tags stays
+    assert check_segment(source, 'Ouvrir <b>Paramètres</b>', 'Ouvrez <b>Paramètres</b>') == (
+        'Ouvrez <b>Paramètres</b>', '', '')
+
+    # One that loses them is discarded; the target itself is fine
+    revision, code, comment = check_segment(source, 'Ouvrir <b>Paramètres</b>', 'Ouvrez Paramètres')
+    assert (revision, code) == ('', '')
+    assert comment == 'Tag Issue: rule revision discarded (missing </b> <b>)'
+
+    assert check_segment(source, 'Ouvrir Paramètres') == (
+        '', 'TG-2', 'Tag Issue Major: target has missing </b> <b> compared to the source')
+    assert check_segment(source, 'Ouvrir </b>Paramètres<b>') == (
+        '', 'TG-0.5', 'Tag Issue Minor: target has tags in a different order compared to the source')
+    assert check_segment(source, '') == ('', '', '')
@@ -0,0 +1,43 @@
+import random
+
+from text_diff import decode_ops, diff_ops, encode_ops, revised_segments
+
+
+def apply_ops(original, revised, ops):
+    """Rebuild both texts from the ops: kept and deleted runs come from the original"""
+    rebuilt_original, rebuilt_revised = [], []
+    a = b = 0
+    for op, length in ops:
+        if op in '=-':
+            rebuilt_original.append(original[a:a + length])
+            a += length
+        if op in '=+':
+            rebuilt_revised.append(revised[b:b + length])
+            b += length
+        if op == '=':
+            assert original[a - length:a] == revised[b - length:b]
+    return ''.join(rebuilt_original), ''.join(rebuilt_revised)
+
+
+def test_word_level_ops_round_trip():
+    original = 'Cliquez sur le bouton <ph id="1"/> pour enregistrer.'
+    revised = 'Cliquez sur le bouton <ph id="1"/> pour sauvegarder vos modifications.'
+    ops = diff_ops(original, revised)
+    assert decode_ops(encode_ops(ops)) == ops
+    assert apply_ops(original, revised, ops) == (original, revised)
+    inserted = [text for text, is_new in revised_segments(revised, ops) if is_new]
+    assert inserted == ['sauvegarder vos modifications']
+
+
+def test_random_edits_rebuild_both_texts():
+    rng = random.Random(7)
+    words = ['le', 'la', 'texte', 'page', ',', '.', '<b>', '</b>', 'Notion', 'équipe']
+    for _ in range(200):
+        original = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        tokens = original.split(' ')
+        for _ in range(rng.randint(0, 5)):
+            tokens.insert(rng.randint(0, len(tokens)), rng.choice(words))
+            if tokens and rng.random() < 0.5:
+                tokens.pop(rng.randrange(len(tokens)))
+        revised = ' '.join(tokens)
+        assert apply_ops(original, revised, diff_ops(original, revised)) == (original, revised)
@@ -0,0 +1,101 @@
+import csv
+import json
+
+SOURCE = 'Click the Save button to keep your changes.'
+APPROVED = 'Cliquez sur le bouton Enregistrer pour conserver vos modifications.'
+
+
+class FakeModel:
+    """Stands in for the Gemini model: records prompts, finds a TE-2 error in every segment"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, contents):
+        self.prompts.append(contents[0]['parts'][0])
+        answer = {'revised_text': 'Révisé', 'error_codes': ['TE-2'], 'comment': 'Fixed', 'confidence_score': 90}
+        return type('Response', (), {'text': json.dumps(answer), 'usage_metadata': None})()
+
+
+def revise(tmp_path, monkeypatch, mock_reviser, rows):
+    """Revise rows of (source, target) with a FakeModel; returns it and the revised rows"""
+    csv_path = str(tmp_path / 'revision_table.csv')
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['ID Matecat', 'Source', 'Target', 'New target', 'Code', 'Comment'])
+        writer.writeheader()
+        for i, (source, target) in enumerate(rows, 1):
+            writer.writerow({'ID Matecat': str(i), 'Source': source, 'Target': target, 'New target': '',
+                             'Code': '', 'Comment': ''})
+
+    model = FakeModel()
+    reviser = mock_reviser.LLMReviser()
+    reviser.model, reviser.model_name = model, 'fake'
+    monkeypatch.setattr(mock_reviser, 'LLMReviser', lambda: reviser)
+    mock_reviser.revise_csv_with_ai(csv_path, csv_path)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return model, list(csv.DictReader(f))
+
+
+def approve(memory_db, source=SOURCE, target=APPROVED, codes='TE-1', comment='Button name'):
+    memory_db.remember([{'source': source, 'target': target, 'codes': codes, 'comment': comment,
+                         'origin': 'reviewer', 'job_id': 'older-job'}])
+
+
+def test_fuzzy_lookup_finds_near_duplicates_and_keeps_the_newest_translation(memory_db):
+    approve(memory_db)
+    approve(memory_db, source='Delete this page?', target='Supprimer cette page ?')
+    approve(memory_db, source=' Click the Save  button to keep your changes.', target='Nouvelle traduction')
+    assert memory_db.count() == 2
+
+    match = memory_db.best_match('Click the save button to keep your change')
+    assert match['target'] == 'Nouvelle traduction'
+    assert 0.85 <= match['score'] < 1.0
+    assert memory_db.best_match(SOURCE)['score'] == 1.0
+    assert memory_db.best_match('Something else entirely') is None
+
+
+def test_exact_reviewer_match_with_codes_skips_the_model(tmp_path, memory_db, mock_reviser, monkeypatch):
+    approve(memory_db)
+    model, rows = revise(tmp_path, monkeypatch, mock_reviser, [(SOURCE, 'Cliquez sur Sauver.'),
+                                                              (SOURCE, APPROVED)])
+
+    assert model.prompts == []
+    assert rows[0]['AI Revision'] == APPROVED
+    assert rows[0]['Code'] == 'TE-1'
+    assert rows[0]['Comment'] == '[AI - Checked: Target] Translation memory: Button name'
+    # Already the approved translation
+    assert rows[1]['AI Revision'] == '' and rows[1]['Code'] == ''
+
+
+def test_an_approved_translation_with_other_tags_is_not_reused(tmp_path, memory_db, mock_reviser, monkeypatch):
+    approve(memory_db, source='Open <b>Settings</b>', target='Ouvrir les paramètres')
+    model, rows = revise(tmp_path, monkeypatch, mock_reviser, [('Open <b>Settings</b>', 'Ouvrir <b>Réglages</b>')])
+
+    # (asked the model instead, whose answer loses the tags too)
+    assert model.prompts
+    assert rows[0]['AI Revision'] == '' and rows[0]['Code'] == ''
+
+
+def test_fuzzy_or_uncoded_matches_go_to_the_model_as_a_reference(tmp_path, memory_db, mock_reviser, monkeypatch):
+    approve(memory_db)
+    approve(memory_db, source='Delete this page?', target='Supprimer cette page ?', codes='', comment='')
+    model, rows = revise(tmp_path, monkeypatch, mock_reviser, [
+        ('Click the save button to keep your changes', 'Cliquez sur Sauver.'),
+        ('Delete this page?', 'Effacer cette page ?'),
+    ])
+
+    assert len(model.prompts) == 2
+    assert f'Approved (French): "{APPROVED}"' in model.prompts[0]
+    assert 'Approved (French): "Supprimer cette page ?"' in model.prompts[1]
+    assert [row['AI Revision'] for row in rows] == ['Révisé', 'Révisé']
+
+
+def test_model_answers_are_not_learned(tmp_path, memory_db, mock_reviser, monkeypatch):
+    revise(tmp_path, monkeypatch, mock_reviser, [(SOURCE, 'Cliquez sur Sauver.')])
+    assert memory_db.count() == 0
+
+    # An AI entry left by an earlier version is only ever a reference
+    memory_db.remember([{'source': SOURCE, 'target': APPROVED, 'codes': 'TE-1', 'comment': '', 'origin': 'ai'}])
+    model, rows = revise(tmp_path, monkeypatch, mock_reviser, [(SOURCE, 'Cliquez sur Sauver.')])
+    assert len(model.prompts) == 1
+    assert rows[0]['AI Revision'] == 'Révisé'
@@ -0,0 +1,34 @@
+from conftest import SAMPLE_XLF
+
+
+def receive(tmp_path, data, chunk_size=4096):
+    from uploads import XlfUploadSink
+
+    sink = XlfUploadSink(str(tmp_path))
+    for start in range(0, len(data), chunk_size):
+        sink.write(data[start:start + chunk_size])
+    sink.finish()
+    return sink
+
+
+def test_xlf_is_hashed_and_saved_as_it_streams_in(tmp_path):
+    from uploads import hash_file
+
+    with open(SAMPLE_XLF, 'rb') as f:
+        data = f.read()
+    sink = receive(tmp_path, data)
+    assert sink.error is None
+    assert sink.size == len(data)
+    destination = str(tmp_path / 'job.xlf')
+    sink.save(destination)
+    assert sink.sha256 == hash_file(destination) == hash_file(SAMPLE_XLF)
+
+
+def test_files_that_are_not_xliff_2_are_rejected(tmp_path):
+    sink = receive(tmp_path, b'<?xml version="1.0"?><html><body/></html>')
+    assert sink.error.startswith('Invalid XLF file: Root element is not an XLIFF 2.0 <xliff> element')
+
+    truncated = receive(tmp_path, b'<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0"><file>')
+    assert truncated.error.startswith('Invalid XLF file: ')
+
+    assert receive(tmp_path, b'').error == 'Uploaded file is empty'